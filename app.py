@@ -5,13 +5,18 @@
 
 import streamlit as st
 from pathlib import Path
+import importlib
 import sys
 
 # 경로 설정
 sys.path.insert(0, str(Path(__file__).parent))
 
-from components.common import apply_common_styles
-from views import home, study, quiz, review
+from components.common import apply_common_styles, render_warmup_status
+from metrics import start_metrics_server
+from warmup import start_warmup
+
+# 화면 모듈은 처음 열 때 import (quiz/review/study 는 rag, pipeline 을 바로 불러옴)
+PAGES = ("home", "study", "quiz", "review")
 
 # 페이지 설정
 st.set_page_config(
@@ -40,19 +45,17 @@ def main():
     """메인 함수"""
     init_session()
     apply_common_styles()
+    start_metrics_server()  # METRICS_PORT 설정 시 프로세스당 한 번만 시작
+    start_warmup()  # 임베딩 모델 등은 백그라운드에서 로딩 (프로세스당 한 번)
+
+    with st.sidebar:
+        render_warmup_status()
 
     page = st.session_state.current_page
+    if page not in PAGES:
+        page = "home"
 
-    if page == "home":
-        home.render()
-    elif page == "study":
-        study.render()
-    elif page == "quiz":
-        quiz.render()
-    elif page == "review":
-        review.render()
-    else:
-        home.render()
+    importlib.import_module(f"views.{page}").render()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic Corpus Generator
+- Deterministic (seeded) Korean/English study documents
+- Each document describes one fictional subject through labeled facts,
+  so queries can be generated with known answers
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+_SYLLABLES = list("가나다라마바사아자차카타파하로미소진한윤서결린채무")
+_SUFFIXES = ["프레임워크", "알고리즘", "모델", "시스템", "기법", "라이브러리", "프로토콜", "아키텍처"]
+_EN_SYLLABLES = ["ka", "ro", "mi", "ne", "so", "ta", "vi", "lu", "an", "der", "mo", "qui"]
+_EN_SUFFIXES = ["engine", "stack", "net", "flow", "kit", "core"]
+
+# attribute -> (Korean label, English label, value template)
+ATTRIBUTES: Dict[str, Tuple[str, str, str]] = {
+    "principle": ("핵심 원리", "core principle", "{name} 기반의 {n}단계 {term}"),
+    "advantage": ("주요 장점", "main advantage", "{term} 비용을 {p}% 줄이는 {name} 방식"),
+    "example": ("대표 사례", "typical use case", "{name} 연구소의 {term} 프로젝트"),
+    "limitation": ("한계", "known limitation", "{n}개 이상의 {term}에서 발생하는 {name} 병목"),
+    "year": ("도입 연도", "year introduced", "{year}년 {name} 학회"),
+    "tool": ("관련 도구", "related tool", "{name}-{n} 툴킷"),
+    "metric": ("성능 지표", "performance metric", "{term} 정확도 {p}.{n}%"),
+    "component": ("구성 요소", "key component", "{name} 인코더와 {term} 디코더"),
+}
+_TERMS = ["검색", "임베딩", "토큰화", "색인", "추론", "요약", "분류", "캐싱", "병렬화", "정규화"]
+_FILLER_KO = [
+    "이 내용은 시험에 자주 출제되므로 정확히 이해해 두는 것이 좋습니다.",
+    "실제 현업에서는 여러 기법을 조합하여 사용하는 경우가 많습니다.",
+    "자세한 내용은 다음 장에서 예제와 함께 다시 살펴봅니다.",
+    "학습자는 개념과 용어를 구분하여 정리하는 습관을 들이는 것이 좋습니다.",
+    "초기 버전에서는 성능 문제로 널리 쓰이지 않았습니다.",
+    "다른 방법과 비교하면 구현이 단순하다는 평가를 받습니다.",
+]
+_FILLER_EN = [
+    "This topic is frequently covered in introductory courses.",
+    "Practitioners usually combine several of these techniques.",
+    "The following chapter revisits the idea with worked examples.",
+    "Early implementations were limited by hardware constraints.",
+]
+
+
+@dataclass
+class Fact:
+    """One labeled statement in the corpus."""
+    fact_id: str
+    subject: str
+    attribute: str
+    value: str            # unique across the corpus - locates the fact in chunks
+
+
+@dataclass
+class SyntheticDocument:
+    source: str
+    subject: str
+    text: str
+    facts: List[Fact] = field(default_factory=list)
+
+    @property
+    def metadata(self) -> dict:
+        return {"source": self.source, "type": "synthetic"}
+
+
+class CorpusGenerator:
+    """Seeded generator; the same (seed, sizes) always yields the same corpus."""
+
+    def __init__(self, seed: int = 42):
+        self.rng = random.Random(seed)
+        self._used: set = set()
+
+    def _unique(self, make) -> str:
+        for _ in range(1000):
+            value = make()
+            if value not in self._used:
+                self._used.add(value)
+                return value
+        raise RuntimeError("could not generate a unique name")
+
+    def _name(self) -> str:
+        rng = self.rng
+        return self._unique(lambda: "".join(rng.choices(_SYLLABLES, k=rng.randint(2, 3))))
+
+    def _subject(self) -> Tuple[str, str]:
+        rng = self.rng
+        korean = f"{self._name()} {rng.choice(_SUFFIXES)}"
+        english = self._unique(
+            lambda: "".join(rng.choices(_EN_SYLLABLES, k=3)).capitalize() + " " + rng.choice(_EN_SUFFIXES)
+        )
+        return korean, english
+
+    def _value(self, attribute: str) -> str:
+        rng = self.rng
+        template = ATTRIBUTES[attribute][2]
+        return self._unique(lambda: template.format(
+            name=self._name(),
+            term=rng.choice(_TERMS),
+            n=rng.randint(2, 9),
+            p=rng.randint(10, 95),
+            year=rng.randint(1995, 2024),
+        ))
+
+    def document(self, index: int, english_ratio: float = 0.3) -> SyntheticDocument:
+        rng = self.rng
+        subject, english = self._subject()
+        attributes = list(ATTRIBUTES)
+        rng.shuffle(attributes)
+
+        paragraphs = [f"# {subject} ({english})"]
+        facts = []
+        for attribute in attributes:
+            label_ko, label_en, _ = ATTRIBUTES[attribute]
+            value = self._value(attribute)
+            facts.append(Fact(f"{index:04d}-{attribute}", subject, attribute, value))
+            if rng.random() < english_ratio:
+                sentences = [f"The {label_en} of {english} ({subject}) is {value}."]
+                sentences += rng.sample(_FILLER_EN, k=rng.randint(1, 2))
+            else:
+                sentences = [f"{subject}의 {label_ko}은(는) {value}입니다."]
+                sentences += rng.sample(_FILLER_KO, k=rng.randint(1, 3))
+            paragraphs.append(" ".join(sentences))
+
+        return SyntheticDocument(
+            source=f"synthetic_{index:04d}.txt",
+            subject=subject,
+            text="\n\n".join(paragraphs),
+            facts=facts,
+        )
+
+    def corpus(self, n_docs: int = 50, english_ratio: float = 0.3) -> List[SyntheticDocument]:
+        return [self.document(i, english_ratio) for i in range(n_docs)]
+
+
+def generate_corpus(n_docs: int = 50, seed: int = 42, english_ratio: float = 0.3) -> List[SyntheticDocument]:
+    """Deterministic synthetic corpus of `n_docs` documents."""
+    return CorpusGenerator(seed).corpus(n_docs, english_ratio)
+
+
+def fact_question(fact: Fact) -> str:
+    """Natural-language question whose answer is `fact.value`."""
+    return f"{fact.subject}의 {ATTRIBUTES[fact.attribute][0]}은(는) 무엇인가요?"
+
+
+def sample_queries(docs: List[SyntheticDocument], n: int = 20, seed: int = 7) -> List[Tuple[str, Fact]]:
+    """Deterministic sample of (question, fact) pairs from the corpus."""
+    facts = [fact for doc in docs for fact in doc.facts]
+    rng = random.Random(seed)
+    return [(fact_question(fact), fact) for fact in rng.sample(facts, k=min(n, len(facts)))]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Fixtures
+- HashEmbeddings: deterministic feature-hashing embeddings (no model download)
+- isolated_rag: RAGSystem in a throwaway directory, never the real ./chroma_db
+"""
+
+import math
+import shutil
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from rag import RAGSystem
+from sparse_index import tokenize
+
+HASH_EMBEDDING_DIM = 384
+
+
+class HashEmbeddings(Embeddings):
+    """Signed feature hashing of BM25 tokens, L2-normalized.
+
+    Not semantically meaningful beyond term overlap, but deterministic
+    and fast, so benchmarks run offline and measure everything except
+    the model itself.
+    """
+
+    def __init__(self, dim: int = HASH_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for token in tokenize(text):
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+@contextmanager
+def isolated_rag(embeddings: str = "hash", directory: Optional[str] = None, **kwargs) -> Iterator[RAGSystem]:
+    """RAGSystem backed by a temporary directory (removed afterwards).
+
+    Args:
+        embeddings: "hash" (offline HashEmbeddings) or "model" (EMBEDDING_MODEL)
+        directory: Use this directory instead of a fresh temp dir (kept afterwards)
+        **kwargs: Passed to RAGSystem (e.g. chunk_size, chunk_overlap)
+    """
+    path = directory or tempfile.mkdtemp(prefix="bench_chroma_")
+    try:
+        if embeddings == "hash":
+            yield RAGSystem(
+                embedding_model=f"hash-{HASH_EMBEDDING_DIM}",
+                persist_directory=path,
+                embeddings=HashEmbeddings(),
+                **kwargs,
+            )
+        else:
+            yield RAGSystem(persist_directory=path, **kwargs)
+    finally:
+        if directory is None:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Load Testing Harness
+- Drives IntegratedPipeline with concurrent requests built from run_test cases
+- Closed loop (fixed concurrency) or open loop (fixed request rate)
+- Warm-up period excluded from the results
+- p50/p90/p99 latency and TTFT, throughput, error rate, per-TaskType breakdown
+- JSON / CSV export
+
+Offline, against the mock LLM server and a temporary hash-embedding index
+seeded with the synthetic corpus (the real ./chroma_db is never touched):
+    python -m benchmarks.loadtest --mock --concurrency 8 --duration 30 --json results.json
+"""
+
+import os
+import csv
+import json
+import time
+import asyncio
+import argparse
+import itertools
+from contextlib import ExitStack
+from dataclasses import dataclass, asdict, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from cache import SemanticCache
+from benchmarks.stats import latency_stats
+
+# pipeline / llm_clients pull in rag, langchain and HF; imported where used so
+# main() can set HF_HUB_OFFLINE for --mock runs before they load
+if TYPE_CHECKING:
+    from pipeline import IntegratedPipeline, TestResult
+
+CSV_FIELDS = [
+    "offset_s", "query", "task_type", "success", "response_time_ms", "ttft_ms",
+    "token_count", "tokens_per_sec", "cache_hit", "coalesced", "error",
+]
+
+
+@dataclass
+class LoadTestConfig:
+    """Load pattern."""
+    concurrency: int = 4           # max requests in flight
+    rate: float = 0.0              # arrivals per second; 0 = closed loop at `concurrency`
+    duration_s: float = 30.0       # measured window
+    warmup_s: float = 5.0          # run before the window, not recorded
+    streaming: bool = True         # aprocess_stream (TTFT observable) or aprocess
+    use_caches: bool = False       # keep response cache + coalescing (repeated test queries would hit them)
+
+
+@dataclass
+class LoadTestRecord:
+    """One measured request."""
+    offset_s: float                # scheduled time, relative to the start of the window
+    result: "TestResult"
+    cache_hit: bool = False
+    coalesced: bool = False
+
+    def to_row(self) -> Dict[str, Any]:
+        result = self.result
+        return {
+            "offset_s": round(self.offset_s, 3),
+            "query": result.query,
+            "task_type": result.task_type.value,
+            "success": result.success,
+            "response_time_ms": round(result.response_time_ms, 2),
+            "ttft_ms": round(result.ttft_ms, 2),
+            "token_count": result.token_count,
+            "tokens_per_sec": round(result.tokens_per_sec, 2),
+            "cache_hit": self.cache_hit,
+            "coalesced": self.coalesced,
+            "error": result.error or "",
+        }
+
+
+@dataclass
+class LoadTestReport:
+    """Summary plus per-request records."""
+    config: LoadTestConfig
+    summary: Dict[str, Any]
+    records: List[LoadTestRecord] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "config": asdict(self.config),
+            "summary": self.summary,
+            "records": [record.to_row() for record in self.records],
+        }
+
+    def to_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def to_csv(self, path: str):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(record.to_row() for record in self.records)
+
+
+def summarize(records: List[LoadTestRecord], elapsed_s: float) -> Dict[str, Any]:
+    """Aggregate records into the report summary."""
+
+    def group(items: List[LoadTestRecord]) -> Dict[str, Any]:
+        ok = [r.result for r in items if r.result.success]
+        return {
+            "requests": len(items),
+            "errors": len(items) - len(ok),
+            "error_rate": round((len(items) - len(ok)) / len(items), 4) if items else 0.0,
+            "latency_ms": latency_stats([r.response_time_ms for r in ok]),
+            "ttft_ms": latency_stats([r.ttft_ms for r in ok]),
+        }
+
+    from pipeline import TaskType
+
+    summary = group(records)
+    ok = [r for r in records if r.result.success]
+    summary.update({
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(ok) / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+        "output_tokens_per_sec": round(sum(r.result.token_count for r in ok) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        "cache_hits": sum(1 for r in ok if r.cache_hit),
+        "coalesced": sum(1 for r in ok if r.coalesced),
+        "by_task_type": {},
+    })
+    for task_type in TaskType:
+        items = [r for r in records if r.result.task_type == task_type]
+        if items:
+            summary["by_task_type"][task_type.value] = group(items)
+    return summary
+
+
+class LoadTester:
+    """Concurrent load generator on top of the run_test case format.
+
+    Test cases are replayed round-robin. In open-loop mode request i is
+    scheduled at i / rate and its latency is measured from that moment,
+    so queueing behind the concurrency limit counts against it.
+    """
+
+    def __init__(
+        self,
+        pipeline: "IntegratedPipeline",
+        config: Optional[LoadTestConfig] = None,
+        test_cases: Optional[List[Dict[str, Any]]] = None,
+    ):
+        from pipeline import DEFAULT_TEST_CASES
+
+        self.pipeline = pipeline
+        self.config = config or LoadTestConfig()
+        self.test_cases = test_cases or DEFAULT_TEST_CASES
+
+    async def _request(self, case: Dict[str, Any], scheduled: float) -> LoadTestRecord:
+        from pipeline import PipelineInput, TaskType
+
+        input_data = PipelineInput(query=case.get("query", ""), task_type=case.get("task_type", TaskType.QA))
+        try:
+            if self.config.streaming:
+                output = await self.pipeline.aprocess_stream(input_data, lambda text: None)
+            else:
+                output = await self.pipeline.aprocess(input_data)
+            result = self.pipeline._evaluate(case, output, (time.monotonic() - scheduled) * 1000)
+            return LoadTestRecord(
+                offset_s=0.0,
+                result=result,
+                cache_hit=output.metrics.get("cache_hit", False),
+                coalesced=output.metrics.get("coalesced", False),
+            )
+        except Exception as e:
+            return LoadTestRecord(offset_s=0.0, result=self.pipeline._failed_result(case, e))
+
+    async def run(self) -> LoadTestReport:
+        config = self.config
+        pipeline = self.pipeline
+        saved = (pipeline.coalesce, pipeline.response_cache)
+        if not config.use_caches:
+            pipeline.coalesce = False
+            pipeline.response_cache = SemanticCache(maxsize=0)
+
+        cases = itertools.cycle(self.test_cases)
+        semaphore = asyncio.Semaphore(max(1, config.concurrency))
+        records: List[LoadTestRecord] = []
+        finished_at: List[float] = []
+        start = time.monotonic()
+        window_start = start + config.warmup_s
+        window_end = window_start + config.duration_s
+
+        async def measured(case: Dict[str, Any], scheduled: float):
+            async with semaphore:
+                record = await self._request(case, scheduled)
+            if scheduled >= window_start:
+                record.offset_s = scheduled - window_start
+                records.append(record)
+                finished_at.append(time.monotonic())
+
+        try:
+            if config.rate > 0:
+                tasks = []
+                for i in itertools.count():
+                    scheduled = start + i / config.rate
+                    if scheduled >= window_end:
+                        break
+                    await asyncio.sleep(max(0.0, scheduled - time.monotonic()))
+                    tasks.append(asyncio.ensure_future(measured(next(cases), scheduled)))
+                await asyncio.gather(*tasks)
+            else:
+                async def worker():
+                    while time.monotonic() < window_end:
+                        await measured(next(cases), time.monotonic())
+                await asyncio.gather(*(worker() for _ in range(max(1, config.concurrency))))
+        finally:
+            pipeline.coalesce, pipeline.response_cache = saved
+
+        elapsed = (max(finished_at) if finished_at else window_end) - window_start
+        records.sort(key=lambda r: r.offset_s)
+        pipeline._test_results.extend(r.result for r in records)
+        return LoadTestReport(config=config, summary=summarize(records, elapsed), records=records)
+
+    def run_sync(self) -> LoadTestReport:
+        return asyncio.run(self._run_and_close())
+
+    async def _run_and_close(self) -> LoadTestReport:
+        from llm_clients import get_llm_registry
+
+        try:
+            return await self.run()
+        finally:
+            # Async connection pools are bound to this loop, which asyncio.run closes
+            await get_llm_registry().aclose_loop()
+
+
+def print_summary(report: LoadTestReport):
+    summary = report.summary
+    config = report.config
+    mode = f"open loop @ {config.rate}/s" if config.rate > 0 else "closed loop"
+    print(f"\nLoad test: {mode}, concurrency {config.concurrency}, "
+          f"{config.duration_s:.0f}s (+{config.warmup_s:.0f}s warm-up)")
+    print(f"  requests {summary['requests']}  errors {summary['errors']} ({summary['error_rate']:.2%})")
+    print(f"  throughput {summary['throughput_rps']} req/s, {summary['output_tokens_per_sec']} tok/s")
+    for name in ("latency_ms", "ttft_ms"):
+        s = summary[name]
+        print(f"  {name:<11} p50 {s['p50']:>9}  p90 {s['p90']:>9}  p99 {s['p99']:>9}  max {s['max']:>9}")
+    for task, s in summary["by_task_type"].items():
+        print(f"  [{task:<9}] n={s['requests']:<5} err={s['error_rate']:.2%}  "
+              f"p50 {s['latency_ms']['p50']}ms  p99 {s['latency_ms']['p99']}ms  ttft p50 {s['ttft_ms']['p50']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for IntegratedPipeline")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.0, help="arrivals per second (0 = closed loop)")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--no-stream", action="store_true", help="use aprocess instead of aprocess_stream")
+    parser.add_argument("--use-caches", action="store_true", help="keep response cache and request coalescing")
+    parser.add_argument("--json", help="write report JSON to this path")
+    parser.add_argument("--csv", help="write per-request CSV to this path")
+    parser.add_argument("--mock", action="store_true", help="run against a local mock LLM server")
+    parser.add_argument("--ttft-ms", type=float, default=200.0, help="mock server time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="mock server decode rate")
+    parser.add_argument("--output-tokens", type=int, default=64, help="mock server response length")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock server injected error rate")
+    parser.add_argument("--docs", type=int, default=50, help="synthetic documents indexed in mock mode")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.mock:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    from pipeline import get_pipeline, IntegratedPipeline
+
+    config = LoadTestConfig(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration_s=args.duration,
+        warmup_s=args.warmup,
+        streaming=not args.no_stream,
+        use_caches=args.use_caches,
+    )
+
+    with ExitStack() as stack:
+        if args.mock:
+            from benchmarks.corpus import generate_corpus
+            from benchmarks.fixtures import isolated_rag
+            from benchmarks.mock_llm import MockLLMServer, MockLLMConfig, MOCK_MODEL
+
+            docs = generate_corpus(n_docs=args.docs, seed=args.seed)
+            rag = stack.enter_context(isolated_rag("hash"))
+            rag.add_documents([doc.text for doc in docs], [doc.metadata for doc in docs])
+            server = stack.enter_context(MockLLMServer(MockLLMConfig(
+                ttft_ms=args.ttft_ms,
+                tokens_per_sec=args.tokens_per_sec,
+                output_tokens=args.output_tokens,
+                error_rate=args.error_rate,
+                seed=args.seed,
+            )))
+            pipeline = IntegratedPipeline(rag_system=rag, model=MOCK_MODEL, base_url=server.url)
+        else:
+            pipeline = get_pipeline()
+
+        report = LoadTester(pipeline, config).run_sync()
+
+    print_summary(report)
+    if args.json:
+        report.to_json(args.json)
+        print(f"\nJSON report: {args.json}")
+    if args.csv:
+        report.to_csv(args.csv)
+        print(f"CSV records: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
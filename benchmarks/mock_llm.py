@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Mock OpenAI-compatible LLM server
+- GET /v1/models, POST /v1/chat/completions (streaming and non-streaming)
+- Configurable time-to-first-token, decode rate, output length and error rate
+- Reports usage (also in streams when stream_options.include_usage is set)
+
+Run standalone:
+    python -m benchmarks.mock_llm --port 1234 --ttft-ms 200 --tokens-per-sec 50
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from tokens import estimate_tokens
+
+MOCK_MODEL = "mock-model"
+# Deterministic filler vocabulary (one token per word)
+_WORDS = [
+    "학습", "자료", "기반", "설명", "핵심", "개념", "예시", "정리",
+    "retrieval", "context", "model", "token", "검색", "생성", "요약", "답변",
+]
+
+
+class MockLLMConfig:
+    """Latency/length knobs for the mock server (mutable while it runs)."""
+
+    def __init__(
+        self,
+        ttft_ms: float = 200.0,
+        tokens_per_sec: float = 50.0,
+        output_tokens: int = 64,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.ttft_ms = ttft_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.seed = seed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: str):
+        data = payload.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": MOCK_MODEL, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        config = self.server.config
+        self.server.count_request()
+        if config.error_rate and self.server.roll() < config.error_rate:
+            self._send_json(500, {"error": {"message": "injected mock error", "type": "server_error"}})
+            return
+
+        prompt_tokens = sum(
+            estimate_tokens(m.get("content") or "") + 5 for m in request.get("messages", [])
+        )
+        n_out = config.output_tokens
+        if request.get("max_tokens"):
+            n_out = min(n_out, int(request["max_tokens"]))
+        words = [_WORDS[i % len(_WORDS)] for i in range(n_out)]
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": n_out, "total_tokens": prompt_tokens + n_out}
+        completion_id = f"chatcmpl-mock-{self.server.requests}"
+        model = request.get("model") or MOCK_MODEL
+        interval = 1 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+
+        if not request.get("stream"):
+            time.sleep(config.ttft_ms / 1000 + interval * n_out)
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(words)},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(choices, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        try:
+            time.sleep(config.ttft_ms / 1000)
+            self._write_chunk(event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]))
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(interval)
+                text = word if i == 0 else f" {word}"
+                self._write_chunk(event([{"index": 0, "delta": {"content": text}, "finish_reason": None}]))
+            self._write_chunk(event([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+            if (request.get("stream_options") or {}).get("include_usage"):
+                self._write_chunk(event([], usage=usage))
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MockLLMConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+
+class MockLLMServer:
+    """OpenAI-compatible mock LLM served from a background thread.
+
+    Usage:
+        with MockLLMServer(MockLLMConfig(ttft_ms=100)) as server:
+            pipeline = IntegratedPipeline(base_url=server.url)
+    """
+
+    def __init__(self, config: Optional[MockLLMConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockLLMConfig()
+        self._server = _Server((host, port), self.config)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--ttft-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockLLMConfig(args.ttft_ms, args.tokens_per_sec, args.output_tokens, args.error_rate)
+    server = MockLLMServer(config, host=args.host, port=args.port).start()
+    print(f"Mock LLM server at {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
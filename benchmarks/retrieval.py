@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Retrieval Quality Benchmark
+- Labeled query -> relevant-chunk dataset built from the synthetic corpus
+  (a chunk is relevant when it contains the fact's unique value)
+- recall@k, MRR and nDCG@k next to search latency and index size
+- search, search_with_score, hybrid_search and BM25-only rankings
+- Sweep chunk sizes to trade retrieval quality against speed and size
+
+    python -m benchmarks.retrieval --ks 1,3,5,10 --chunk-sizes 300,500,800
+    python -m benchmarks.retrieval --embeddings model --json retrieval.json
+
+With the default hash embeddings the dense rankings only reflect term
+overlap; use --embeddings model to judge the real embedding model.
+"""
+
+import os
+import json
+import math
+import time
+import argparse
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.corpus import Fact, SyntheticDocument, generate_corpus, fact_question
+from benchmarks.stats import latency_stats
+
+DEFAULT_KS = (1, 3, 5, 10)
+
+
+@dataclass
+class LabeledQuery:
+    query: str
+    fact: Fact
+    relevant: List[str]  # contents of the chunks that contain fact.value
+
+
+@dataclass
+class RetrievalDataset:
+    queries: List[LabeledQuery]
+    unanswerable: int = 0  # facts split across a chunk boundary (no chunk holds the whole value)
+    chunk_count: int = 0
+
+
+@dataclass
+class ModeReport:
+    """Quality and latency of one retrieval mode."""
+    mode: str
+    metrics: Dict[str, float] = field(default_factory=dict)
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def recall_at_k(ranking: List[bool], n_relevant: int, k: int) -> float:
+    """Fraction of the relevant chunks found in the top k."""
+    return sum(ranking[:k]) / n_relevant if n_relevant else 0.0
+
+
+def reciprocal_rank(ranking: List[bool]) -> float:
+    for rank, relevant in enumerate(ranking, start=1):
+        if relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranking: List[bool], n_relevant: int, k: int) -> float:
+    """Binary-relevance nDCG."""
+    dcg = sum(1.0 / math.log2(rank + 1) for rank, relevant in enumerate(ranking[:k], start=1) if relevant)
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(n_relevant, k) + 1))
+    return dcg / ideal if ideal else 0.0
+
+
+def file_size(path: str) -> int:
+    """Size of a SQLite file including its -wal/-shm companions."""
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal", f"{path}-shm") if os.path.exists(p))
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def index_size(rag) -> int:
+    """Bytes on disk of the Chroma collection and BM25 index (caches excluded)."""
+    caches = ("embedding_cache.sqlite", "ocr_cache.sqlite")
+    return directory_size(rag.persist_directory) - sum(
+        file_size(os.path.join(rag.persist_directory, name)) for name in caches
+    )
+
+
+def build_dataset(docs: List[SyntheticDocument], chunks: List[str], n_queries: int = 0) -> RetrievalDataset:
+    """Label every fact (or the first `n_queries`) with the chunks containing its value."""
+    facts = [fact for doc in docs for fact in doc.facts]
+    if n_queries:
+        facts = facts[:n_queries]
+    dataset = RetrievalDataset(queries=[], chunk_count=len(chunks))
+    for fact in facts:
+        relevant = [chunk for chunk in chunks if fact.value in chunk]
+        if relevant:
+            dataset.queries.append(LabeledQuery(fact_question(fact), fact, relevant))
+        else:
+            dataset.unanswerable += 1
+    return dataset
+
+
+def evaluate_mode(
+    mode: str,
+    retrieve: Callable[[str, int], List[str]],
+    dataset: RetrievalDataset,
+    ks: Sequence[int] = DEFAULT_KS,
+    before_query: Optional[Callable[[], None]] = None,
+) -> ModeReport:
+    """Rank every labeled query once at max(ks) and score each k on the prefix."""
+    max_k = max(ks)
+    sums: Dict[str, float] = {f"recall@{k}": 0.0 for k in ks}
+    sums.update({f"ndcg@{k}": 0.0 for k in ks})
+    sums["mrr"] = 0.0
+    latencies = []
+
+    for labeled in dataset.queries:
+        if before_query:
+            before_query()
+        start = time.perf_counter()
+        contents = retrieve(labeled.query, max_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        relevant = set(labeled.relevant)
+        ranking = [content in relevant for content in contents]
+        for k in ks:
+            sums[f"recall@{k}"] += recall_at_k(ranking, len(relevant), k)
+            sums[f"ndcg@{k}"] += ndcg_at_k(ranking, len(relevant), k)
+        sums["mrr"] += reciprocal_rank(ranking)
+
+    n = len(dataset.queries) or 1
+    return ModeReport(
+        mode=mode,
+        metrics={name: round(total / n, 4) for name, total in sums.items()},
+        latency_ms=latency_stats(latencies),
+    )
+
+
+def retrieval_modes(rag) -> Dict[str, Callable[[str, int], List[str]]]:
+    """Ranked chunk contents per retrieval mode."""
+    collection = rag.vectorstore._collection
+
+    def sparse(query: str, k: int) -> List[str]:
+        ids = [doc_id for doc_id, _ in rag.sparse_index.search(query, k=k)]
+        if not ids:
+            return []
+        found = collection.get(ids=ids, include=["documents"])
+        contents = dict(zip(found["ids"], found["documents"]))
+        return [contents[doc_id] for doc_id in ids if doc_id in contents]
+
+    return {
+        "dense": lambda query, k: [doc.page_content for doc in rag.search(query, k=k)],
+        "dense_score": lambda query, k: [doc.page_content for doc, _ in rag.search_with_score(query, k=k)],
+        "hybrid": lambda query, k: [doc.page_content for doc in rag.hybrid_search(query, k=k)],
+        "sparse": sparse,
+    }
+
+
+@contextmanager
+def _indexed_rag(docs: List[SyntheticDocument], embeddings: str, chunk_size: int, chunk_overlap: int) -> Iterator:
+    from benchmarks.fixtures import isolated_rag
+
+    with isolated_rag(embeddings, chunk_size=chunk_size, chunk_overlap=chunk_overlap) as rag:
+        rag.add_documents([doc.text for doc in docs], [doc.metadata for doc in docs])
+        yield rag
+
+
+def run_benchmark(
+    n_docs: int = 50,
+    seed: int = 42,
+    n_queries: int = 0,
+    ks: Sequence[int] = DEFAULT_KS,
+    chunk_sizes: Sequence[int] = (500,),
+    chunk_overlap: int = 50,
+    embeddings: str = "hash",
+) -> List[Dict]:
+    """Evaluate every retrieval mode for each chunk size."""
+    docs = generate_corpus(n_docs=n_docs, seed=seed)
+    runs = []
+    for chunk_size in chunk_sizes:
+        with _indexed_rag(docs, embeddings, chunk_size, chunk_overlap) as rag:
+            chunks = rag.vectorstore._collection.get(include=["documents"])["documents"]
+            dataset = build_dataset(docs, chunks, n_queries)
+
+            def cold_query():
+                # Every mode starts each query cold: the first mode would otherwise
+                # warm the query embeddings for the modes after it
+                rag.retrieval_cache.clear()
+                rag.embeddings.clear()
+
+            reports = [
+                evaluate_mode(mode, retrieve, dataset, ks, before_query=cold_query)
+                for mode, retrieve in retrieval_modes(rag).items()
+            ]
+            runs.append({
+                "chunk_size": chunk_size,
+                "chunk_overlap": chunk_overlap,
+                "chunks": dataset.chunk_count,
+                "queries": len(dataset.queries),
+                "unanswerable": dataset.unanswerable,
+                "index_bytes": index_size(rag),
+                "bm25_bytes": file_size(rag.sparse_index.path),
+                "modes": {
+                    report.mode: {"metrics": report.metrics, "latency_ms": report.latency_ms}
+                    for report in reports
+                },
+            })
+    return runs
+
+
+def print_report(runs: List[Dict], ks: Sequence[int]):
+    columns = [f"recall@{k}" for k in ks] + ["mrr", f"ndcg@{max(ks)}"]
+    for run in runs:
+        print(f"\nchunk_size {run['chunk_size']} (overlap {run['chunk_overlap']}): "
+              f"{run['chunks']} chunks, {run['queries']} queries ({run['unanswerable']} unanswerable), "
+              f"index {run['index_bytes'] / 1024:.0f} KiB (BM25 {run['bm25_bytes'] / 1024:.0f} KiB)")
+        print(f"  {'mode':<12}" + "".join(f"{c:>11}" for c in columns) + f"{'p50 ms':>10}{'p90 ms':>10}")
+        for mode, result in run["modes"].items():
+            metrics, latency = result["metrics"], result["latency_ms"]
+            print(f"  {mode:<12}" + "".join(f"{metrics[c]:>11.3f}" for c in columns)
+                  + f"{latency['p50']:>10.2f}{latency['p90']:>10.2f}")
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval quality benchmark (recall@k, MRR, nDCG)")
+    parser.add_argument("--docs", type=int, default=50, help="synthetic documents")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=0, help="limit labeled queries (0 = one per fact)")
+    parser.add_argument("--ks", type=_int_list, default=list(DEFAULT_KS), help="comma-separated cutoffs")
+    parser.add_argument("--chunk-sizes", type=_int_list, default=[500], help="comma-separated chunk sizes")
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--embeddings", choices=["hash", "model"], default="hash",
+                        help="hash = offline feature hashing, model = EMBEDDING_MODEL")
+    parser.add_argument("--json", help="write results JSON to this path")
+    args = parser.parse_args()
+
+    if args.embeddings == "hash":
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+    runs = run_benchmark(
+        n_docs=args.docs,
+        seed=args.seed,
+        n_queries=args.queries,
+        ks=args.ks,
+        chunk_sizes=args.chunk_sizes,
+        chunk_overlap=args.chunk_overlap,
+        embeddings=args.embeddings,
+    )
+    print_report(runs, args.ks)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "runs": runs}, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Statistics
+- Percentiles and latency summaries shared by the load test and the
+  retrieval benchmark (no pipeline / model imports)
+"""
+
+from typing import Dict, List
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Linear-interpolated percentile (p in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_stats(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p90": round(percentile(values, 90), 2),
+        "p99": round(percentile(values, 99), 2),
+        "mean": round(sum(values) / len(values), 2) if values else 0.0,
+        "max": round(max(values), 2) if values else 0.0,
+    }
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Offline Benchmark Suite
+- Synthetic corpus, temporary Chroma directory, mock LLM server
+- Microbenchmarks: chunking, embedding, ingestion, search, context
+  building, end-to-end process / process_stream
+- Results saved to benchmarks/results/ for comparison across commits
+
+    python -m benchmarks.suite                      # hash embeddings, fully offline
+    python -m benchmarks.suite --embeddings model   # real EMBEDDING_MODEL
+    python -m benchmarks.suite --compare latest     # flag regressions vs the last run
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import platform
+import argparse
+import subprocess
+import statistics
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import generate_corpus, sample_queries
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REGRESSION_THRESHOLD = 0.10  # median slowdown that counts as a regression
+
+
+def bench(
+    fn: Callable[[Any], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    items: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, float]:
+    """Time `fn(setup())` `repeat` times after `warmup` untimed runs.
+
+    `setup` runs outside the timed region; `items` is the number of
+    units (chunks, queries, requests) one call processes.
+    """
+    def once() -> float:
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state)
+        return (time.perf_counter() - start) * 1000
+
+    for _ in range(warmup):
+        once()
+    runs = sorted(once() for _ in range(max(1, repeat)))
+    median = statistics.median(runs)
+    return {
+        "median_ms": round(median, 3),
+        "mean_ms": round(statistics.fmean(runs), 3),
+        "min_ms": round(runs[0], 3),
+        "max_ms": round(runs[-1], 3),
+        "items": items,
+        "items_per_sec": round(items / (median / 1000), 2) if median > 0 else 0.0,
+        "repeat": len(runs),
+    }
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, timeout=30,
+            cwd=os.path.dirname(RESULTS_DIR),
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_suite(
+    n_docs: int = 50,
+    n_queries: int = 20,
+    seed: int = 42,
+    embeddings: str = "hash",
+    repeat: int = 5,
+    e2e_requests: int = 5,
+    ttft_ms: float = 50.0,
+    tokens_per_sec: float = 500.0,
+    output_tokens: int = 32,
+) -> Dict[str, Dict[str, float]]:
+    """Run every microbenchmark and return {name: timing stats}."""
+    # Imported here so main() can switch the Hugging Face hub offline first
+    from cache import SemanticCache
+    from pipeline import IntegratedPipeline, PipelineInput, TaskType
+    from benchmarks.fixtures import isolated_rag
+    from benchmarks.mock_llm import MockLLMServer, MockLLMConfig, MOCK_MODEL
+
+    docs = generate_corpus(n_docs=n_docs, seed=seed)
+    texts = [doc.text for doc in docs]
+    metadatas = [doc.metadata for doc in docs]
+    queries = [query for query, _ in sample_queries(docs, n=n_queries, seed=seed)]
+    results: Dict[str, Dict[str, float]] = {}
+
+    def report(name: str, stats: Dict[str, float]):
+        results[name] = stats
+        print(f"  {name:<24} median {stats['median_ms']:>10.3f} ms  "
+              f"{stats['items_per_sec']:>10.1f} items/s  (n={stats['items']})")
+
+    with ExitStack() as stack:
+        rag = stack.enter_context(isolated_rag(embeddings))
+        chunks = [chunk for text in texts for chunk in rag.text_splitter.split_text(text)]
+        base = rag.embeddings.embeddings
+        print(f"Corpus: {len(docs)} documents, {len(chunks)} chunks, {len(queries)} queries")
+
+        report("chunking", bench(
+            lambda _: [rag.text_splitter.split_text(text) for text in texts],
+            repeat=repeat, items=len(chunks),
+        ))
+        batch = chunks[:64]
+        report("embed.documents", bench(lambda _: base.embed_documents(batch), repeat=repeat, items=len(batch)))
+        report("embed.query", bench(
+            lambda _: [base.embed_query(f"query: {q}") for q in queries], repeat=repeat, items=len(queries),
+        ))
+
+        # Fresh collection per run (cold embedding cache), then re-ingestion of the same corpus
+        report("ingest.fresh", bench(
+            lambda fresh: fresh.add_documents(texts, metadatas),
+            setup=lambda: stack.enter_context(isolated_rag(embeddings)),
+            repeat=max(1, repeat // 2), warmup=0, items=len(chunks),
+        ))
+        rag.add_documents(texts, metadatas)
+        report("ingest.unchanged", bench(lambda _: rag.add_documents(texts, metadatas), repeat=repeat, items=len(chunks)))
+
+        def cold_caches():
+            # Cold = no cached results and no cached query embeddings
+            rag.retrieval_cache.clear()
+            rag.embeddings.clear()
+
+        for name, search in (("dense", rag.search), ("hybrid", rag.hybrid_search)):
+            report(f"search.{name}.cold", bench(
+                lambda _: [search(q, k=6) for q in queries],
+                setup=cold_caches, repeat=repeat, items=len(queries),
+            ))
+            report(f"search.{name}.warm", bench(
+                lambda _: [search(q, k=6) for q in queries], repeat=repeat, items=len(queries),
+            ))
+
+        pipeline = IntegratedPipeline(rag_system=rag, model=MOCK_MODEL, coalesce=False)
+        pipeline.response_cache = SemanticCache(maxsize=0)
+        inputs = [PipelineInput(query=q, task_type=TaskType.QA) for q in queries]
+        retrieved = [rag.hybrid_search(q, k=6) for q in queries]
+
+        def build_context(_):
+            for input_data, found in zip(inputs, retrieved):
+                task_type = pipeline._resolve_task_type(input_data)
+                packed = pipeline._pack_context(input_data, task_type, found)
+                pipeline._build_messages(input_data.query, packed.context, task_type, packed.history)
+
+        report("context.build", bench(build_context, repeat=repeat, items=len(inputs)))
+
+        server = stack.enter_context(MockLLMServer(MockLLMConfig(
+            ttft_ms=ttft_ms, tokens_per_sec=tokens_per_sec, output_tokens=output_tokens, seed=seed,
+        )))
+        pipeline.base_url = server.url
+        e2e_inputs = inputs[:e2e_requests]
+        ttfts: List[float] = []
+
+        def run_process(_):
+            for input_data in e2e_inputs:
+                pipeline.process(input_data)
+
+        def run_stream(_):
+            for input_data in e2e_inputs:
+                output = pipeline.process_stream(input_data, lambda text: None)
+                ttfts.append(output.metrics.get("ttft_ms", 0.0))
+
+        report("e2e.process", bench(run_process, repeat=repeat, items=len(e2e_inputs)))
+        report("e2e.process_stream", bench(run_stream, repeat=repeat, items=len(e2e_inputs)))
+        results["e2e.process_stream"]["ttft_median_ms"] = round(statistics.median(ttfts), 3)
+
+    return results
+
+
+def save_results(results: Dict[str, Dict[str, float]], config: Dict[str, Any]) -> str:
+    """Write results with run metadata; returns the file path."""
+    commit = _git("rev-parse", "--short", "HEAD") or "nogit"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    payload = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": commit,
+            "dirty": dirty,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": config,
+        },
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{commit}{'-dirty' if dirty else ''}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def latest_result(exclude: Optional[str] = None) -> Optional[str]:
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline_path: str,
+    threshold: float = REGRESSION_THRESHOLD,
+) -> List[str]:
+    """Print median deltas against a saved run; returns the regressed benchmark names."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    meta = baseline.get("meta", {})
+    print(f"\nCompared with {os.path.basename(baseline_path)} (commit {meta.get('commit', '?')})")
+
+    regressions = []
+    for name, stats in current.items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("median_ms"):
+            print(f"  {name:<24} (new)")
+            continue
+        delta = (stats["median_ms"] - before["median_ms"]) / before["median_ms"]
+        flag = ""
+        if delta > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<24} {before['median_ms']:>10.3f} -> {stats['median_ms']:>10.3f} ms  {delta:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--docs", type=int, default=50, help="synthetic documents")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--embeddings", choices=["hash", "model"], default="hash",
+                        help="hash = offline feature hashing, model = EMBEDDING_MODEL")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--e2e-requests", type=int, default=5)
+    parser.add_argument("--ttft-ms", type=float, default=50.0, help="mock server time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=500.0, help="mock server decode rate")
+    parser.add_argument("--output-tokens", type=int, default=32, help="mock server response length")
+    parser.add_argument("--compare", help="baseline results JSON, or 'latest'")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="median slowdown flagged as a regression (0.1 = 10%%)")
+    parser.add_argument("--no-save", action="store_true", help="don't write a results file")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any benchmark regressed")
+    args = parser.parse_args()
+
+    if args.embeddings == "hash":
+        # Nothing to download: the tokenizer falls back to estimates if not cached
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+    config = {
+        "docs": args.docs,
+        "queries": args.queries,
+        "seed": args.seed,
+        "embeddings": args.embeddings,
+        "repeat": args.repeat,
+        "e2e_requests": args.e2e_requests,
+        "ttft_ms": args.ttft_ms,
+        "tokens_per_sec": args.tokens_per_sec,
+        "output_tokens": args.output_tokens,
+    }
+    baseline = latest_result() if args.compare == "latest" else args.compare
+    results = run_suite(
+        n_docs=args.docs,
+        n_queries=args.queries,
+        seed=args.seed,
+        embeddings=args.embeddings,
+        repeat=args.repeat,
+        e2e_requests=args.e2e_requests,
+        ttft_ms=args.ttft_ms,
+        tokens_per_sec=args.tokens_per_sec,
+        output_tokens=args.output_tokens,
+    )
+
+    if not args.no_save:
+        print(f"\nResults: {save_results(results, config)}")
+    if args.compare:
+        if not baseline:
+            print("\nNo baseline results to compare with")
+            return
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
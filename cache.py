@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Cache Module
+- LRUCache: bounded, thread-safe in-memory cache with hit/miss counters and optional TTL
+- DiskCache: persistent key -> bytes store (SQLite), optionally LRU-bounded
+- SemanticCache: context-keyed nearest-vector cache (LLM responses)
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sparse_index import tokenize
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache.
+
+    With `ttl` (seconds), entries also expire that long after being set.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at or None, value)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and (entry[0] is None or entry[0] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class DiskCache:
+    """Persistent key -> bytes store backed by a single SQLite file.
+
+    With `max_entries` > 0, reads refresh an access timestamp and writes
+    evict the least recently used rows beyond the limit.
+    """
+
+    def __init__(self, path: str, max_entries: int = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if "accessed_at" not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        found: Dict[str, bytes] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                if rows and self.max_entries > 0:
+                    self._conn.executemany(
+                        "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                        [(time.time(), key) for key, _ in rows],
+                    )
+                    self._conn.commit()
+            found.update(rows)
+        return found
+
+    def set(self, key: str, value: bytes):
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, bytes]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, accessed_at) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()],
+            )
+            if self.max_entries > 0:
+                count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                excess = count - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE key IN "
+                        "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                        (excess,),
+                    )
+                    self.evictions += excess
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def query_terms(text: str) -> frozenset:
+    """Normalized query for cache keys: the BM25 token set.
+
+    Ignores case, punctuation, spacing, detached particles and word
+    order ("RAG의 장점은?" == "rag 장점은"), but any change of content
+    word ("장점" -> "단점") changes the result.
+    """
+    return frozenset(tokenize(text))
+
+
+class SemanticCache:
+    """Similarity-matched cache.
+
+    An entry matches when its context key is equal and the cosine
+    similarity of its vector to the lookup vector (both L2-normalized)
+    is at least `threshold`. Bounded to `maxsize` entries, LRU-evicted.
+
+    Sentence embeddings score opposite questions over the same context
+    ("장점" vs "단점") very high, so callers pass the normalized query
+    terms as part of `key` (see query_terms) and the vector only has to
+    confirm a near-identical question.
+    """
+
+    def __init__(self, maxsize: int = 256, threshold: float = 0.95):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        # entry id -> (context key, vector, value)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._by_key: Dict[Hashable, List[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable, vector: List[float]) -> Optional[Tuple[Any, float]]:
+        """Best (value, similarity) for this context key above the threshold, or None."""
+        best_id, best_score = None, self.threshold
+        with self._lock:
+            for entry_id in self._by_key.get(key, ()):
+                _, cached_vector, _ = self._entries[entry_id]
+                score = sum(a * b for a, b in zip(vector, cached_vector))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id][2], best_score
+
+    def store(self, key: Hashable, vector: List[float], value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (key, vector, value)
+            self._by_key.setdefault(key, []).append(entry_id)
+            while len(self._entries) > self.maxsize:
+                old_id, (old_key, _, _) = self._entries.popitem(last=False)
+                ids = self._by_key[old_key]
+                ids.remove(old_id)
+                if not ids:
+                    del self._by_key[old_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_key.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
@@ -4,6 +4,16 @@
 """
 
 import streamlit as st
+from warmup import get_warmup, WarmupStatus
+
+WARMUP_STAGE_LABELS = {
+    "imports": "라이브러리 로딩",
+    "model_load": "임베딩 모델 로딩",
+    "encode_cold": "첫 인코딩 (cold)",
+    "encode_warm": "두 번째 인코딩 (warm)",
+    "index_load": "검색 인덱스 로딩",
+    "pipeline": "파이프라인 준비",
+}
 
 
 def apply_common_styles():
@@ -334,3 +344,71 @@ def render_bottom_nav(current: str = "home"):
     </div>
     """
     st.markdown(nav_html, unsafe_allow_html=True)
+
+
+def watch_job(job_id: str):
+    """업로드 작업을 진행 현황 패널에 등록"""
+    st.session_state.setdefault("watching_jobs", set()).add(job_id)
+
+
+@st.fragment(run_every=2)
+def render_ingest_jobs():
+    """자료 처리 현황 (2초마다 갱신, 완료되면 전체 화면 갱신)"""
+    # 모델 준비 전에는 jobs(rag) import 를 미룸 - 등록된 작업도 준비 후에야 생김
+    if not st.session_state.get("watching_jobs") and not get_warmup().state.ready:
+        return
+    from jobs import get_job_queue, JobStatus
+
+    queue = get_job_queue()
+    active = queue.active_jobs()
+    active_ids = {job.job_id for job in active}
+
+    for job in active:
+        if job.status == JobStatus.QUEUED:
+            st.caption(f"⏳ {job.filename} · 대기 중")
+        else:
+            st.caption(f"⏳ {job.filename} · {job.pages_processed}쪽 · {job.chunks_written}개 조각")
+
+    watching = st.session_state.get("watching_jobs", set())
+    finished = [job_id for job_id in watching if job_id not in active_ids]
+    if finished:
+        for job_id in finished:
+            watching.discard(job_id)
+            job = queue.get(job_id)
+            if job and job.status == JobStatus.FAILED:
+                st.toast(f"'{job.filename}' 처리 실패: {job.error}")
+            elif job:
+                st.toast(f"'{job.filename}' 추가됨")
+        st.rerun()
+
+
+@st.fragment(run_every=1)
+def render_warmup_status():
+    """모델 준비 상태 (준비되면 전체 화면 갱신) + 콜드 스타트 / warm 시간"""
+    state = get_warmup().state
+
+    if state.status == WarmupStatus.WARMING:
+        label = WARMUP_STAGE_LABELS.get(state.stage, state.stage)
+        st.caption(f"⏳ 모델 준비 중 · {label} ({state.elapsed_ms / 1000:.1f}초)")
+        st.session_state.warmup_pending = True
+        return
+
+    if state.status == WarmupStatus.FAILED:
+        st.caption(f"⚠️ 모델 준비 실패 · {state.error}")
+        return
+
+    if state.status != WarmupStatus.READY:
+        return
+
+    # 준비 중에 그려진 화면(자료 목록 등)을 다시 그림
+    if st.session_state.pop("warmup_pending", False):
+        st.rerun()
+
+    st.caption(f"✅ 준비 완료 · 콜드 스타트 {state.elapsed_ms / 1000:.1f}초")
+    with st.expander("시작 시간", expanded=False):
+        for stage, ms in state.stages_ms.items():
+            st.caption(f"{WARMUP_STAGE_LABELS.get(stage, stage)}: {ms:,.0f}ms")
+        if state.first_query_ms is not None:
+            st.caption(f"첫 질문 검색: {state.first_query_ms:,.0f}ms")
+        if state.warm_query_ms is not None:
+            st.caption(f"이후 질문 검색 (평균 {state.warm_queries}회): {state.warm_query_ms:,.0f}ms")
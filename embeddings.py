@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Embedding Module
+- CachedEmbeddings: on-disk embedding cache with an in-memory LRU front
+- QueryBatcher: micro-batches concurrent single-query encodes into one forward pass
+"""
+
+import queue
+import hashlib
+import threading
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from cache import LRUCache, DiskCache
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+# Upper bounds of the (cumulative) queue-depth histogram buckets
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+
+class QueryBatcher:
+    """Collects concurrent single-text encode requests into batches.
+
+    Callers block in `embed(text)`. A background thread takes the first
+    pending request, keeps collecting for up to `max_wait_ms` or until
+    `max_batch` texts, then runs one `encode_batch` call and hands each
+    caller its vector. Under load the batches also grow on their own
+    while the previous forward pass is running.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], List[List[float]]],
+        max_batch: int = 16,
+        max_wait_ms: float = 2.0,
+    ):
+        self.encode_batch = encode_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes: Counter = Counter()
+        self.queue_depths: Counter = Counter()
+
+    def embed(self, text: str) -> List[float]:
+        future: Future = Future()
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+                self._worker.start()
+            self.requests += 1
+            depth = self._queue.qsize()
+            self.queue_depths[next((b for b in QUEUE_DEPTH_BUCKETS if depth <= b), "+Inf")] += 1
+        self._queue.put((text, future))
+        return future.result()
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Identical concurrent queries are encoded once
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = dict(zip(texts, self.encode_batch(texts)))
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            with self._lock:
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+            for text, future in batch:
+                future.set_result(vectors[text])
+
+    def stats(self) -> dict:
+        with self._lock:
+            batched = sum(size * count for size, count in self.batch_sizes.items())
+            depth_histogram, cumulative = {}, 0
+            for bound in (*QUEUE_DEPTH_BUCKETS, "+Inf"):
+                cumulative += self.queue_depths[bound]
+                depth_histogram[f"le_{bound}"] = cumulative
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_size": round(batched / self.batches, 2) if self.batches else 0.0,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "queue_depth_histogram": depth_histogram,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that caches vectors by (model name, text).
+
+    The text is the exact string handed to the model, so e5 prefixes
+    ("query: ...") are part of the key. Lookups go memory LRU -> SQLite
+    -> model; only misses are encoded, in one batch.
+
+    With `query_batch_size` > 1, query misses from concurrent callers
+    go through a QueryBatcher instead of one forward pass each.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache_path: str,
+        memory_size: int = 4096,
+        query_batch_size: int = 0,
+        query_batch_wait_ms: float = 2.0,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.memory = LRUCache(maxsize=memory_size)
+        self.disk = DiskCache(cache_path)
+        self.disk_hits = 0
+        self.batcher = (
+            QueryBatcher(embeddings.embed_documents, max_batch=query_batch_size, max_wait_ms=query_batch_wait_ms)
+            if query_batch_size > 1 else None
+        )
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        missing = []
+        for key in keys:
+            vector = self.memory.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                found[key] = vector
+
+        if missing:
+            for key, blob in self.disk.get_many(missing).items():
+                vector = _unpack(blob)
+                self.memory.set(key, vector)
+                found[key] = vector
+                self.disk_hits += 1
+        return found
+
+    def _store(self, items: Dict[str, List[float]]):
+        for key, vector in items.items():
+            self.memory.set(key, vector)
+        self.disk.set_many({key: _pack(vector) for key, vector in items.items()})
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(keys)
+
+        # Encode each distinct missing text once
+        to_encode: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                to_encode.setdefault(key, text)
+
+        if to_encode:
+            vectors = self.embeddings.embed_documents(list(to_encode.values()))
+            computed = dict(zip(to_encode.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        found = self._lookup([key])
+        if key in found:
+            return found[key]
+        if self.batcher is not None:
+            vector = self.batcher.embed(text)
+        else:
+            vector = self.embeddings.embed_query(text)
+        self._store({key: vector})
+        return vector
+
+    def clear(self):
+        """Drop every cached vector (memory and disk), e.g. for cold-path benchmarks."""
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters ("misses" = texts actually sent to the model)."""
+        memory = self.memory.stats()
+        misses = memory["misses"] - self.disk_hits
+        lookups = memory["hits"] + memory["misses"]
+        stats = {
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": misses,
+            "hit_rate": round((lookups - misses) / lookups, 3) if lookups else 0.0,
+            "memory_size": memory["size"],
+        }
+        if self.batcher is not None:
+            stats["query_batching"] = self.batcher.stats()
+        return stats
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk Ingestion Module
+- Pipelined chunk -> embed -> Chroma write stages over bounded queues
+- Fixed-size embedding batches so memory stays flat for any corpus size
+- Progress callback (always invoked on the caller's thread)
+"""
+
+import queue
+import threading
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from tracing import propagate
+from metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from rag import RAGSystem
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+_metrics = get_metrics_registry()
+_ingest_chunks = _metrics.counter(
+    "rag_ingest_chunks_total", "Chunks through ingestion (skipped = already stored)", ["stage"]
+)
+_ingest_batch_seconds = _metrics.histogram("rag_ingest_batch_seconds", "Ingestion batch latency", ["stage"])
+
+
+@dataclass
+class IngestProgress:
+    """Bulk ingestion progress snapshot."""
+    chunks_seen: int = 0
+    chunks_skipped: int = 0  # already in the collection
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    done: bool = False
+
+
+ProgressCallback = Callable[[IngestProgress], None]
+
+
+def set_torch_threads(num_threads: int):
+    """Set torch intra-op thread count (0 leaves the torch default)."""
+    if num_threads > 0:
+        import torch
+        torch.set_num_threads(num_threads)
+
+
+class IngestionEngine:
+    """Bounded producer/consumer ingestion into a RAGSystem collection.
+
+    Stages:
+        1. caller thread: iterate (id, Document) pairs, drop IDs already
+           stored, group into batches of `batch_size`
+        2. embed thread: encode each batch via rag.embeddings
+        3. write thread: write vectors straight to the Chroma collection
+           and index the chunk texts in the BM25 index
+
+    Each queue holds at most `queue_size` batches, so a slow stage applies
+    backpressure instead of letting chunks pile up in memory.
+    """
+
+    def __init__(self, rag: "RAGSystem", batch_size: int = 32, queue_size: int = 4):
+        self.rag = rag
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+
+    def run(
+        self,
+        chunks: Iterable[Tuple[str, Document]],
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """Ingest (id, Document) pairs.
+
+        Args:
+            chunks: Iterable of (chunk ID, Document); may be a lazy generator
+            progress_callback: Called with IngestProgress snapshots
+
+        Returns:
+            List of chunk IDs seen (including ones that were already stored)
+        """
+        progress = IngestProgress()
+        tracer = self.rag.tracer
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        def report():
+            if progress_callback:
+                progress_callback(replace(progress))
+
+        def put(q: queue.Queue, item, on_wait: Optional[Callable[[], None]] = None) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    if on_wait:
+                        on_wait()
+            return False
+
+        def get(q: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def embed_worker():
+            try:
+                while True:
+                    item = get(embed_queue)
+                    if item is _DONE:
+                        break
+                    ids, docs = item
+                    with tracer.span("ingest.embed", chunks=len(docs)), _ingest_batch_seconds.time(stage="embed"):
+                        vectors = self.rag.embeddings.embed_documents([doc.page_content for doc in docs])
+                    progress.chunks_embedded += len(docs)
+                    _ingest_chunks.inc(len(docs), stage="embedded")
+                    if not put(write_queue, (ids, docs, vectors)):
+                        break
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                put(write_queue, _DONE)
+
+        def write_worker():
+            try:
+                while True:
+                    item = get(write_queue)
+                    if item is _DONE:
+                        break
+                    ids, docs, vectors = item
+                    with tracer.span("ingest.write", chunks=len(docs)), _ingest_batch_seconds.time(stage="write"):
+                        self._write(ids, docs, vectors)
+                    progress.chunks_written += len(docs)
+                    _ingest_chunks.inc(len(docs), stage="written")
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        # Worker spans are children of the caller's current span
+        workers = [
+            threading.Thread(target=propagate(embed_worker), name="ingest-embed", daemon=True),
+            threading.Thread(target=propagate(write_worker), name="ingest-write", daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        all_ids: List[str] = []
+        seen = set()
+        batch_ids: List[str] = []
+        batch_docs: List[Document] = []
+
+        def flush():
+            if not batch_ids:
+                return
+            with tracer.span("ingest.dedupe", chunks=len(batch_ids)):
+                existing = set(self.rag.vectorstore._collection.get(ids=batch_ids, include=[])["ids"])
+            progress.chunks_skipped += len(existing)
+            _ingest_chunks.inc(len(existing), stage="skipped")
+            new = [(i, d) for i, d in zip(batch_ids, batch_docs) if i not in existing]
+            if new:
+                ids, docs = map(list, zip(*new))
+                put(embed_queue, (ids, docs), on_wait=report)
+            batch_ids.clear()
+            batch_docs.clear()
+            report()
+
+        try:
+            for doc_id, doc in chunks:
+                if stop.is_set():
+                    break
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                all_ids.append(doc_id)
+                progress.chunks_seen += 1
+                batch_ids.append(doc_id)
+                batch_docs.append(doc)
+                if len(batch_ids) >= self.batch_size:
+                    flush()
+            flush()
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            put(embed_queue, _DONE)
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=_POLL_SECONDS)
+                    report()
+
+        if errors:
+            raise errors[0]
+
+        progress.done = True
+        report()
+        return all_ids
+
+    def _write(self, ids: List[str], docs: List[Document], vectors: List[List[float]]):
+        """Write precomputed vectors to the underlying Chroma collection."""
+        collection = self.rag.vectorstore._collection
+        # Chroma rejects empty metadata dicts, so write those rows without metadata
+        with_meta = [i for i, doc in enumerate(docs) if doc.metadata]
+        without_meta = [i for i, doc in enumerate(docs) if not doc.metadata]
+        if with_meta:
+            collection.upsert(
+                ids=[ids[i] for i in with_meta],
+                embeddings=[vectors[i] for i in with_meta],
+                documents=[docs[i].page_content for i in with_meta],
+                metadatas=[docs[i].metadata for i in with_meta],
+            )
+        if without_meta:
+            collection.upsert(
+                ids=[ids[i] for i in without_meta],
+                embeddings=[vectors[i] for i in without_meta],
+                documents=[docs[i].page_content for i in without_meta],
+            )
+        self.rag.sparse_index.add(ids, [doc.page_content for doc in docs])
+        self.rag.clear_search_cache()
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Ingestion Job Queue Module
+- Background worker around RAGSystem.add_pdf / add_image / add_txt
+- Persistent job table (SQLite) so uploads survive browser refreshes
+- UI submits a job and polls its status instead of blocking a rerun
+"""
+
+import os
+import time
+import uuid
+import shutil
+import sqlite3
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from rag import RAGSystem, get_rag_system
+
+JOB_KINDS = {"txt": "txt", "pdf": "pdf", "png": "image", "jpg": "image", "jpeg": "image"}
+PROGRESS_FLUSH_SECONDS = 0.5
+
+
+class JobStatus(Enum):
+    """Ingestion job status"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class IngestJob:
+    """Ingestion job row"""
+    job_id: str
+    filename: str
+    kind: str
+    status: JobStatus
+    use_ocr: bool = True
+    pages_processed: int = 0
+    chunks_written: int = 0
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "kind": self.kind,
+            "status": self.status.value,
+            "use_ocr": self.use_ocr,
+            "pages_processed": self.pages_processed,
+            "chunks_written": self.chunks_written,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+_COLUMNS = (
+    "job_id, filename, kind, status, use_ocr, pages_processed, "
+    "chunks_written, error, created_at, updated_at"
+)
+
+
+class IngestJobQueue:
+    """Persistent ingestion queue drained by a single background thread.
+
+    Uploaded bytes are spooled to disk at submit time, so a job only
+    depends on the server process, not on the Streamlit session that
+    submitted it. Jobs found 'running' at startup (process died mid-job)
+    are re-queued; re-running is cheap thanks to the ingest manifest.
+    """
+
+    def __init__(self, rag: Optional[RAGSystem] = None, data_dir: Optional[str] = None):
+        self.rag = rag or get_rag_system()
+        self.data_dir = data_dir or os.path.join(self.rag.persist_directory, "jobs")
+        self.spool_dir = os.path.join(self.data_dir, "uploads")
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._conn = sqlite3.connect(os.path.join(self.data_dir, "jobs.sqlite"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, filename TEXT NOT NULL, kind TEXT NOT NULL, "
+            "status TEXT NOT NULL, use_ocr INTEGER NOT NULL DEFAULT 1, "
+            "pages_processed INTEGER NOT NULL DEFAULT 0, chunks_written INTEGER NOT NULL DEFAULT 0, "
+            "error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+            (JobStatus.QUEUED.value, time.time(), JobStatus.RUNNING.value),
+        )
+
+        self._worker = threading.Thread(target=self._run, name="ingest-jobs", daemon=True)
+        self._worker.start()
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+        return rows
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        values = [v.value if isinstance(v, JobStatus) else v for v in fields.values()]
+        self._execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*values, job_id))
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> IngestJob:
+        return IngestJob(
+            job_id=row[0],
+            filename=row[1],
+            kind=row[2],
+            status=JobStatus(row[3]),
+            use_ocr=bool(row[4]),
+            pages_processed=row[5],
+            chunks_written=row[6],
+            error=row[7],
+            created_at=row[8],
+            updated_at=row[9],
+        )
+
+    def _spool_path(self, job_id: str) -> str:
+        return os.path.join(self.spool_dir, job_id)
+
+    def submit(self, file: BinaryIO, filename: str, use_ocr: bool = True) -> str:
+        """Queue an uploaded file for ingestion.
+
+        Args:
+            file: File object (binary)
+            filename: Original filename (source name and type)
+            use_ocr: Whether to use OCR for image-based PDF pages
+
+        Returns:
+            Job ID
+        """
+        ext = filename.lower().split(".")[-1]
+        kind = JOB_KINDS.get(ext)
+        if kind is None:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
+
+        job_id = uuid.uuid4().hex
+        with open(self._spool_path(job_id), "wb") as spool:
+            shutil.copyfileobj(file, spool, 1024 * 1024)
+
+        now = time.time()
+        self._execute(
+            f"INSERT INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, 0, 0, NULL, ?, ?)",
+            (job_id, filename, kind, JobStatus.QUEUED.value, int(use_ocr), now, now),
+        )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        """Get a job by ID."""
+        rows = self._execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,))
+        return self._row_to_job(rows[0]) if rows else None
+
+    def list_jobs(self, limit: int = 20) -> List[IngestJob]:
+        """Most recent jobs first."""
+        rows = self._execute(f"SELECT {_COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [self._row_to_job(row) for row in rows]
+
+    def active_jobs(self) -> List[IngestJob]:
+        """Queued and running jobs, oldest first."""
+        rows = self._execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+            (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+        )
+        return [self._row_to_job(row) for row in rows]
+
+    def clear_finished(self):
+        """Remove done/failed jobs from the table."""
+        self._execute(
+            "DELETE FROM jobs WHERE status IN (?, ?)",
+            (JobStatus.DONE.value, JobStatus.FAILED.value),
+        )
+
+    def _next_job(self) -> Optional[IngestJob]:
+        rows = self._execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+            (JobStatus.QUEUED.value,),
+        )
+        return self._row_to_job(rows[0]) if rows else None
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            self._process(job)
+
+    def _process(self, job: IngestJob):
+        self._update(job.job_id, status=JobStatus.RUNNING)
+        state = {"pages": 0, "chunks": 0, "flushed_at": 0.0}
+
+        def flush(force: bool = False):
+            now = time.time()
+            if force or now - state["flushed_at"] >= PROGRESS_FLUSH_SECONDS:
+                state["flushed_at"] = now
+                self._update(job.job_id, pages_processed=state["pages"], chunks_written=state["chunks"])
+
+        def on_page(page_num: int):
+            state["pages"] = page_num
+            flush()
+
+        def on_progress(progress):
+            state["chunks"] = progress.chunks_written
+            flush()
+
+        path = self._spool_path(job.job_id)
+        try:
+            with open(path, "rb") as f:
+                if job.kind == "pdf":
+                    self.rag.add_pdf(
+                        f, job.filename, use_ocr=job.use_ocr,
+                        progress_callback=on_progress, page_callback=on_page,
+                    )
+                elif job.kind == "image":
+                    self.rag.add_image(f, job.filename, progress_callback=on_progress)
+                    state["pages"] = 1
+                else:
+                    self.rag.add_txt(f, job.filename, progress_callback=on_progress)
+            flush(force=True)
+            self._update(job.job_id, status=JobStatus.DONE)
+        except Exception as e:
+            flush(force=True)
+            self._update(job.job_id, status=JobStatus.FAILED, error=str(e))
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+# Singleton instance
+_job_queue_instance: Optional[IngestJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> IngestJobQueue:
+    """Get or create the ingestion job queue singleton."""
+    global _job_queue_instance
+    with _job_queue_lock:
+        if _job_queue_instance is None:
+            _job_queue_instance = IngestJobQueue()
+    return _job_queue_instance
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 클라이언트 레지스트리 (LLM Client Registry)
+- ChatOpenAI 인스턴스를 설정별로 재사용
+- base_url별 keep-alive HTTP 커넥션 풀 공유 (비동기 풀은 이벤트 루프별)
+- 풀 크기 / 타임아웃 설정
+- 커넥션 예열 (검색 중에 LLM 서버 연결을 미리 열어둠)
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+from cache import LRUCache
+
+# Load environment variables
+load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
+
+# Settings
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "120"))
+LLM_CLIENT_CACHE_SIZE = 64
+# 스트리밍 응답 끝에 토큰 사용량 요청 (stream_options.include_usage, 미지원 서버는 false)
+LLM_STREAM_USAGE = os.getenv("LLM_STREAM_USAGE", "true").lower() in ("1", "true", "yes")
+
+
+class LLMClientRegistry:
+    """설정별 ChatOpenAI 재사용 레지스트리
+
+    클라이언트는 (model, base_url, api_key, temperature, max_tokens, streaming)
+    키로 캐시되고, 같은 base_url을 쓰는 클라이언트는 하나의 httpx 커넥션
+    풀을 공유한다. 요청마다 새 TCP/TLS 연결을 맺지 않으므로 첫 토큰까지의
+    시간이 줄어든다.
+
+    비동기 커넥션은 연 이벤트 루프에 묶이므로 비동기 풀은 (루프, base_url)
+    별로 두고, 닫힌 루프의 풀은 소켓을 닫고 버린다 (asyncio.run을 여러 번
+    호출해도 닫힌 루프의 커넥션을 재사용하거나 흘리지 않음).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_keepalive_connections: int = LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        read_timeout: float = LLM_READ_TIMEOUT,
+        stream_usage: bool = LLM_STREAM_USAGE
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.stream_usage = stream_usage
+        self._http_clients: Dict[str, httpx.Client] = {}
+        # (이벤트 루프 또는 None, base_url) -> 클라이언트 (None = 루프 밖에서 생성)
+        self._async_http_clients: Dict[Tuple[Any, str], httpx.AsyncClient] = {}
+        self._llms = LRUCache(maxsize=LLM_CLIENT_CACHE_SIZE)
+        self._warmed_at: Dict[tuple, float] = {}  # ("sync", base_url) 또는 ("async", id(풀)) -> 마지막 예열 시각
+        self._lock = threading.Lock()
+
+    def http_client(self, base_url: str) -> httpx.Client:
+        """base_url별 공유 동기 HTTP 클라이언트"""
+        with self._lock:
+            client = self._http_clients.get(base_url)
+            if client is None or client.is_closed:
+                client = httpx.Client(limits=self.limits, timeout=self.timeout)
+                self._http_clients[base_url] = client
+            return client
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def async_http_client(self, base_url: str) -> httpx.AsyncClient:
+        """실행 중인 이벤트 루프 + base_url별 공유 비동기 HTTP 클라이언트"""
+        key = (self._running_loop(), base_url)
+        with self._lock:
+            # 닫힌 루프의 풀은 재사용할 수 없음 (커넥션이 그 루프에 묶여 있음)
+            self._prune_closed_loops()
+            client = self._async_http_clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+                self._async_http_clients[key] = client
+            return client
+
+    def _pop_async_client(self, key: Tuple[Any, str]) -> httpx.AsyncClient:
+        """비동기 풀 제거 (self._lock 안에서 호출)"""
+        client = self._async_http_clients.pop(key)
+        self._warmed_at.pop(("async", id(client)), None)
+        return client
+
+    def _prune_closed_loops(self):
+        """닫힌 루프의 비동기 풀을 제거하고 소켓을 닫는다 (self._lock 안에서 호출)"""
+        for stale in [k for k in self._async_http_clients if k[0] is not None and k[0].is_closed()]:
+            self._close_sockets(self._pop_async_client(stale))
+
+    @staticmethod
+    def _close_sockets(client: httpx.AsyncClient):
+        """닫힌 루프에 묶인 풀의 소켓을 동기로 닫기
+
+        aclose()는 커넥션을 연 루프에서만 동작하고 닫힌 루프에서는
+        RuntimeError("Event loop is closed")로 끝나 소켓이 GC될 때까지 남는다.
+        그래서 httpcore 커넥션의 소켓을 직접 닫는다.
+        """
+        pool = getattr(client._transport, "_pool", None)
+        for connection in list(getattr(pool, "connections", ())):
+            stream = getattr(getattr(connection, "_connection", None), "_network_stream", None)
+            sock = stream.get_extra_info("socket") if stream is not None else None
+            sock = getattr(sock, "_sock", sock)  # asyncio는 TransportSocket 래퍼를 돌려줌
+            if sock is not None:
+                sock.close()
+
+    def get(
+        self,
+        model: str,
+        base_url: str,
+        api_key: str,
+        temperature: float = 0.4,
+        max_tokens: Optional[int] = 1024,
+        streaming: bool = False
+    ) -> ChatOpenAI:
+        """설정에 맞는 ChatOpenAI 반환 (없으면 생성, 이벤트 루프별로 따로 캐시)"""
+        async_client = self.async_http_client(base_url)
+        # id는 캐시된 ChatOpenAI가 클라이언트를 붙잡고 있는 동안 재사용되지 않음
+        key = (model, base_url, api_key, temperature, max_tokens, streaming, id(async_client))
+        llm = self._llms.get(key)
+        if llm is None:
+            llm = ChatOpenAI(
+                model=model,
+                base_url=base_url,
+                api_key=api_key,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                streaming=streaming,
+                stream_usage=self.stream_usage,
+                timeout=self.timeout,
+                http_client=self.http_client(base_url),
+                http_async_client=async_client
+            )
+            self._llms.set(key, llm)
+        return llm
+
+    def _should_warm(self, pool_key: tuple) -> bool:
+        """keep-alive 만료 전에 이미 예열했으면 생략"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._warmed_at.get(pool_key, float("-inf")) < self.limits.keepalive_expiry / 2:
+                return False
+            self._warmed_at[pool_key] = now
+            return True
+
+    @staticmethod
+    def _warm_up_request(base_url: str, api_key: str) -> tuple:
+        return f"{base_url.rstrip('/')}/models", {"Authorization": f"Bearer {api_key}"}
+
+    def warm_up(self, base_url: str, api_key: str) -> bool:
+        """풀에 LLM 서버 연결을 미리 열어둔다 (GET /models)
+
+        첫 LLM 호출이 TCP/TLS 연결 비용을 치르지 않도록 검색과 동시에 호출한다.
+
+        Returns:
+            bool: 실제로 요청을 보냈고 성공했는지 여부
+        """
+        if not self._should_warm(("sync", base_url)):
+            return False
+        url, headers = self._warm_up_request(base_url, api_key)
+        try:
+            self.http_client(base_url).get(url, headers=headers)
+            return True
+        except httpx.HTTPError:
+            return False
+
+    async def awarm_up(self, base_url: str, api_key: str) -> bool:
+        """warm_up의 비동기 버전 (비동기 커넥션 풀 예열)"""
+        client = self.async_http_client(base_url)
+        if not self._should_warm(("async", id(client))):  # 루프별 풀마다 따로 예열
+            return False
+        url, headers = self._warm_up_request(base_url, api_key)
+        try:
+            await client.get(url, headers=headers)
+            return True
+        except httpx.HTTPError:
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """레지스트리 상태"""
+        return {
+            "clients": len(self._llms),
+            "http_pools": len(self._http_clients),
+            "async_http_pools": len(self._async_http_clients),
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections
+        }
+
+    def close(self):
+        """동기 커넥션 풀 닫기 (비동기 풀은 aclose 사용)"""
+        with self._lock:
+            for client in self._http_clients.values():
+                client.close()
+            self._http_clients.clear()
+            self._warmed_at.clear()
+        self._llms.clear()
+
+    async def aclose_loop(self):
+        """현재 이벤트 루프의 비동기 커넥션 풀 닫기 (asyncio.run 끝에서 호출)"""
+        loop = self._running_loop()
+        with self._lock:
+            self._prune_closed_loops()
+            keys = [k for k in self._async_http_clients if k[0] is loop]
+            clients = [self._pop_async_client(k) for k in keys]
+        for client in clients:
+            await client.aclose()
+
+    async def aclose(self):
+        """모든 커넥션 풀 닫기
+
+        다른 루프의 비동기 풀은 그 루프에서만 aclose할 수 있으므로,
+        살아 있는 루프에는 aclose를 예약하고 닫힌 루프의 풀은 소켓을 직접 닫는다.
+        """
+        self.close()
+        loop = self._running_loop()
+        with self._lock:
+            self._prune_closed_loops()
+            clients = list(self._async_http_clients.items())
+            self._async_http_clients.clear()
+        for (owner, _), client in clients:
+            if owner is None or owner is loop:
+                await client.aclose()
+            else:
+                asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+
+
+# 싱글톤 인스턴스
+_registry_instance: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """LLM 클라이언트 레지스트리 싱글톤 반환"""
+    global _registry_instance
+    with _registry_lock:
+        if _registry_instance is None:
+            _registry_instance = LLMClientRegistry()
+    return _registry_instance
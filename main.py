@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+오렌지 튜터 - HTTP API 서버 (FastAPI)
+- 질의 (일반 / SSE 토큰 스트리밍)
+- 자료 등록 (파일 업로드는 백그라운드 작업 큐, 텍스트는 즉시)
+- 퀴즈 생성, 컬렉션 통계
+- 운영 메트릭 (/metrics, Prometheus), 요청별 트레이스 (/traces)
+
+실행: uvicorn main:app --host 0.0.0.0 --port 8000
+
+임베딩 모델과 Chroma 핸들은 프로세스 단위 싱글톤(get_rag_system)이므로
+워커 1개가 이벤트 루프에서 모든 요청을 다중화한다. 수평 확장은
+--workers 대신 컨테이너(레플리카) 단위로 한다. Chroma 영속 디렉터리는
+여러 프로세스가 동시에 쓰면 안 되기 때문이다.
+"""
+
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from rag import get_rag_system
+from jobs import get_job_queue
+from llm_clients import get_llm_registry
+from tracing import get_tracer
+from metrics import get_metrics_registry, start_metrics_server, CONTENT_TYPE
+from pipeline import (
+    get_pipeline,
+    PipelineInput,
+    TaskType,
+    build_quiz_input,
+    parse_quiz_response,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """시작 시 임베딩 모델/Chroma/토크나이저/작업 큐를 미리 로드, 종료 시 커넥션 풀 정리"""
+    pipeline = await run_in_threadpool(get_pipeline)
+    await run_in_threadpool(pipeline.token_counter.load)  # 로컬 캐시에서만 (없으면 추정치)
+    await run_in_threadpool(get_job_queue)
+    start_metrics_server()  # METRICS_PORT가 설정된 경우 별도 포트에서도 노출
+    yield
+    await get_llm_registry().aclose()
+
+
+app = FastAPI(title="오렌지 튜터 API", lifespan=lifespan)
+
+
+class QueryRequest(BaseModel):
+    """질의 요청"""
+    query: str = Field(..., min_length=1)
+    task_type: TaskType = TaskType.QA
+    context_k: int = Field(3, ge=1, le=20)
+    max_tokens: int = Field(1024, ge=1)
+    temperature: float = Field(0.4, ge=0.0, le=2.0)
+    chat_history: List[Dict[str, str]] = Field(default_factory=list)
+
+    def to_input(self) -> PipelineInput:
+        return PipelineInput(
+            query=self.query,
+            task_type=self.task_type,
+            context_k=self.context_k,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            chat_history=self.chat_history
+        )
+
+
+class TextRequest(BaseModel):
+    """텍스트 자료 등록 요청"""
+    text: str = Field(..., min_length=1)
+    title: str = ""
+
+
+class QuizRequest(BaseModel):
+    """퀴즈 생성 요청"""
+    num: int = Field(3, ge=1, le=20)
+    difficulty: str = "보통"
+
+
+def _sse(event: str, data: Any) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/health")
+def health() -> Dict[str, str]:
+    """헬스 체크"""
+    return {"status": "ok"}
+
+
+@app.post("/query")
+async def query(request: QueryRequest) -> Dict[str, Any]:
+    """질의 (전체 응답)"""
+    output = await get_pipeline().aprocess(request.to_input())
+    return output.to_dict()
+
+
+@app.post("/query/stream")
+async def query_stream(request: QueryRequest) -> StreamingResponse:
+    """질의 (SSE 스트리밍)
+
+    이벤트:
+        token: {"text": "..."} - 생성된 토큰 조각
+        done: PipelineOutput.to_dict() - 최종 결과와 메트릭
+        error: {"detail": "..."} - 처리 중 오류
+    """
+    pipeline = get_pipeline()
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        try:
+            output = await pipeline.aprocess_stream(
+                request.to_input(),
+                lambda text: events.put_nowait(("token", {"text": text}))
+            )
+            events.put_nowait(("done", output.to_dict()))
+        except Exception as e:
+            events.put_nowait(("error", {"detail": str(e)}))
+
+    async def stream():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event, data = await events.get()
+                yield _sse(event, data)
+                if event != "token":
+                    break
+        finally:
+            # 클라이언트가 연결을 끊으면 LLM 스트림도 중단
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/quiz")
+async def quiz(request: QuizRequest) -> Dict[str, Any]:
+    """학습 자료 기반 퀴즈 생성"""
+    output = await get_pipeline().aprocess(build_quiz_input(request.num, request.difficulty))
+    try:
+        questions = parse_quiz_response(output.response)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=502, detail="퀴즈 생성에 실패했어요. 다시 시도해주세요.")
+    return {"questions": questions, "metrics": output.metrics}
+
+
+@app.post("/documents/upload", status_code=202)
+async def upload_document(file: UploadFile = File(...), use_ocr: bool = Form(True)) -> Dict[str, Any]:
+    """파일 업로드 (PDF/이미지/TXT) - 백그라운드 작업으로 등록"""
+    job_queue = get_job_queue()
+    try:
+        job_id = await run_in_threadpool(job_queue.submit, file.file, file.filename or "", use_ocr)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job_queue.get(job_id).to_dict()
+
+
+@app.post("/documents/text")
+def add_text(request: TextRequest) -> Dict[str, Any]:
+    """텍스트 자료 등록"""
+    source = request.title.strip() or "직접입력"
+    ids = get_rag_system().add_document(request.text, metadata={"source": source, "type": "manual"})
+    return {"source": source, "chunks": len(ids)}
+
+
+@app.get("/jobs")
+def list_jobs(limit: int = 20) -> List[Dict[str, Any]]:
+    """최근 자료 처리 작업 목록"""
+    return [job.to_dict() for job in get_job_queue().list_jobs(limit=limit)]
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str) -> Dict[str, Any]:
+    """자료 처리 작업 상태"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """운영 메트릭 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(get_metrics_registry().render(), media_type=CONTENT_TYPE)
+
+
+def _trace_buffer():
+    buffer = get_tracer().buffer
+    if buffer is None:
+        raise HTTPException(status_code=404, detail="트레이싱이 꺼져 있습니다 (TRACING_ENABLED, TRACE_EXPORTERS=memory).")
+    return buffer
+
+
+@app.get("/traces")
+def list_traces(limit: int = 20, name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """최근 요청/작업 트레이스 목록 (루트 스팬 기준)"""
+    return _trace_buffer().traces(limit=limit, name=name)
+
+
+@app.get("/traces/{trace_id}")
+def get_trace(trace_id: str) -> Dict[str, Any]:
+    """트레이스의 스팬 목록과 단계별 소요 시간"""
+    trace = _trace_buffer().trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="트레이스를 찾을 수 없습니다.")
+    return trace
+
+
+@app.get("/sources")
+def sources() -> List[str]:
+    """등록된 자료 목록"""
+    return get_rag_system().get_sources()
+
+
+@app.get("/stats")
+def stats() -> Dict[str, Any]:
+    """컬렉션 / 캐시 / LLM 클라이언트 통계"""
+    pipeline = get_pipeline()
+    return {
+        "collection": get_rag_system().get_collection_stats(),
+        "response_cache": pipeline.get_cache_stats(),
+        "coalescing": pipeline.get_coalesce_stats(),
+        "llm_clients": get_llm_registry().stats()
+    }
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Ingestion Manifest Module
+- Persistent record of ingested files (file hash -> chunk IDs)
+- Content-hash helpers used for deterministic chunk IDs
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import BinaryIO, Dict, List, Optional
+
+MANIFEST_FILENAME = "ingest_manifest.json"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(file: BinaryIO) -> str:
+    """SHA-256 of a binary file object, read in blocks. Rewinds the file afterwards."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def chunk_id(source: str, chunk: str) -> str:
+    """Deterministic chunk ID: hash of the chunk text scoped to its source."""
+    return hashlib.sha256(f"{source}\x00{chunk}".encode("utf-8")).hexdigest()
+
+
+class IngestManifest:
+    """JSON manifest of ingested files, stored next to the Chroma DB.
+
+    Layout::
+
+        {"files": {"<source>": {"file_hash": "...", "chunk_ids": ["...", ...]}}}
+
+    Entries are keyed by source name on purpose: an upload under an existing
+    name is a new version of that file and replaces its chunks, and chunk IDs
+    are scoped to their source so every upload is cited and replaced on its
+    own. The same content under a new name is stored again, but its vectors
+    come from the content-keyed embedding cache, so the model is not re-run.
+    """
+
+    def __init__(self, persist_directory: str):
+        self.path = os.path.join(persist_directory, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        self._files: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError):
+            # A corrupt manifest only costs a re-embed; start fresh
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self._files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, source: str) -> Optional[dict]:
+        """Get the manifest entry for a source, if any."""
+        with self._lock:
+            entry = self._files.get(source)
+            return dict(entry) if entry else None
+
+    def update(self, source: str, file_hash: str, chunk_ids: List[str]):
+        """Record (or replace) a source's file hash and chunk IDs."""
+        with self._lock:
+            self._files[source] = {"file_hash": file_hash, "chunk_ids": list(chunk_ids)}
+            self._save()
+
+    def clear(self):
+        """Forget all sources."""
+        with self._lock:
+            self._files = {}
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self._files)
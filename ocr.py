@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+OCR Module
+- Page rendering (PyMuPDF) and Tesseract wrappers
+- OCRCache: persistent OCR results keyed by rendered image hash
+- Page triage (blank / near-blank / image) and DPI selection before OCR
+- Kept free of langchain/torch imports so process-pool workers start fast
+"""
+
+import io
+import re
+import hashlib
+from enum import Enum
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+import pytesseract
+
+from cache import DiskCache
+
+# Default render zoom for OCR (used for standalone images and as a fallback)
+OCR_ZOOM = 2.0
+OCR_LANG = "kor+eng"
+
+# Page triage
+OCR_TARGET_DPI = 200           # tesseract is accurate from ~200 DPI up
+OCR_MAX_SIDE_PX = 3000         # cap render size for large-format pages
+TRIAGE_ZOOM = 0.25             # 18 DPI grayscale thumbnail
+INK_THRESHOLD = 200            # gray level below which a pixel counts as ink
+BLANK_INK_RATIO = 0.001
+SPARSE_INK_RATIO = 0.02
+SPARSE_MARGIN_PT = 18
+
+_INK_TABLE = bytes(1 if v < INK_THRESHOLD else 0 for v in range(256))
+_INK_PATTERN = re.compile(rb"[\x00-\x%02x]" % (INK_THRESHOLD - 1))
+_HANGUL_PATTERN = re.compile(r"[\uac00-\ud7a3\u3131-\u318e]")
+
+
+class PageKind(Enum):
+    """Text-less page classification"""
+    BLANK = "blank"      # nothing to read - skipped
+    SPARSE = "sparse"    # a few marks (titles, page numbers) - OCR the inked area only
+    IMAGE = "image"      # scanned content - OCR the whole page
+
+
+def classify_page(page: "fitz.Page") -> Tuple[PageKind, Optional["fitz.Rect"]]:
+    """Triage a text-less page from a low-res grayscale thumbnail.
+
+    Returns:
+        (kind, clip) - clip is the inked area (page coordinates) for SPARSE pages
+    """
+    thumb = page.get_pixmap(matrix=fitz.Matrix(TRIAGE_ZOOM, TRIAGE_ZOOM), colorspace=fitz.csGRAY, alpha=False)
+    samples = thumb.samples
+    total = thumb.width * thumb.height
+    ink_ratio = samples.translate(_INK_TABLE).count(1) / total if total else 0.0
+
+    if ink_ratio < BLANK_INK_RATIO:
+        return PageKind.BLANK, None
+    if ink_ratio >= SPARSE_INK_RATIO:
+        return PageKind.IMAGE, None
+
+    # Bounding box of inked thumbnail pixels
+    stride = thumb.stride
+    x0, y0, x1, y1 = thumb.width, thumb.height, -1, -1
+    for y in range(thumb.height):
+        row = samples[y * stride:y * stride + thumb.width]
+        first = _INK_PATTERN.search(row)
+        if first is None:
+            continue
+        last = _INK_PATTERN.search(row[::-1])
+        x0 = min(x0, first.start())
+        x1 = max(x1, thumb.width - 1 - last.start())
+        y0 = min(y0, y)
+        y1 = y
+    if x1 < 0:
+        return PageKind.BLANK, None
+
+    scale = 1 / TRIAGE_ZOOM
+    rect = page.rect
+    clip = fitz.Rect(
+        rect.x0 + x0 * scale - SPARSE_MARGIN_PT,
+        rect.y0 + y0 * scale - SPARSE_MARGIN_PT,
+        rect.x0 + (x1 + 1) * scale + SPARSE_MARGIN_PT,
+        rect.y0 + (y1 + 1) * scale + SPARSE_MARGIN_PT,
+    ) & rect
+    return PageKind.SPARSE, clip
+
+
+def ocr_zoom(page: "fitz.Page", target_dpi: int = OCR_TARGET_DPI, max_side_px: int = OCR_MAX_SIDE_PX) -> float:
+    """Render zoom for OCR from the page's physical size (points = 1/72 inch)."""
+    zoom = target_dpi / 72
+    long_side = max(page.rect.width, page.rect.height)
+    if long_side * zoom > max_side_px:
+        zoom = max_side_px / long_side
+    return round(zoom, 2)
+
+
+@lru_cache(maxsize=1)
+def installed_languages() -> frozenset:
+    """Tesseract language packs available on this machine."""
+    try:
+        return frozenset(pytesseract.get_languages(config=""))
+    except (pytesseract.TesseractError, pytesseract.TesseractNotFoundError, OSError):
+        return frozenset()
+
+
+@lru_cache(maxsize=8)
+def language_works(lang: str) -> bool:
+    """Probe tesseract once with `lang` on a blank image (missing packs raise)."""
+    try:
+        pytesseract.image_to_string(Image.new("L", (32, 32), 255), lang=lang)
+    except pytesseract.TesseractError:
+        return False
+    except (pytesseract.TesseractNotFoundError, OSError):
+        pass  # no tesseract at all - falling back to "eng" would not help
+    return True
+
+
+def choose_language(sample_text: str = "") -> str:
+    """Pick the OCR language once per document.
+
+    Korean is included unless a text-layer sample shows no Hangul;
+    packs that aren't installed are dropped up front instead of failing
+    (and retrying) on every page. When the installed packs can't be
+    listed, the combination is probed once and falls back to "eng".
+    """
+    wanted = ["kor", "eng"] if not sample_text or _HANGUL_PATTERN.search(sample_text) else ["eng"]
+    installed = installed_languages()
+    if installed:
+        wanted = [lang for lang in wanted if lang in installed]
+    lang = "+".join(wanted) or "eng"
+    if not installed and lang != "eng" and not language_works(lang):
+        return "eng"
+    return lang
+
+
+def render_page(page: "fitz.Page", zoom: float = OCR_ZOOM, clip: Optional["fitz.Rect"] = None) -> "fitz.Pixmap":
+    """Render a PDF page (or the clipped part of it) to a pixmap for OCR."""
+    mat = fitz.Matrix(zoom, zoom)
+    return page.get_pixmap(matrix=mat, clip=clip)
+
+
+def pixmap_hash(pix: "fitz.Pixmap") -> str:
+    """SHA-256 of a pixmap's raw samples and geometry."""
+    digest = hashlib.sha256(f"{pix.width}x{pix.height}x{pix.n}".encode())
+    digest.update(pix.samples)
+    return digest.hexdigest()
+
+
+def image_hash(img: Image.Image) -> str:
+    """SHA-256 of a PIL image's decoded pixels and geometry."""
+    digest = hashlib.sha256(f"{img.width}x{img.height}x{img.mode}".encode())
+    digest.update(img.tobytes())
+    return digest.hexdigest()
+
+
+def image_to_text(img: Image.Image, lang: Optional[str] = None) -> str:
+    """Run OCR on an image (language defaults to choose_language())."""
+    return pytesseract.image_to_string(img, lang=lang or choose_language())
+
+
+def ocr_png(png_bytes: bytes, lang: str = OCR_LANG) -> str:
+    """Run OCR on PNG bytes.
+
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    """
+    img = Image.open(io.BytesIO(png_bytes))
+    return image_to_text(img, lang=lang)
+
+
+class OCRCache:
+    """Persistent OCR results keyed by (image hash, language, zoom).
+
+    Identical pages - re-uploads, or pages shared between versions of a
+    scan - skip tesseract entirely. Bounded by `max_entries` with LRU
+    eviction.
+    """
+
+    def __init__(self, path: str, max_entries: int = 50000):
+        self.disk = DiskCache(path, max_entries=max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(image_digest: str, lang: str = OCR_LANG, zoom: float = OCR_ZOOM) -> str:
+        return f"{image_digest}:{lang}:{zoom:g}"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.disk.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value.decode("utf-8")
+
+    def set(self, key: str, text: str):
+        self.disk.set(key, text.encode("utf-8"))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "size": len(self.disk),
+            "max_entries": self.disk.max_entries,
+            "evictions": self.disk.evictions,
+        }
@@ -8,8 +8,15 @@
 
 import os
 import time
+import asyncio
+import inspect
+import threading
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Any, Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
 
@@ -20,6 +27,14 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 
 from rag import get_rag_system, RAGSystem
+from manifest import chunk_id
+from cache import SemanticCache, query_terms
+from llm_clients import get_llm_registry
+from sparse_index import tokenize
+from tokens import get_token_counter
+from singleflight import SingleFlight, AsyncSingleFlight
+from tracing import get_tracer, propagate, current_trace_id
+from metrics import get_metrics_registry
 
 # Load environment variables
 load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
@@ -28,6 +43,33 @@ load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
 MODEL = os.getenv("MODEL", "qwen3-4b-2507")
 BASE_URL = os.getenv("BASE_URL", "http://127.0.0.1:1234/v1")
 API_KEY = os.getenv("API_KEY", "not-needed")
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")  # "hybrid" (BM25 + vector) or "dense"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.95"))
+RESPONSE_CACHE_MAX_TEMPERATURE = float(os.getenv("RESPONSE_CACHE_MAX_TEMPERATURE", "0.5"))
+RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "8"))  # 비동기 경로의 검색 스레드 수
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() in ("1", "true", "yes")
+OVERLAP_WARMUP = os.getenv("OVERLAP_WARMUP", "true").lower() in ("1", "true", "yes")  # 스트리밍 시 검색 중 LLM 연결 예열
+MODEL_CONTEXT_WINDOW = int(os.getenv("MODEL_CONTEXT_WINDOW", "4096"))  # 서버에 로드된 모델의 컨텍스트 길이
+HISTORY_BUDGET_RATIO = float(os.getenv("HISTORY_BUDGET_RATIO", "0.3"))  # 프롬프트 예산 중 대화 이력 상한
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))  # 토큰 집합 Jaccard 유사도
+CONTEXT_CANDIDATE_FACTOR = 2  # context_k의 몇 배를 후보로 검색할지 (중복/예산 초과 조각 대체용)
+PROMPT_SAFETY_MARGIN = 32  # 토큰 수 오차 여유분
+
+# 운영 메트릭 (Prometheus 텍스트 형식, metrics.py 참고)
+_metrics = get_metrics_registry()
+_requests = _metrics.counter(
+    "pipeline_requests_total",
+    "Pipeline requests by task type and outcome (llm, cache_hit, coalesced, error)",
+    ["task_type", "streaming", "outcome"]
+)
+_request_seconds = _metrics.histogram("pipeline_request_seconds", "End-to-end request latency", ["streaming"])
+_ttft_seconds = _metrics.histogram("pipeline_ttft_seconds", "Time to first token from request start", ["streaming"])
+_retrieval_seconds = _metrics.histogram("pipeline_retrieval_seconds", "Retrieval stage latency")
+_in_flight = _metrics.gauge("pipeline_requests_in_flight", "Requests being processed")
+_llm_requests = _metrics.counter("llm_requests_total", "LLM calls by outcome", ["model", "outcome"])
+_llm_seconds = _metrics.histogram("llm_request_seconds", "LLM call latency (full generation)", ["streaming"])
+_llm_tokens = _metrics.counter("llm_tokens_total", "Prompt and completion tokens", ["direction"])
 
 
 class TaskType(Enum):
@@ -90,6 +132,8 @@ class TestResult:
     response_quality: Dict[str, Any]
     success: bool
     error: Optional[str] = None
+    ttft_ms: float = 0.0
+    tokens_per_sec: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -97,6 +141,8 @@ class TestResult:
             "task_type": self.task_type.value,
             "response_time_ms": round(self.response_time_ms, 2),
             "token_count": self.token_count,
+            "ttft_ms": round(self.ttft_ms, 2),
+            "tokens_per_sec": round(self.tokens_per_sec, 2),
             "context_relevance": round(self.context_relevance, 3),
             "response_quality": self.response_quality,
             "success": self.success,
@@ -104,6 +150,116 @@ class TestResult:
         }
 
 
+@dataclass
+class _PreparedRequest:
+    """LLM 호출 직전까지 처리된 요청 (동기/비동기 경로 공용)"""
+    start_time: float
+    task_type: TaskType
+    context: str
+    sources: List[Dict[str, str]]
+    retrieval_time: float
+    messages: List = field(default_factory=list)
+    cache_key: Optional[tuple] = None
+    query_vector: Optional[List[float]] = None
+    cached: Optional[tuple] = None  # (응답, 유사도)
+    prompt_tokens: int = 0
+    stage_metrics: Dict[str, Any] = field(default_factory=dict)  # 단계별 추가 메트릭
+
+
+@dataclass
+class _PackedContext:
+    """토큰 예산에 맞춰 구성한 컨텍스트와 대화 이력"""
+    context: str
+    sources: List[Dict[str, Any]]
+    history: List[Dict[str, str]]
+    prompt_tokens: int
+    stats: Dict[str, Any]
+
+
+@dataclass
+class _LLMTiming:
+    """LLM 호출 시각/사용량 기록 (TTFT, 토큰 간 지연 계산용)"""
+    start: float
+    end: float = 0.0
+    first_token: Optional[float] = None
+    last_token: Optional[float] = None
+    usage: Optional[Dict[str, int]] = None
+
+    def observe(self, message) -> None:
+        """응답 메시지 또는 스트림 청크 수신 기록"""
+        now = time.time()
+        if message.content:
+            if self.first_token is None:
+                self.first_token = now
+            self.last_token = now
+        # 서버가 보내준 토큰 사용량 (스트리밍은 마지막 청크에 포함)
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            self.usage = usage
+
+    def done(self) -> "_LLMTiming":
+        self.end = time.time()
+        return self
+
+
+class _RequestScope:
+    """요청 하나의 루트 스팬 + 운영 메트릭 (요청 수, 지연, 진행 중 요청, 오류)"""
+
+    def __init__(self, tracer, input_data: "PipelineInput", streaming: bool, asynchronous: bool):
+        self.task_type = input_data.task_type.value
+        self.streaming = str(streaming).lower()
+        self._span_context = tracer.span("pipeline.process", streaming=streaming, asynchronous=asynchronous)
+
+    def __enter__(self) -> "_RequestScope":
+        self.span = self._span_context.__enter__()
+        self._start = time.perf_counter()
+        _in_flight.inc()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _in_flight.dec()
+        _request_seconds.observe(time.perf_counter() - self._start, streaming=self.streaming)
+        if exc_type is not None:
+            _requests.inc(task_type=self.task_type, streaming=self.streaming, outcome="error")
+        return self._span_context.__exit__(exc_type, exc, tb)
+
+    def done(self, output: "PipelineOutput") -> "PipelineOutput":
+        """결과 요약을 루트 스팬과 메트릭에 기록
+
+        병합된 요청의 단계별 스팬은 실제로 처리한 요청의 트레이스에 있으므로
+        그 trace_id를 함께 남긴다.
+        """
+        metrics = output.metrics
+        if metrics.get("coalesced"):
+            outcome = "coalesced"
+        elif metrics.get("cache_hit"):
+            outcome = "cache_hit"
+        else:
+            outcome = "llm"
+        _requests.inc(task_type=output.task_type.value, streaming=self.streaming, outcome=outcome)
+        if metrics.get("ttft_ms"):
+            _ttft_seconds.observe(metrics["ttft_ms"] / 1000, streaming=self.streaming)
+
+        span = self.span
+        span.set(
+            task_type=output.task_type.value,
+            cache_hit=metrics.get("cache_hit", False),
+            coalesced=metrics.get("coalesced", False),
+            output_tokens=metrics.get("output_tokens", 0),
+            ttft_ms=metrics.get("ttft_ms", 0.0)
+        )
+        if span.trace_id and metrics.get("trace_id") not in (None, span.trace_id):
+            span.set(shared_trace_id=metrics["trace_id"])
+        return output
+
+
+def _jaccard(a: set, b: set) -> float:
+    """두 토큰 집합의 Jaccard 유사도"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
 # 작업 유형별 최적화된 프롬프트
 TASK_PROMPTS = {
     TaskType.SUMMARIZE: """당신은 문서 요약 전문가입니다.
@@ -267,6 +423,39 @@ TASK_PROMPTS = {
 }
 
 
+# 퀴즈 생성 프롬프트 (Streamlit 퀴즈 화면과 API가 공유)
+QUIZ_PROMPT = """학습 자료 기반 {difficulty} 난이도 4지선다 퀴즈 {num}개를 JSON으로 만들어줘.
+
+형식:
+[{{"question": "질문", "options": ["A", "B", "C", "D"], "answer": 0, "explanation": "설명"}}]
+
+answer는 정답 인덱스(0-3). JSON만 출력해."""
+
+
+def build_quiz_input(num: int = 3, difficulty: str = "보통") -> PipelineInput:
+    """퀴즈 생성용 파이프라인 입력"""
+    return PipelineInput(
+        query=QUIZ_PROMPT.format(num=num, difficulty=difficulty),
+        task_type=TaskType.QA,
+        context_k=5,
+        temperature=0.7
+    )
+
+
+def parse_quiz_response(response: str) -> List[Dict[str, Any]]:
+    """LLM 응답에서 퀴즈 JSON 추출
+
+    Raises:
+        json.JSONDecodeError: JSON 파싱 실패
+    """
+    response = response.strip()
+    if "```json" in response:
+        response = response.split("```json")[1].split("```")[0]
+    elif "```" in response:
+        response = response.split("```")[1].split("```")[0]
+    return json.loads(response)
+
+
 class IntegratedPipeline:
     """문서 요약 + Q&A 통합 파이프라인"""
 
@@ -275,17 +464,43 @@ class IntegratedPipeline:
         rag_system: Optional[RAGSystem] = None,
         model: str = MODEL,
         base_url: str = BASE_URL,
-        api_key: str = API_KEY
+        api_key: str = API_KEY,
+        retrieval_mode: str = RETRIEVAL_MODE,
+        coalesce: bool = COALESCE_REQUESTS,
+        overlap_warmup: bool = OVERLAP_WARMUP,
+        context_window: int = MODEL_CONTEXT_WINDOW
     ):
         self.rag = rag_system or get_rag_system()
         self.model = model
         self.base_url = base_url
         self.api_key = api_key
+        self.retrieval_mode = retrieval_mode
+        self.coalesce = coalesce
+        self.overlap_warmup = overlap_warmup
+        self.context_window = context_window
+        self.token_counter = get_token_counter()
+        self.tracer = get_tracer()
         self._test_results: List[TestResult] = []
 
+        # 의미 기반 응답 캐시 (유사 질문 + 동일 검색 조각이면 LLM 호출 생략)
+        self.response_cache = SemanticCache(
+            maxsize=RESPONSE_CACHE_SIZE,
+            threshold=RESPONSE_CACHE_THRESHOLD
+        )
+
+        # 비동기 경로에서 검색(임베딩/Chroma/BM25)을 실행할 스레드 풀
+        self._executor = ThreadPoolExecutor(
+            max_workers=RETRIEVAL_WORKERS,
+            thread_name_prefix="pipeline-retrieval"
+        )
+
+        # 동시에 들어온 동일 요청 병합 (검색 + LLM 호출 1회로 처리)
+        self._flights = SingleFlight()
+        self._async_flights = AsyncSingleFlight()
+
     def _get_llm(self, temperature: float = 0.4, max_tokens: int = 1024) -> ChatOpenAI:
-        """LLM 인스턴스 생성"""
-        return ChatOpenAI(
+        """LLM 인스턴스 반환 (레지스트리에서 재사용, 커넥션 풀 공유)"""
+        return get_llm_registry().get(
             model=self.model,
             base_url=self.base_url,
             api_key=self.api_key,
@@ -316,30 +531,192 @@ class IntegratedPipeline:
         # 기본값: Q&A
         return TaskType.QA
 
-    def _retrieve_context(self, query: str, k: int = 3) -> tuple[str, List[Dict[str, str]]]:
-        """문서 검색 및 컨텍스트 추출"""
-        docs = self.rag.search(query, k=k)
-
-        if not docs:
-            return "", []
+    def _retrieve(self, query: str, k: int = 3) -> List[Document]:
+        """검색 모드에 따라 문서 검색"""
+        if self.retrieval_mode == "hybrid":
+            return self.rag.hybrid_search(query, k=k)
+        return self.rag.search(query, k=k)
 
+    def _pack_context(
+        self,
+        input_data: PipelineInput,
+        task_type: TaskType,
+        docs: List[Document]
+    ) -> _PackedContext:
+        """검색 조각과 대화 이력을 토큰 예산 안에 채워 넣기
+
+        예산 = 컨텍스트 길이 - 응답 토큰(max_tokens) - 시스템 프롬프트 틀 - 질문.
+        대화 이력은 예산의 HISTORY_BUDGET_RATIO까지 최근 메시지부터 담고,
+        검색 조각은 순위 순으로 최대 context_k개를 남은 예산 안에서 담는다.
+        앞서 담은 조각과 거의 같은 조각은 건너뛴다.
+        """
+        counter = self.token_counter
+        template = TASK_PROMPTS.get(task_type, TASK_PROMPTS[TaskType.QA])
+        fixed_tokens = (
+            counter.count_message(template.format(context=""))
+            + counter.count_message(input_data.query)
+        )
+        budget = max(0, self.context_window - input_data.max_tokens - fixed_tokens - PROMPT_SAFETY_MARGIN)
+
+        # 대화 이력 (최근 10개 중 최신부터)
+        recent = input_data.chat_history[-10:]
+        history: List[Dict[str, str]] = []
+        history_tokens = 0
+        history_budget = int(budget * HISTORY_BUDGET_RATIO)
+        for msg in reversed(recent):
+            n = counter.count_message(msg["content"])
+            if history_tokens + n > history_budget:
+                break
+            history.insert(0, msg)
+            history_tokens += n
+
+        # 검색 조각
+        context_budget = budget - history_tokens
         context_parts = []
         sources = []
+        kept_terms: List[set] = []
+        context_tokens = duplicates = over_budget = 0
 
-        for i, doc in enumerate(docs, 1):
-            source = doc.metadata.get("source", "unknown")
-            doc_type = doc.metadata.get("type", "text")
+        for doc in docs:
+            if len(sources) >= input_data.context_k:
+                break
             content = doc.page_content
+            terms = set(tokenize(content))
+            if any(_jaccard(terms, other) >= NEAR_DUPLICATE_THRESHOLD for other in kept_terms):
+                duplicates += 1
+                continue
 
-            context_parts.append(f"[문서 {i}] (출처: {source})\n{content}")
+            i = len(sources) + 1
+            source = doc.metadata.get("source", "unknown")
+            part = f"[문서 {i}] (출처: {source})\n{content}"
+            n = counter.count(part) + 1  # 구분자(빈 줄) 포함
+            if context_tokens + n > context_budget:
+                over_budget += 1
+                continue
+
+            context_parts.append(part)
+            kept_terms.append(terms)
+            context_tokens += n
             sources.append({
                 "index": i,
+                "id": getattr(doc, "id", None) or chunk_id(source, content),
                 "source": source,
-                "type": doc_type,
+                "type": doc.metadata.get("type", "text"),
+                "tokens": n,
                 "preview": content[:200] + "..." if len(content) > 200 else content
             })
 
-        return "\n\n".join(context_parts), sources
+        return _PackedContext(
+            context="\n\n".join(context_parts),
+            sources=sources,
+            history=history,
+            prompt_tokens=fixed_tokens + history_tokens + context_tokens,
+            stats={
+                "token_budget": budget,
+                "context_tokens": context_tokens,
+                "history_tokens": history_tokens,
+                "history_messages_dropped": len(recent) - len(history),
+                "duplicate_chunks_dropped": duplicates,
+                "over_budget_chunks_dropped": over_budget,
+                "exact_token_counts": counter.exact
+            }
+        )
+
+    @staticmethod
+    def _history_hash(chat_history: List[Dict[str, str]]) -> str:
+        """프롬프트에 들어가는 최근 대화 이력의 해시"""
+        return hashlib.sha256(
+            json.dumps(chat_history[-10:], ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _flight_key(self, input_data: PipelineInput, streaming: bool) -> tuple:
+        """요청 병합 키 (같은 키의 동시 요청은 한 번만 처리)
+
+        응답을 바꾸는 입력(max_tokens, 대화 이력)도 키에 포함한다.
+        """
+        return (
+            streaming,
+            input_data.query,
+            input_data.task_type.value,
+            input_data.context_k,
+            input_data.temperature,
+            input_data.max_tokens,
+            self._history_hash(input_data.chat_history)
+        )
+
+    @staticmethod
+    def _coalesced(output: PipelineOutput, shared: bool) -> PipelineOutput:
+        """요청별 결과 사본 (병합 여부를 메트릭에 기록)"""
+        return replace(output, metrics={**output.metrics, "coalesced": shared})
+
+    @staticmethod
+    def _add_trace_id(metrics: Dict[str, Any]):
+        """트레이싱 중이면 요청의 trace_id를 메트릭에 기록 (단계별 시간 조회용)"""
+        trace_id = current_trace_id()
+        if trace_id:
+            metrics["trace_id"] = trace_id
+
+    def _request_scope(self, input_data: PipelineInput, streaming: bool, asynchronous: bool = False) -> _RequestScope:
+        """공개 처리 메서드(process 등)의 요청 구간"""
+        return _RequestScope(self.tracer, input_data, streaming, asynchronous)
+
+    @contextmanager
+    def _llm_call(self, streaming: bool):
+        """LLM 호출 구간 (트레이스 스팬 + 호출 수/오류/지연 메트릭)"""
+        start = time.perf_counter()
+        with self.tracer.span("llm.generate", model=self.model, streaming=streaming):
+            try:
+                yield
+            except Exception:
+                _llm_requests.inc(model=self.model, outcome="error")
+                raise
+        _llm_requests.inc(model=self.model, outcome="ok")
+        _llm_seconds.observe(time.perf_counter() - start, streaming=str(streaming).lower())
+
+    def get_coalesce_stats(self) -> Dict[str, Any]:
+        """요청 병합 통계"""
+        sync_stats = self._flights.stats()
+        async_stats = self._async_flights.stats()
+        return {key: sync_stats[key] + async_stats[key] for key in sync_stats}
+
+    def _response_cache_key(
+        self,
+        input_data: PipelineInput,
+        task_type: TaskType,
+        sources: List[Dict[str, str]]
+    ) -> Optional[tuple]:
+        """응답 캐시 키 (정규화한 질문, 작업 유형, 검색 조각 ID, 모델, 온도 구간, 대화 이력)
+
+        조각 ID는 내용 해시이므로 자료가 바뀌면 키도 달라진다.
+        임베딩 유사도만으로는 "장점"/"단점"처럼 반대 질문도 0.95를 넘을 수 있어
+        질문의 토큰 집합이 같아야 같은 키가 된다 (유사도는 그 안에서 확인용).
+        온도가 높은 요청(퀴즈 생성 등)은 매번 다른 응답이 필요하므로 캐시하지 않는다.
+        """
+        if input_data.temperature > RESPONSE_CACHE_MAX_TEMPERATURE:
+            return None
+        history = self._history_hash(input_data.chat_history)
+        return (
+            query_terms(input_data.query),
+            task_type.value,
+            tuple(source["id"] for source in sources),
+            self.model,
+            round(input_data.temperature, 1),
+            input_data.max_tokens,
+            history
+        )
+
+    def _lookup_response(
+        self,
+        input_data: PipelineInput,
+        task_type: TaskType,
+        sources: List[Dict[str, str]]
+    ) -> tuple[Optional[tuple], Optional[List[float]], Optional[tuple]]:
+        """캐시 조회 → (캐시 키, 질문 임베딩, (응답, 유사도) 또는 None)"""
+        cache_key = self._response_cache_key(input_data, task_type, sources)
+        if cache_key is None:
+            return None, None, None
+        query_vector = self.rag.embeddings.embed_query(f"query: {input_data.query}")
+        return cache_key, query_vector, self.response_cache.lookup(cache_key, query_vector)
 
     def _build_messages(
         self,
@@ -366,68 +743,215 @@ class IntegratedPipeline:
         messages.append(HumanMessage(content=query))
         return messages
 
-    def process(self, input_data: PipelineInput) -> PipelineOutput:
-        """통합 파이프라인 실행
-
-        Args:
-            input_data: 파이프라인 입력 데이터
-
-        Returns:
-            PipelineOutput: 처리 결과
-        """
-        start_time = time.time()
-
-        # 작업 유형 감지 (자동 또는 지정)
+    def _resolve_task_type(self, input_data: PipelineInput) -> TaskType:
+        """작업 유형 결정 (QA로 지정된 경우 질문에서 자동 감지)"""
         task_type = input_data.task_type
         if task_type == TaskType.QA:
-            # 자동 감지 시도
             detected = self._detect_task_type(input_data.query)
             if detected != TaskType.QA:
                 task_type = detected
+        return task_type
 
-        # 컨텍스트 검색
-        context, sources = self._retrieve_context(input_data.query, k=input_data.context_k)
-        retrieval_time = time.time() - start_time
+    def _prepare(self, input_data: PipelineInput, start_time: float) -> _PreparedRequest:
+        """LLM 호출 전 단계 (작업 유형 감지 → 검색 → 응답 캐시 조회 → 메시지 구성)
 
-        # 메시지 구성
-        messages = self._build_messages(
-            input_data.query,
-            context,
-            task_type,
-            input_data.chat_history
-        )
+        동기/비동기 경로가 공유하며, 비동기 경로에서는 스레드 풀에서 실행된다.
+        """
+        tracer = self.tracer
+        task_type = self._resolve_task_type(input_data)
 
-        # LLM 호출
-        llm = self._get_llm(
-            temperature=input_data.temperature,
-            max_tokens=input_data.max_tokens
+        # 컨텍스트 검색 (중복/예산 초과 조각을 대체할 후보까지)
+        with tracer.span("pipeline.retrieve", mode=self.retrieval_mode) as span:
+            docs = self._retrieve(input_data.query, k=input_data.context_k * CONTEXT_CANDIDATE_FACTOR)
+            span.set(docs=len(docs))
+        retrieval_time = time.time() - start_time
+        _retrieval_seconds.observe(retrieval_time)
+
+        # 토큰 예산에 맞춰 컨텍스트/대화 이력 구성
+        with tracer.span("pipeline.pack_context") as span:
+            packed = self._pack_context(input_data, task_type, docs)
+            span.set(chunks=len(packed.sources), prompt_tokens=packed.prompt_tokens)
+
+        # 응답 캐시 조회
+        with tracer.span("pipeline.cache_lookup") as span:
+            cache_key, query_vector, cached = self._lookup_response(input_data, task_type, packed.sources)
+            span.set(hit=cached is not None)
+
+        # 메시지 구성 (캐시 적중 시 불필요)
+        with tracer.span("pipeline.build_messages"):
+            messages = [] if cached else self._build_messages(
+                input_data.query,
+                packed.context,
+                task_type,
+                packed.history
+            )
+
+        return _PreparedRequest(
+            start_time=start_time,
+            task_type=task_type,
+            context=packed.context,
+            sources=packed.sources,
+            retrieval_time=retrieval_time,
+            messages=messages,
+            cache_key=cache_key,
+            query_vector=query_vector,
+            cached=cached,
+            prompt_tokens=packed.prompt_tokens,
+            stage_metrics=dict(packed.stats)
         )
 
-        llm_start = time.time()
-        response = llm.invoke(messages)
-        llm_time = time.time() - llm_start
+    def _finish(
+        self,
+        input_data: PipelineInput,
+        prepared: _PreparedRequest,
+        response: str,
+        timing: _LLMTiming,
+        streaming: bool = False
+    ) -> PipelineOutput:
+        """LLM 응답을 캐시에 저장하고 PipelineOutput으로 변환"""
+        total_time = time.time() - prepared.start_time
+        llm_time = timing.end - timing.start
 
-        total_time = time.time() - start_time
+        if prepared.cache_key and response:
+            self.response_cache.store(prepared.cache_key, prepared.query_vector, response)
 
         # 메트릭 수집
         metrics = {
             "total_time_ms": round(total_time * 1000, 2),
-            "retrieval_time_ms": round(retrieval_time * 1000, 2),
+            "retrieval_time_ms": round(prepared.retrieval_time * 1000, 2),
             "llm_time_ms": round(llm_time * 1000, 2),
-            "context_chunks": len(sources),
-            "detected_task_type": task_type.value,
-            "input_tokens": len(input_data.query.split()),
-            "output_tokens": len(response.content.split()) if response.content else 0
+            "context_chunks": len(prepared.sources),
+            "detected_task_type": prepared.task_type.value
         }
+        if streaming:
+            metrics["streaming"] = True
+        metrics.update(self._generation_metrics(prepared, response, timing, streaming))
+        _llm_tokens.inc(metrics["input_tokens"], direction="input")
+        _llm_tokens.inc(metrics["output_tokens"], direction="output")
+        metrics["cache_hit"] = False
+        metrics.update(prepared.stage_metrics)
+        self._add_trace_id(metrics)
 
         return PipelineOutput(
-            response=response.content,
-            sources=sources,
-            task_type=task_type,
+            response=response,
+            sources=prepared.sources,
+            task_type=prepared.task_type,
             metrics=metrics,
-            raw_context=context
+            raw_context=prepared.context
         )
 
+    def _generation_metrics(
+        self,
+        prepared: _PreparedRequest,
+        response: str,
+        timing: _LLMTiming,
+        streaming: bool
+    ) -> Dict[str, Any]:
+        """토큰 수와 생성 속도 메트릭
+
+        토큰 수는 서버 응답의 usage 값을 우선 사용하고, 없으면 로컬
+        토크나이저로 센다. 비스트리밍 호출은 첫 토큰이 응답 전체와 함께
+        도착하므로 토큰 간 지연은 호출 시간 / 출력 토큰 수로 근사한다.
+        """
+        usage = timing.usage or {}
+        if usage.get("output_tokens"):
+            input_tokens = usage.get("input_tokens") or prepared.prompt_tokens
+            output_tokens = usage["output_tokens"]
+            token_source = "usage"
+        else:
+            input_tokens = prepared.prompt_tokens
+            output_tokens = self.token_counter.count(response)
+            token_source = "tokenizer" if self.token_counter.exact else "estimate"
+
+        llm_time = timing.end - timing.start
+        first_token = timing.first_token or timing.end
+        if streaming and timing.last_token and output_tokens > 1:
+            inter_token = (timing.last_token - first_token) / (output_tokens - 1)
+        else:
+            inter_token = llm_time / output_tokens if output_tokens else 0.0
+
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "token_source": token_source,
+            "ttft_ms": round((first_token - prepared.start_time) * 1000, 2),
+            "llm_ttft_ms": round((first_token - timing.start) * 1000, 2),
+            "inter_token_latency_ms": round(inter_token * 1000, 2),
+            "tokens_per_sec": round(output_tokens / llm_time, 2) if llm_time > 0 else 0.0
+        }
+
+    def _warm_up(self, input_data: PipelineInput) -> tuple:
+        """LLM 클라이언트 준비 + 커넥션 예열 → (시작 시각, 종료 시각, 예열 요청 여부)"""
+        started = time.time()
+        with self.tracer.span("llm.warm_up") as span:
+            self._get_llm(temperature=input_data.temperature, max_tokens=input_data.max_tokens)
+            warmed = get_llm_registry().warm_up(self.base_url, self.api_key)
+            span.set(warmed=warmed)
+        return started, time.time(), warmed
+
+    async def _awarm_up(self, input_data: PipelineInput) -> tuple:
+        """_warm_up의 비동기 버전"""
+        started = time.time()
+        with self.tracer.span("llm.warm_up") as span:
+            self._get_llm(temperature=input_data.temperature, max_tokens=input_data.max_tokens)
+            warmed = await get_llm_registry().awarm_up(self.base_url, self.api_key)
+            span.set(warmed=warmed)
+        return started, time.time(), warmed
+
+    @staticmethod
+    def _overlap_metrics(prepared: _PreparedRequest, warmup: tuple) -> Dict[str, Any]:
+        """예열이 검색 시간과 얼마나 겹쳤는지 (겹친 만큼 첫 토큰이 빨라짐)"""
+        started, finished, warmed = warmup
+        retrieval_end = prepared.start_time + prepared.retrieval_time
+        overlap = max(0.0, min(finished, retrieval_end) - max(started, prepared.start_time))
+        duration = finished - started
+        return {
+            "warmup_ms": round(duration * 1000, 2),
+            "warmup_overlap_ms": round(overlap * 1000, 2),
+            "warmup_overlap_ratio": round(overlap / duration, 3) if duration > 0 else 1.0,
+            "connection_warmed": warmed
+        }
+
+    def process(self, input_data: PipelineInput) -> PipelineOutput:
+        """통합 파이프라인 실행
+
+        동일한 요청이 동시에 들어오면 한 번만 처리하고 결과를 공유한다.
+
+        Args:
+            input_data: 파이프라인 입력 데이터
+
+        Returns:
+            PipelineOutput: 처리 결과
+        """
+        with self._request_scope(input_data, streaming=False) as scope:
+            if not self.coalesce:
+                return scope.done(self._process(input_data))
+            output, shared = self._flights.do(
+                self._flight_key(input_data, streaming=False),
+                lambda emit: self._process(input_data)
+            )
+            return scope.done(self._coalesced(output, shared))
+
+    def _process(self, input_data: PipelineInput) -> PipelineOutput:
+        """process 본체 (요청 병합 없이 실행)"""
+        with self.tracer.span("pipeline.prepare"):
+            prepared = self._prepare(input_data, time.time())
+        if prepared.cached:
+            return self._cached_output(input_data, prepared)
+
+        # LLM 호출
+        llm = self._get_llm(
+            temperature=input_data.temperature,
+            max_tokens=input_data.max_tokens
+        )
+
+        timing = _LLMTiming(start=time.time())
+        with self._llm_call(streaming=False):
+            response = llm.invoke(prepared.messages)
+            timing.observe(response)
+
+        return self._finish(input_data, prepared, response.content, timing.done())
+
     def process_stream(
         self,
         input_data: PipelineInput,
@@ -435,6 +959,9 @@ class IntegratedPipeline:
     ) -> PipelineOutput:
         """스트리밍 파이프라인 실행
 
+        동일한 요청이 동시에 들어오면 한 번만 처리하고, 생성된 청크를
+        모든 요청의 콜백에 전달한다 (늦게 합류한 요청은 앞부분부터 재생).
+
         Args:
             input_data: 파이프라인 입력 데이터
             callback: 청크 콜백 함수
@@ -442,61 +969,217 @@ class IntegratedPipeline:
         Returns:
             PipelineOutput: 처리 결과
         """
+        with self._request_scope(input_data, streaming=True) as scope:
+            if not self.coalesce:
+                return scope.done(self._process_stream(input_data, callback))
+            output, shared = self._flights.do(
+                self._flight_key(input_data, streaming=True),
+                lambda emit: self._process_stream(input_data, emit),
+                callback
+            )
+            return scope.done(self._coalesced(output, shared))
+
+    def _process_stream(
+        self,
+        input_data: PipelineInput,
+        callback: Callable[[str], None]
+    ) -> PipelineOutput:
+        """process_stream 본체 (요청 병합 없이 실행)"""
         start_time = time.time()
 
-        # 작업 유형 감지
-        task_type = input_data.task_type
-        if task_type == TaskType.QA:
-            detected = self._detect_task_type(input_data.query)
-            if detected != TaskType.QA:
-                task_type = detected
+        # 검색하는 동안 LLM 클라이언트 준비 + 커넥션 예열
+        warmup = self._executor.submit(propagate(self._warm_up), input_data) if self.overlap_warmup else None
 
-        # 컨텍스트 검색
-        context, sources = self._retrieve_context(input_data.query, k=input_data.context_k)
-        retrieval_time = time.time() - start_time
+        try:
+            with self.tracer.span("pipeline.prepare"):
+                prepared = self._prepare(input_data, start_time)
 
-        # 메시지 구성
-        messages = self._build_messages(
-            input_data.query,
-            context,
-            task_type,
-            input_data.chat_history
-        )
+            # 응답 캐시 적중 시 전체 응답을 한 번에 전달
+            if prepared.cached:
+                callback(prepared.cached[0])
+                return self._cached_output(input_data, prepared, streaming=True)
+
+            if warmup is not None:
+                prepared.stage_metrics.update(self._overlap_metrics(prepared, warmup.result()))
+
+            # LLM 스트리밍 호출
+            llm = self._get_llm(
+                temperature=input_data.temperature,
+                max_tokens=input_data.max_tokens
+            )
+
+            timing = _LLMTiming(start=time.time())
+            full_response = ""
+
+            with self._llm_call(streaming=True):
+                for chunk in llm.stream(prepared.messages):
+                    timing.observe(chunk)
+                    if chunk.content:
+                        full_response += chunk.content
+                        callback(chunk.content)
+
+            return self._finish(input_data, prepared, full_response, timing.done(), streaming=True)
+        finally:
+            # 캐시 적중/예외로 예열 결과를 쓰지 않았으면 아직 시작 전일 때 취소,
+            # 이미 실행 중이면 끝날 때까지 대기 (예열 span이 요청 trace 안에서 끝나도록)
+            if warmup is not None and not warmup.cancel():
+                wait([warmup])
+
+    async def _aprepare(self, input_data: PipelineInput, start_time: float) -> _PreparedRequest:
+        """_prepare를 스레드 풀에서 실행 (임베딩/Chroma/BM25 호출은 동기 API)"""
+        loop = asyncio.get_running_loop()
+        with self.tracer.span("pipeline.prepare"):
+            return await loop.run_in_executor(self._executor, propagate(self._prepare), input_data, start_time)
+
+    async def aprocess(self, input_data: PipelineInput) -> PipelineOutput:
+        """통합 파이프라인 비동기 실행 (process와 동일한 결과/메트릭)
+
+        검색은 스레드 풀에서, LLM 호출은 비동기 HTTP로 처리하므로
+        하나의 이벤트 루프에서 여러 세션을 동시에 처리할 수 있다.
+
+        Args:
+            input_data: 파이프라인 입력 데이터
+
+        Returns:
+            PipelineOutput: 처리 결과
+        """
+        with self._request_scope(input_data, streaming=False, asynchronous=True) as scope:
+            if not self.coalesce:
+                return scope.done(await self._aprocess(input_data))
+            output, shared = await self._async_flights.do(
+                self._flight_key(input_data, streaming=False),
+                lambda emit: self._aprocess(input_data)
+            )
+            return scope.done(self._coalesced(output, shared))
+
+    async def _aprocess(self, input_data: PipelineInput) -> PipelineOutput:
+        """aprocess 본체 (요청 병합 없이 실행)"""
+        prepared = await self._aprepare(input_data, time.time())
+        if prepared.cached:
+            return self._cached_output(input_data, prepared)
 
-        # LLM 스트리밍 호출
         llm = self._get_llm(
             temperature=input_data.temperature,
             max_tokens=input_data.max_tokens
         )
 
-        llm_start = time.time()
-        full_response = ""
+        timing = _LLMTiming(start=time.time())
+        with self._llm_call(streaming=False):
+            response = await llm.ainvoke(prepared.messages)
+            timing.observe(response)
 
-        for chunk in llm.stream(messages):
-            if chunk.content:
-                full_response += chunk.content
-                callback(chunk.content)
+        return self._finish(input_data, prepared, response.content, timing.done())
 
-        llm_time = time.time() - llm_start
-        total_time = time.time() - start_time
+    async def aprocess_stream(
+        self,
+        input_data: PipelineInput,
+        callback: Callable[[str], Any]
+    ) -> PipelineOutput:
+        """스트리밍 파이프라인 비동기 실행 (process_stream과 동일한 결과/메트릭)
 
+        Args:
+            input_data: 파이프라인 입력 데이터
+            callback: 청크 콜백 함수 (일반 함수 또는 코루틴 함수)
+
+        Returns:
+            PipelineOutput: 처리 결과
+        """
+        with self._request_scope(input_data, streaming=True, asynchronous=True) as scope:
+            if not self.coalesce:
+                return scope.done(await self._aprocess_stream(input_data, callback))
+            output, shared = await self._async_flights.do(
+                self._flight_key(input_data, streaming=True),
+                lambda emit: self._aprocess_stream(input_data, emit),
+                callback
+            )
+            return scope.done(self._coalesced(output, shared))
+
+    async def _aprocess_stream(
+        self,
+        input_data: PipelineInput,
+        callback: Callable[[str], Any]
+    ) -> PipelineOutput:
+        """aprocess_stream 본체 (요청 병합 없이 실행)"""
+        async def emit(text: str):
+            result = callback(text)
+            if inspect.isawaitable(result):
+                await result
+
+        start_time = time.time()
+
+        # 검색하는 동안 LLM 클라이언트 준비 + 커넥션 예열
+        warmup = asyncio.ensure_future(self._awarm_up(input_data)) if self.overlap_warmup else None
+
+        try:
+            prepared = await self._aprepare(input_data, start_time)
+
+            if prepared.cached:
+                await emit(prepared.cached[0])
+                return self._cached_output(input_data, prepared, streaming=True)
+
+            if warmup is not None:
+                prepared.stage_metrics.update(self._overlap_metrics(prepared, await warmup))
+
+            llm = self._get_llm(
+                temperature=input_data.temperature,
+                max_tokens=input_data.max_tokens
+            )
+
+            timing = _LLMTiming(start=time.time())
+            full_response = ""
+
+            with self._llm_call(streaming=True):
+                async for chunk in llm.astream(prepared.messages):
+                    timing.observe(chunk)
+                    if chunk.content:
+                        full_response += chunk.content
+                        await emit(chunk.content)
+
+            return self._finish(input_data, prepared, full_response, timing.done(), streaming=True)
+        finally:
+            # 캐시 적중/예외로 예열 결과를 쓰지 않았으면 요청과 함께 취소
+            if warmup is not None and not warmup.done():
+                warmup.cancel()
+                await asyncio.wait([warmup])
+
+    def _cached_output(
+        self,
+        input_data: PipelineInput,
+        prepared: _PreparedRequest,
+        streaming: bool = False
+    ) -> PipelineOutput:
+        """캐시 적중 결과를 PipelineOutput으로 변환"""
+        response, similarity = prepared.cached
+        total_time = time.time() - prepared.start_time
         metrics = {
             "total_time_ms": round(total_time * 1000, 2),
-            "retrieval_time_ms": round(retrieval_time * 1000, 2),
-            "llm_time_ms": round(llm_time * 1000, 2),
-            "context_chunks": len(sources),
-            "detected_task_type": task_type.value,
-            "streaming": True
+            "retrieval_time_ms": round(prepared.retrieval_time * 1000, 2),
+            "llm_time_ms": 0.0,
+            "context_chunks": len(prepared.sources),
+            "detected_task_type": prepared.task_type.value,
+            "input_tokens": prepared.prompt_tokens,
+            "output_tokens": self.token_counter.count(response),
+            "token_source": "tokenizer" if self.token_counter.exact else "estimate",
+            "ttft_ms": round(total_time * 1000, 2),
+            "cache_hit": True,
+            "cache_similarity": round(similarity, 4)
         }
-
+        if streaming:
+            metrics["streaming"] = True
+        metrics.update(prepared.stage_metrics)
+        self._add_trace_id(metrics)
         return PipelineOutput(
-            response=full_response,
-            sources=sources,
-            task_type=task_type,
+            response=response,
+            sources=prepared.sources,
+            task_type=prepared.task_type,
             metrics=metrics,
-            raw_context=context
+            raw_context=prepared.context
         )
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """응답 캐시 통계"""
+        return self.response_cache.stats()
+
     def summarize_document(self, text: str, source: str = "직접입력") -> PipelineOutput:
         """문서 요약 전용 메서드
 
@@ -523,6 +1206,74 @@ class IntegratedPipeline:
             # 임시 문서는 유지 (사용자가 원하면 삭제)
             pass
 
+    def _evaluate(
+        self,
+        test_case: Dict[str, Any],
+        output: PipelineOutput,
+        response_time: float
+    ) -> TestResult:
+        """테스트 케이스 응답 평가"""
+        expected_keywords = test_case.get("expected_keywords", [])
+
+        # 응답 품질 평가
+        response_lower = output.response.lower()
+        keyword_hits = sum(1 for kw in expected_keywords if kw.lower() in response_lower)
+        keyword_score = keyword_hits / len(expected_keywords) if expected_keywords else 1.0
+
+        # 컨텍스트 관련성 (검색 조각 중 관련 조각 비율)
+        context_relevance = self._context_relevance(test_case, output.sources)
+
+        quality = {
+            "keyword_coverage": round(keyword_score, 2),
+            "response_length": len(output.response),
+            "has_structure": any(marker in output.response for marker in ["##", "**", "- ", "1."]),
+            "sources_count": len(output.sources)
+        }
+
+        return TestResult(
+            query=test_case.get("query", ""),
+            task_type=test_case.get("task_type", TaskType.QA),
+            response_time_ms=response_time,
+            token_count=output.metrics.get("output_tokens", 0),
+            context_relevance=context_relevance,
+            response_quality=quality,
+            success=True,
+            ttft_ms=output.metrics.get("ttft_ms", 0.0),
+            tokens_per_sec=output.metrics.get("tokens_per_sec", 0.0)
+        )
+
+    @staticmethod
+    def _context_relevance(test_case: Dict[str, Any], sources: List[Dict[str, Any]]) -> float:
+        """검색 조각의 정밀도 (관련 조각 수 / 검색 조각 수)
+
+        테스트 케이스에 relevant_sources(정답 출처 목록)가 있으면 출처로,
+        없으면 expected_keywords 중 하나가 조각 미리보기에 들어 있는지로 판단한다.
+        라벨이 있는 검색 품질 평가(recall@k, MRR, nDCG)는 benchmarks/retrieval.py 참고.
+        """
+        if not sources:
+            return 0.0
+        relevant_sources = test_case.get("relevant_sources")
+        if relevant_sources:
+            hits = sum(1 for src in sources if src["source"] in relevant_sources)
+        else:
+            keywords = [kw.lower() for kw in test_case.get("expected_keywords", [])]
+            hits = sum(1 for src in sources if any(kw in src["preview"].lower() for kw in keywords))
+        return hits / len(sources)
+
+    @staticmethod
+    def _failed_result(test_case: Dict[str, Any], error: Exception) -> TestResult:
+        """실패한 테스트 케이스 결과"""
+        return TestResult(
+            query=test_case.get("query", ""),
+            task_type=test_case.get("task_type", TaskType.QA),
+            response_time_ms=0,
+            token_count=0,
+            context_relevance=0,
+            response_quality={},
+            success=False,
+            error=str(error)
+        )
+
     def run_test(
         self,
         test_queries: List[Dict[str, Any]],
@@ -542,8 +1293,6 @@ class IntegratedPipeline:
 
         for i, test_case in enumerate(test_queries, 1):
             query = test_case.get("query", "")
-            task_type = test_case.get("task_type", TaskType.QA)
-            expected_keywords = test_case.get("expected_keywords", [])
 
             if verbose:
                 print(f"\n[테스트 {i}/{len(test_queries)}] {query[:50]}...")
@@ -553,52 +1302,17 @@ class IntegratedPipeline:
             try:
                 input_data = PipelineInput(
                     query=query,
-                    task_type=task_type
+                    task_type=test_case.get("task_type", TaskType.QA)
                 )
                 output = self.process(input_data)
-
-                response_time = (time.time() - start_time) * 1000
-
-                # 응답 품질 평가
-                response_lower = output.response.lower()
-                keyword_hits = sum(1 for kw in expected_keywords if kw.lower() in response_lower)
-                keyword_score = keyword_hits / len(expected_keywords) if expected_keywords else 1.0
-
-                # 컨텍스트 관련성 (검색된 문서 수 기반 간단 평가)
-                context_relevance = min(1.0, len(output.sources) / 3)
-
-                quality = {
-                    "keyword_coverage": round(keyword_score, 2),
-                    "response_length": len(output.response),
-                    "has_structure": any(marker in output.response for marker in ["##", "**", "- ", "1."]),
-                    "sources_count": len(output.sources)
-                }
-
-                result = TestResult(
-                    query=query,
-                    task_type=task_type,
-                    response_time_ms=response_time,
-                    token_count=output.metrics.get("output_tokens", 0),
-                    context_relevance=context_relevance,
-                    response_quality=quality,
-                    success=True
-                )
+                result = self._evaluate(test_case, output, (time.time() - start_time) * 1000)
 
                 if verbose:
-                    print(f"  ✓ 응답 시간: {response_time:.0f}ms")
-                    print(f"  ✓ 키워드 커버리지: {keyword_score:.0%}")
+                    print(f"  ✓ 응답 시간: {result.response_time_ms:.0f}ms")
+                    print(f"  ✓ 키워드 커버리지: {result.response_quality['keyword_coverage']:.0%}")
 
             except Exception as e:
-                result = TestResult(
-                    query=query,
-                    task_type=task_type,
-                    response_time_ms=0,
-                    token_count=0,
-                    context_relevance=0,
-                    response_quality={},
-                    success=False,
-                    error=str(e)
-                )
+                result = self._failed_result(test_case, e)
 
                 if verbose:
                     print(f"  ✗ 오류: {e}")
@@ -608,6 +1322,49 @@ class IntegratedPipeline:
 
         return results
 
+    async def arun_test(
+        self,
+        test_queries: List[Dict[str, Any]],
+        concurrency: int = 4,
+        verbose: bool = True
+    ) -> List[TestResult]:
+        """성능 테스트 비동기 실행 (최대 concurrency개 쿼리 동시 처리)
+
+        Args:
+            test_queries: 테스트 쿼리 목록 (run_test와 동일)
+            concurrency: 동시 실행 쿼리 수
+            verbose: 상세 출력 여부
+
+        Returns:
+            List[TestResult]: 테스트 결과 목록 (입력 순서 유지)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(i: int, test_case: Dict[str, Any]) -> TestResult:
+            query = test_case.get("query", "")
+            async with semaphore:
+                start_time = time.time()
+                try:
+                    input_data = PipelineInput(
+                        query=query,
+                        task_type=test_case.get("task_type", TaskType.QA)
+                    )
+                    output = await self.aprocess(input_data)
+                    result = self._evaluate(test_case, output, (time.time() - start_time) * 1000)
+                    if verbose:
+                        print(f"[테스트 {i}/{len(test_queries)}] ✓ {query[:50]} ({result.response_time_ms:.0f}ms)")
+                except Exception as e:
+                    result = self._failed_result(test_case, e)
+                    if verbose:
+                        print(f"[테스트 {i}/{len(test_queries)}] ✗ {query[:50]} (오류: {e})")
+            return result
+
+        results = await asyncio.gather(
+            *(run_one(i, test_case) for i, test_case in enumerate(test_queries, 1))
+        )
+        self._test_results.extend(results)
+        return list(results)
+
     def get_test_summary(self) -> Dict[str, Any]:
         """테스트 결과 요약
 
@@ -622,6 +1379,8 @@ class IntegratedPipeline:
 
         avg_time = sum(r.response_time_ms for r in successful) / len(successful) if successful else 0
         avg_relevance = sum(r.context_relevance for r in successful) / len(successful) if successful else 0
+        avg_ttft = sum(r.ttft_ms for r in successful) / len(successful) if successful else 0
+        avg_tps = sum(r.tokens_per_sec for r in successful) / len(successful) if successful else 0
 
         return {
             "total_tests": len(self._test_results),
@@ -630,6 +1389,8 @@ class IntegratedPipeline:
             "success_rate": round(len(successful) / len(self._test_results) * 100, 1),
             "avg_response_time_ms": round(avg_time, 2),
             "avg_context_relevance": round(avg_relevance, 3),
+            "avg_ttft_ms": round(avg_ttft, 2),
+            "avg_tokens_per_sec": round(avg_tps, 2),
             "by_task_type": self._group_by_task_type()
         }
 
@@ -691,13 +1452,15 @@ DEFAULT_TEST_CASES = [
 
 # 싱글톤 인스턴스
 _pipeline_instance: Optional[IntegratedPipeline] = None
+_pipeline_lock = threading.Lock()
 
 
 def get_pipeline() -> IntegratedPipeline:
     """파이프라인 싱글톤 인스턴스 반환"""
     global _pipeline_instance
-    if _pipeline_instance is None:
-        _pipeline_instance = IntegratedPipeline()
+    with _pipeline_lock:
+        if _pipeline_instance is None:
+            _pipeline_instance = IntegratedPipeline()
     return _pipeline_instance
 
 
@@ -8,7 +8,17 @@ RAG (Retrieval-Augmented Generation) Module
 
 import os
 import io
-from typing import List, Optional, BinaryIO
+import re
+import heapq
+import threading
+import unicodedata
+import shutil
+import tempfile
+import multiprocessing
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, BinaryIO, Tuple, Union
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -16,11 +26,23 @@ from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
 # PDF & OCR imports
 import fitz  # PyMuPDF
 from PIL import Image
-import pytesseract
+
+from ocr import (
+    OCRCache, PageKind, classify_page, choose_language, ocr_zoom,
+    render_page, pixmap_hash, image_hash, image_to_text, ocr_png,
+)
+from manifest import IngestManifest, hash_file, chunk_id
+from embeddings import CachedEmbeddings
+from ingest import IngestionEngine, ProgressCallback, set_torch_threads
+from sparse_index import BM25Index
+from cache import LRUCache
+from tracing import get_tracer
+from metrics import get_metrics_registry
 
 # Load environment variables
 load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
@@ -29,6 +51,99 @@ load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "intfloat/multilingual-e5-small")
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
 CHROMA_COLLECTION_NAME = os.getenv("CHROMA_COLLECTION_NAME", "documents")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+QUERY_BATCH_SIZE = int(os.getenv("QUERY_BATCH_SIZE", "16"))  # <= 1 disables query micro-batching
+QUERY_BATCH_WAIT_MS = float(os.getenv("QUERY_BATCH_WAIT_MS", "2"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", "0"))  # 0 = torch default
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "50000"))
+LANG_SAMPLE_CHARS = 2000
+RRF_K = 60  # Reciprocal Rank Fusion constant
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "512"))
+RETRIEVAL_CACHE_TTL = float(os.getenv("RETRIEVAL_CACHE_TTL", "300"))
+TEXT_BLOCK_CHARS = 20000
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
+
+# Operational metrics (Prometheus text format, see metrics.py)
+_metrics = get_metrics_registry()
+_search_requests = _metrics.counter(
+    "rag_search_requests_total", "Searches by mode and retrieval cache result", ["mode", "cache"]
+)
+_search_seconds = _metrics.histogram("rag_search_seconds", "Search latency, cache hits included", ["mode"])
+_pdf_pages = _metrics.counter(
+    "rag_pdf_pages_total", "PDF pages read, by how their text was obtained", ["method"]
+)
+_ocr_images = _metrics.counter("rag_ocr_images_total", "Images OCR'd, by OCR cache result", ["cache"])
+_files_ingested = _metrics.counter(
+    "rag_files_total", "Uploaded files processed (unchanged = skipped by file hash)", ["type", "result"]
+)
+
+
+@contextmanager
+def open_pdf(pdf_file: BinaryIO) -> Iterator["fitz.Document"]:
+    """Open a PDF upload from disk rather than from an in-memory bytes copy.
+
+    Real files are opened by path; anything else (e.g. Streamlit uploads)
+    is spooled to a temp file in blocks first.
+    """
+    try:
+        pdf_file.fileno()
+        path = pdf_file.name
+    except (AttributeError, OSError):
+        path = None
+
+    tmp_path = None
+    if path is None:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            shutil.copyfileobj(pdf_file, tmp, 1024 * 1024)
+            tmp_path = tmp.name
+        path = tmp_path
+
+    doc = fitz.open(path)
+    try:
+        yield doc
+    finally:
+        doc.close()
+        if tmp_path:
+            os.unlink(tmp_path)
+
+
+def iter_text_blocks(txt_file: BinaryIO, block_chars: int = TEXT_BLOCK_CHARS) -> Iterator[str]:
+    """Read a UTF-8 text file in line-aligned blocks of roughly `block_chars`."""
+    reader = io.TextIOWrapper(txt_file, encoding="utf-8")
+    try:
+        lines: List[str] = []
+        size = 0
+        for line in reader:
+            lines.append(line)
+            size += len(line)
+            if size >= block_chars:
+                yield "".join(lines)
+                lines, size = [], 0
+        if lines:
+            yield "".join(lines)
+    finally:
+        # Don't close the caller's file along with the wrapper
+        reader.detach()
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[str]], k: int, rrf_k: int = RRF_K) -> List[str]:
+    """Fuse ranked ID lists by Reciprocal Rank Fusion: score = sum of 1 / (rrf_k + rank).
+
+    Only ranks count, so rankings with incomparable scores (cosine, BM25)
+    fuse without normalization.
+
+    Returns:
+        Top-k IDs, best first
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += 1.0 / (rrf_k + rank + 1)
+    return heapq.nlargest(k, scores, key=scores.get)
 
 
 class RAGSystem:
@@ -39,16 +154,38 @@ class RAGSystem:
         embedding_model: str = EMBEDDING_MODEL,
         persist_directory: str = CHROMA_PERSIST_DIR,
         collection_name: str = CHROMA_COLLECTION_NAME,
+        embeddings: Optional[Embeddings] = None,
+        chunk_size: int = CHUNK_SIZE,
+        chunk_overlap: int = CHUNK_OVERLAP,
     ):
+        """
+        Args:
+            embedding_model: Hugging Face model name (also the embedding cache key)
+            persist_directory: Chroma / cache / index directory
+            collection_name: Chroma collection name
+            embeddings: Base embeddings to use instead of loading embedding_model
+            chunk_size: Maximum chunk length in characters
+            chunk_overlap: Characters shared by consecutive chunks
+        """
         self.embedding_model = embedding_model
         self.persist_directory = persist_directory
         self.collection_name = collection_name
-
-        # Initialize embeddings
-        self.embeddings = HuggingFaceEmbeddings(
+        self.tracer = get_tracer()
+        self.metrics = _metrics
+
+        # Initialize embeddings (cached on disk, keyed by model + text)
+        set_torch_threads(TORCH_THREADS)
+        self.embeddings = CachedEmbeddings(
+            embeddings or HuggingFaceEmbeddings(
+                model_name=embedding_model,
+                model_kwargs={"device": "cpu"},  # Use "cuda" for GPU
+                encode_kwargs={"normalize_embeddings": True, "batch_size": EMBED_BATCH_SIZE},
+            ),
             model_name=embedding_model,
-            model_kwargs={"device": "cpu"},  # Use "cuda" for GPU
-            encode_kwargs={"normalize_embeddings": True},
+            cache_path=os.path.join(persist_directory, "embedding_cache.sqlite"),
+            memory_size=EMBEDDING_CACHE_SIZE,
+            query_batch_size=QUERY_BATCH_SIZE,
+            query_batch_wait_ms=QUERY_BATCH_WAIT_MS,
         )
 
         # Initialize or load ChromaDB
@@ -60,75 +197,259 @@ class RAGSystem:
 
         # Text splitter for document chunking
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=50,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
             length_function=len,
             separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
         )
 
-    def add_documents(self, texts: List[str], metadatas: Optional[List[dict]] = None) -> List[str]:
+        # OCR results keyed by rendered page image hash
+        self.ocr_cache = OCRCache(
+            os.path.join(persist_directory, "ocr_cache.sqlite"),
+            max_entries=OCR_CACHE_MAX_ENTRIES,
+        )
+        self.page_triage: Counter = Counter()
+
+        # File hash -> chunk ID manifest for incremental re-ingestion
+        self.manifest = IngestManifest(persist_directory)
+
+        # BM25 index kept in sync with the collection (built once for pre-existing collections);
+        # writes by other processes sharing persist_directory are picked up on the next search
+        self.sparse_index = BM25Index(os.path.join(persist_directory, "bm25.sqlite"))
+        if not len(self.sparse_index) and self.vectorstore._collection.count():
+            self._rebuild_sparse_index()
+
+        # Search results keyed by (mode, normalized query, k, collection version)
+        self.retrieval_cache = LRUCache(maxsize=RETRIEVAL_CACHE_SIZE, ttl=RETRIEVAL_CACHE_TTL)
+
+        # Batched chunk -> embed -> write pipeline
+        self.ingestor = IngestionEngine(self, batch_size=EMBED_BATCH_SIZE, queue_size=INGEST_QUEUE_SIZE)
+
+        # Read at scrape time (the last RAGSystem created in the process reports)
+        _metrics.gauge("rag_collection_chunks", "Chunks in the Chroma collection").set_function(
+            lambda: self.vectorstore._collection.count()
+        )
+        _metrics.gauge("rag_embedding_cache_hit_ratio", "Embedding cache hit ratio since start").set_function(
+            lambda: self.embeddings.stats()["hit_rate"]
+        )
+
+    @property
+    def version(self) -> int:
+        """Collection version, shared by every process using persist_directory.
+
+        Every collection write also writes the BM25 index, so its SQLite
+        generation counter doubles as the version.
+        """
+        return self.sparse_index.generation
+
+    def clear_search_cache(self):
+        """Drop cached search results after a local write (they are keyed on the old version anyway)."""
+        self.retrieval_cache.clear()
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", query)).strip().lower()
+
+    def _cached_search(self, mode: str, query: str, k: int, search_fn: Callable[[], list]) -> list:
+        """Serve a search from the retrieval cache, running search_fn on a miss."""
+        version = self.version
+        key = (mode, self._normalize_query(query), k, version)
+        base_mode = mode.split(":")[0]
+        with self.tracer.span("rag.search", mode=mode, k=k) as span, _search_seconds.time(mode=base_mode):
+            results = self.retrieval_cache.get(key)
+            span.set(cache_hit=results is not None)
+            _search_requests.inc(mode=base_mode, cache="miss" if results is None else "hit")
+            if results is None:
+                results = search_fn()
+                # Don't store results computed against a collection that changed meanwhile
+                if self.version == version:
+                    self.retrieval_cache.set(key, results)
+            return list(results)
+
+    def _rebuild_sparse_index(self, page_size: int = 1000):
+        """Re-index every chunk in the collection into the BM25 index."""
+        collection = self.vectorstore._collection
+        self.sparse_index.clear()
+        offset = 0
+        while True:
+            result = collection.get(include=["documents"], limit=page_size, offset=offset)
+            if not result["ids"]:
+                break
+            self.sparse_index.add(result["ids"], result["documents"])
+            offset += len(result["ids"])
+
+    def _iter_chunks(
+        self, texts: Iterable[str], metadatas: Optional[List[dict]] = None
+    ) -> Iterator[Tuple[str, Document]]:
+        """Lazily chunk texts into (content-hash ID, Document) pairs."""
+        for i, text in enumerate(texts):
+            metadata = metadatas[i] if metadatas and i < len(metadatas) else {}
+            yield from self._iter_source_chunks([text], metadata)
+
+    def _iter_source_chunks(self, texts: Iterable[str], metadata: dict) -> Iterator[Tuple[str, Document]]:
+        """Lazily chunk consecutive text blocks of one source (e.g. PDF pages)."""
+        source = metadata.get("source", "") if metadata else ""
+        for text in texts:
+            with self.tracer.span("ingest.chunk", source=source, chars=len(text)) as span:
+                chunks = self.text_splitter.split_text(text)
+                span.set(chunks=len(chunks))
+            for chunk in chunks:
+                yield chunk_id(source, chunk), Document(page_content=chunk, metadata=metadata)
+
+    def add_documents(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[dict]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> List[str]:
         """Add documents to the vector store.
 
+        Chunk IDs are content hashes, so chunks already in the collection
+        are not embedded again. Chunking, embedding and writing run as a
+        pipeline in fixed-size batches (see IngestionEngine).
+
         Args:
             texts: List of text content to add
             metadatas: Optional list of metadata dicts for each text
+            progress_callback: Optional callback receiving IngestProgress
 
         Returns:
             List of document IDs
         """
-        documents = []
-        for i, text in enumerate(texts):
-            metadata = metadatas[i] if metadatas and i < len(metadatas) else {}
-            chunks = self.text_splitter.split_text(text)
-            for chunk in chunks:
-                documents.append(Document(page_content=chunk, metadata=metadata))
+        with self.tracer.span("rag.add_documents", texts=len(texts)):
+            return self.ingestor.run(self._iter_chunks(texts, metadatas), progress_callback)
 
-        if documents:
-            ids = self.vectorstore.add_documents(documents)
-            return ids
-        return []
-
-    def add_document(self, text: str, metadata: Optional[dict] = None) -> List[str]:
+    def add_document(
+        self,
+        text: str,
+        metadata: Optional[dict] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> List[str]:
         """Add a single document to the vector store."""
-        return self.add_documents([text], [metadata] if metadata else None)
+        return self.add_documents([text], [metadata] if metadata else None, progress_callback)
 
-    def extract_text_from_pdf(self, pdf_file: BinaryIO, use_ocr: bool = True) -> str:
+    def extract_text_from_pdf(
+        self,
+        pdf_file: BinaryIO,
+        use_ocr: bool = True,
+        workers: Optional[int] = None,
+    ) -> str:
         """Extract text from PDF file.
 
         Args:
             pdf_file: PDF file object (binary)
             use_ocr: Whether to use OCR for image-based pages
+            workers: OCR worker processes (defaults to OCR_WORKERS, 1 = serial)
 
         Returns:
             Extracted text content
         """
-        pdf_bytes = pdf_file.read()
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        all_text = []
-
-        for page_num, page in enumerate(doc):
-            # Try to extract text directly first
-            text = page.get_text().strip()
-
-            # If no text found and OCR is enabled, try OCR
-            if not text and use_ocr:
-                # Render page to image
-                mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
-                pix = page.get_pixmap(matrix=mat)
-                img_bytes = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_bytes))
-
-                # OCR - try Korean+English first, fallback to English only
-                try:
-                    text = pytesseract.image_to_string(img, lang="kor+eng")
-                except pytesseract.TesseractError:
-                    text = pytesseract.image_to_string(img)
+        return "\n\n".join(self.iter_pdf_pages(pdf_file, use_ocr=use_ocr, workers=workers))
+
+    def iter_pdf_pages(
+        self,
+        pdf_file: BinaryIO,
+        use_ocr: bool = True,
+        workers: Optional[int] = None,
+        page_callback: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[str]:
+        """Lazily extract PDF pages as "[페이지 N]" blocks, in page order.
+
+        Pages with a text layer are read directly. Text-less pages are
+        triaged from a thumbnail (blank pages skipped, near-blank pages
+        cropped to their inked area), rendered here at a DPI chosen from
+        the page size (fitz documents can't be pickled) and OCR'd in a
+        process pool. At most `workers * 2` pages are held between being
+        read and being yielded, so memory is bounded by that window
+        rather than by file size.
+
+        Args:
+            pdf_file: PDF file object (binary)
+            use_ocr: Whether to use OCR for image-based pages
+            workers: OCR worker processes (defaults to OCR_WORKERS, 1 = serial)
+            page_callback: Called with the 1-based page number as each page finishes
 
+        Yields:
+            Non-empty page texts prefixed with their page marker
+        """
+        workers = OCR_WORKERS if workers is None else workers
+        max_window = max(1, workers * 2)
+        # (page_num, text or pending OCR, OCR cache key to fill)
+        window: Deque[Tuple[int, Union[str, Future], Optional[str]]] = deque()
+        pool: Optional[ProcessPoolExecutor] = None
+        lang: Optional[str] = None
+        lang_sample = ""
+
+        def resolve(item: Tuple[int, Union[str, Future], Optional[str]]) -> Iterator[str]:
+            page_num, text, cache_key = item
+            if isinstance(text, Future):
+                with self.tracer.span("ocr.wait", page=page_num + 1):
+                    text = text.result()
+            if cache_key:
+                self.ocr_cache.set(cache_key, text)
+                _pdf_pages.inc(method="ocr")
+            if page_callback:
+                page_callback(page_num + 1)
             if text:
-                all_text.append(f"[페이지 {page_num + 1}]\n{text}")
+                yield f"[페이지 {page_num + 1}]\n{text}"
 
-        doc.close()
-        return "\n\n".join(all_text)
+        try:
+            with open_pdf(pdf_file) as doc:
+                for page_num, page in enumerate(doc):
+                    with self.tracer.span("pdf.page", page=page_num + 1) as span:
+                        # Try to extract text directly first
+                        text = page.get_text().strip()
+
+                        if text and len(lang_sample) < LANG_SAMPLE_CHARS:
+                            lang_sample += text[:LANG_SAMPLE_CHARS]
+
+                        # If no text found and OCR is enabled, triage the page, then OCR (cached by page image)
+                        cache_key = None
+                        if text:
+                            _pdf_pages.inc(method="text_layer")
+                        elif not use_ocr:
+                            _pdf_pages.inc(method="skipped")
+                        else:
+                            kind, clip = classify_page(page)
+                            self.page_triage[kind.value] += 1
+                            span.set(triage=kind.value)
+                            if kind == PageKind.BLANK:
+                                _pdf_pages.inc(method="blank")
+                            else:
+                                if lang is None:
+                                    # Chosen once per document, from the text-layer pages seen so far
+                                    lang = choose_language(lang_sample)
+                                zoom = ocr_zoom(page)
+                                pix = render_page(page, zoom, clip)
+                                key = self.ocr_cache.key(pixmap_hash(pix), lang, zoom)
+                                cached = self.ocr_cache.get(key)
+                                span.set(ocr_cache_hit=cached is not None)
+                                if cached is not None:
+                                    text = cached
+                                    _pdf_pages.inc(method="ocr_cached")
+                                elif workers <= 1:
+                                    text = ocr_png(pix.tobytes("png"), lang)
+                                    cache_key = key
+                                else:
+                                    if pool is None:
+                                        # spawn: forking a process that holds torch threads can deadlock
+                                        pool = ProcessPoolExecutor(
+                                            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                                        )
+                                    text = pool.submit(ocr_png, pix.tobytes("png"), lang)
+                                    cache_key = key
+                                del pix
+                    window.append((page_num, text, cache_key))
+
+                    # Emit finished pages from the head; block on OCR once the window is full
+                    while window and (len(window) > max_window or not isinstance(window[0][1], Future)):
+                        yield from resolve(window.popleft())
+
+                while window:
+                    yield from resolve(window.popleft())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
 
     def extract_text_from_image(self, image_file: BinaryIO) -> str:
         """Extract text from image using OCR.
@@ -140,43 +461,151 @@ class RAGSystem:
             Extracted text content
         """
         img = Image.open(image_file)
-        # Try Korean+English first, fallback to English only
-        try:
-            text = pytesseract.image_to_string(img, lang="kor+eng")
-        except pytesseract.TesseractError:
-            text = pytesseract.image_to_string(img)
+        lang = choose_language()
+        key = self.ocr_cache.key(image_hash(img), lang, zoom=1.0)
+        with self.tracer.span("ocr.image", lang=lang) as span:
+            text = self.ocr_cache.get(key)
+            span.set(ocr_cache_hit=text is not None)
+            _ocr_images.inc(cache="miss" if text is None else "hit")
+            if text is None:
+                text = image_to_text(img, lang=lang)
+                self.ocr_cache.set(key, text)
         return text.strip()
 
-    def add_pdf(self, pdf_file: BinaryIO, filename: str, use_ocr: bool = True) -> List[str]:
+    def add_pdf(
+        self,
+        pdf_file: BinaryIO,
+        filename: str,
+        use_ocr: bool = True,
+        workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        page_callback: Optional[Callable[[int], None]] = None,
+    ) -> List[str]:
         """Add PDF document to the vector store.
 
         Args:
             pdf_file: PDF file object (binary)
             filename: Original filename for metadata
             use_ocr: Whether to use OCR for image-based pages
+            workers: OCR worker processes (defaults to OCR_WORKERS)
+            progress_callback: Optional callback receiving IngestProgress
+            page_callback: Optional callback receiving each finished page number
 
         Returns:
             List of document IDs
         """
-        text = self.extract_text_from_pdf(pdf_file, use_ocr=use_ocr)
-        if text:
-            return self.add_document(text, metadata={"source": filename, "type": "pdf"})
-        return []
+        return self._add_file(
+            pdf_file,
+            filename,
+            lambda: self.iter_pdf_pages(pdf_file, use_ocr=use_ocr, workers=workers, page_callback=page_callback),
+            metadata={"source": filename, "type": "pdf"},
+            variant="" if use_ocr else "no-ocr",
+            progress_callback=progress_callback,
+        )
 
-    def add_image(self, image_file: BinaryIO, filename: str) -> List[str]:
+    def add_image(
+        self,
+        image_file: BinaryIO,
+        filename: str,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> List[str]:
         """Add image (via OCR) to the vector store.
 
         Args:
             image_file: Image file object (binary)
             filename: Original filename for metadata
+            progress_callback: Optional callback receiving IngestProgress
+
+        Returns:
+            List of document IDs
+        """
+        return self._add_file(
+            image_file,
+            filename,
+            lambda: [self.extract_text_from_image(image_file)],
+            metadata={"source": filename, "type": "image"},
+            progress_callback=progress_callback,
+        )
+
+    def add_txt(
+        self,
+        txt_file: BinaryIO,
+        filename: str,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """Add UTF-8 text file to the vector store.
+
+        Args:
+            txt_file: Text file object (binary)
+            filename: Original filename for metadata
+            progress_callback: Optional callback receiving IngestProgress
 
         Returns:
             List of document IDs
         """
-        text = self.extract_text_from_image(image_file)
-        if text:
-            return self.add_document(text, metadata={"source": filename, "type": "image"})
-        return []
+        return self._add_file(
+            txt_file,
+            filename,
+            lambda: iter_text_blocks(txt_file),
+            metadata={"source": filename, "type": "txt"},
+            progress_callback=progress_callback,
+        )
+
+    def _add_file(
+        self,
+        file: BinaryIO,
+        source: str,
+        extract: Callable[[], Iterable[str]],
+        metadata: dict,
+        variant: str = "",
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> List[str]:
+        """Incrementally (re-)ingest an uploaded file.
+
+        - Same file hash as last time: skipped without extracting
+        - Changed file: only new chunks are embedded, vanished chunks deleted
+        - Tracked by source name: a different file uploaded under the same
+          name replaces it (see IngestManifest)
+
+        Args:
+            file: File object (binary), hashed before extraction
+            source: Source name the file is tracked under
+            extract: Callable returning the file's text, lazily, in blocks
+            metadata: Metadata for the file's chunks
+            variant: Extraction options that change the text (part of the hash)
+            progress_callback: Optional callback receiving IngestProgress
+
+        Returns:
+            List of document IDs for the file's current chunks
+        """
+        with self.tracer.span("rag.add_file", source=source, type=metadata.get("type")) as span:
+            file_hash = hash_file(file)
+            if variant:
+                file_hash = f"{file_hash}:{variant}"
+            entry = self.manifest.get(source)
+            if entry and entry["file_hash"] == file_hash:
+                span.set(unchanged=True)
+                _files_ingested.inc(type=metadata.get("type"), result="unchanged")
+                return entry["chunk_ids"]
+
+            ids = self.ingestor.run(self._iter_source_chunks(extract(), metadata), progress_callback)
+
+            if entry:
+                old_ids = set(entry["chunk_ids"])
+            else:
+                # Not tracked yet (e.g. ingested before the manifest existed)
+                old_ids = set(self.vectorstore._collection.get(where={"source": source}, include=[])["ids"])
+            current = set(ids)
+            stale = [doc_id for doc_id in old_ids if doc_id not in current]
+            if stale:
+                self.vectorstore.delete(ids=stale)
+                self.sparse_index.remove(stale)
+                self.clear_search_cache()
+            span.set(chunks=len(ids), stale_chunks=len(stale))
+            _files_ingested.inc(type=metadata.get("type"), result="ingested")
+
+            self.manifest.update(source, file_hash, ids)
+            return ids
 
     def search(self, query: str, k: int = 3) -> List[Document]:
         """Search for similar documents.
@@ -190,8 +619,9 @@ class RAGSystem:
         """
         # e5 models require "query: " prefix for queries
         formatted_query = f"query: {query}"
-        results = self.vectorstore.similarity_search(formatted_query, k=k)
-        return results
+        return self._cached_search(
+            "dense", query, k, lambda: self.vectorstore.similarity_search(formatted_query, k=k)
+        )
 
     def search_with_score(self, query: str, k: int = 3) -> List[tuple]:
         """Search with relevance scores.
@@ -204,8 +634,56 @@ class RAGSystem:
             List of (Document, score) tuples
         """
         formatted_query = f"query: {query}"
-        results = self.vectorstore.similarity_search_with_score(formatted_query, k=k)
-        return results
+        return self._cached_search(
+            "dense_score", query, k, lambda: self.vectorstore.similarity_search_with_score(formatted_query, k=k)
+        )
+
+    def hybrid_search(self, query: str, k: int = 3, fetch_k: Optional[int] = None) -> List[Document]:
+        """Search with dense (Chroma) and sparse (BM25) rankings fused by RRF.
+
+        BM25 catches exact Korean terms, identifiers and acronyms that
+        dense similarity misses.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            fetch_k: Candidates taken from each ranking (default max(4k, 20))
+
+        Returns:
+            List of documents, best first
+        """
+        fetch_k = fetch_k or max(k * 4, 20)
+        return self._cached_search(f"hybrid:{fetch_k}", query, k, lambda: self._hybrid_search(query, k, fetch_k))
+
+    def _hybrid_search(self, query: str, k: int, fetch_k: int) -> List[Document]:
+        collection = self.vectorstore._collection
+
+        formatted_query = f"query: {query}"
+        with self.tracer.span("rag.embed_query"):
+            query_embedding = self.embeddings.embed_query(formatted_query)
+        with self.tracer.span("rag.dense_query", fetch_k=fetch_k):
+            dense = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=fetch_k,
+                include=["documents", "metadatas"],
+            )
+        dense_ids = dense["ids"][0]
+        with self.tracer.span("rag.sparse_query", fetch_k=fetch_k):
+            sparse_ids = [doc_id for doc_id, _ in self.sparse_index.search(query, k=fetch_k)]
+
+        top_ids = reciprocal_rank_fusion([dense_ids, sparse_ids], k)
+
+        docs = {
+            doc_id: Document(id=doc_id, page_content=content, metadata=metadata or {})
+            for doc_id, content, metadata in zip(dense_ids, dense["documents"][0], dense["metadatas"][0])
+        }
+        missing = [doc_id for doc_id in top_ids if doc_id not in docs]
+        if missing:
+            result = collection.get(ids=missing, include=["documents", "metadatas"])
+            for doc_id, content, metadata in zip(result["ids"], result["documents"], result["metadatas"]):
+                docs[doc_id] = Document(id=doc_id, page_content=content, metadata=metadata or {})
+
+        return [docs[doc_id] for doc_id in top_ids if doc_id in docs]
 
     def get_retriever(self, k: int = 3):
         """Get a retriever for use in chains."""
@@ -240,6 +718,9 @@ class RAGSystem:
             embedding_function=self.embeddings,
             persist_directory=self.persist_directory,
         )
+        self.manifest.clear()
+        self.sparse_index.clear()
+        self.clear_search_cache()
 
     def get_collection_stats(self) -> dict:
         """Get statistics about the collection."""
@@ -247,6 +728,13 @@ class RAGSystem:
         return {
             "name": self.collection_name,
             "count": collection.count(),
+            "files": len(self.manifest),
+            "embedding_cache": self.embeddings.stats(),
+            "ocr_cache": self.ocr_cache.stats(),
+            "page_triage": dict(self.page_triage),
+            "sparse_index": self.sparse_index.stats(),
+            "version": self.version,
+            "retrieval_cache": self.retrieval_cache.stats(),
         }
 
     def get_sources(self) -> list:
@@ -270,13 +758,15 @@ class RAGSystem:
 
 # Singleton instance
 _rag_instance: Optional[RAGSystem] = None
+_rag_lock = threading.Lock()
 
 
 def get_rag_system() -> RAGSystem:
     """Get or create the RAG system singleton."""
     global _rag_instance
-    if _rag_instance is None:
-        _rag_instance = RAGSystem()
+    with _rag_lock:
+        if _rag_instance is None:
+            _rag_instance = RAGSystem()
     return _rag_instance
 
 
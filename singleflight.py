@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Single-flight Module
+- Coalesce concurrent calls with the same key into one execution
+- Streamed chunks fan out to every waiter, replayed for late joiners
+- SingleFlight (threads) and AsyncSingleFlight (asyncio)
+"""
+
+import asyncio
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+Emit = Callable[[str], None]
+ChunkCallback = Callable[[str], Any]
+
+_DONE = object()
+
+
+class _Flight:
+    """One in-progress call shared by a leader thread and its followers."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks: List[str] = []
+        self.finished = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def emit(self, chunk: str):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, result: Any = None, error: Optional[BaseException] = None):
+        with self.cond:
+            self.result = result
+            self.error = error
+            self.finished = True
+            self.cond.notify_all()
+
+    def follow(self, callback: Optional[Callable[[str], None]]) -> Any:
+        """Replay chunks so far, then stream new ones until the leader finishes.
+
+        Callbacks run on the follower's own thread, never the leader's.
+        """
+        seen = 0
+        while True:
+            with self.cond:
+                while seen == len(self.chunks) and not self.finished:
+                    self.cond.wait()
+                new = self.chunks[seen:]
+                seen = len(self.chunks)
+                finished = self.finished
+            if callback:
+                for chunk in new:
+                    callback(chunk)
+            if finished:
+                break
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Thread-based single-flight group.
+
+    The first caller for a key runs `fn(emit)` on its own thread; callers
+    arriving while it runs wait for the same result (or exception). A key
+    is forgotten as soon as its call finishes - this is not a cache.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[Emit], Any],
+        callback: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Any, bool]:
+        """Run or join the call for `key`.
+
+        Returns:
+            (result, shared) - shared is True when another caller ran fn
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.follow(callback), True
+
+        def emit(chunk: str):
+            flight.emit(chunk)
+            if callback:
+                callback(chunk)
+
+        try:
+            result = fn(emit)
+        except BaseException as e:
+            flight.finish(error=e)
+            raise
+        else:
+            flight.finish(result=result)
+            return result, False
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
+
+
+class _AsyncFlight:
+    """One in-progress asyncio call and the queues of everyone waiting on it."""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.chunks: List[str] = []
+        self.subscribers: List[asyncio.Queue] = []
+
+    def emit(self, chunk: str):
+        self.chunks.append(chunk)
+        for queue in self.subscribers:
+            queue.put_nowait(chunk)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        for chunk in self.chunks:
+            queue.put_nowait(chunk)
+        if self.task is not None and self.task.done():
+            queue.put_nowait(_DONE)
+        self.subscribers.append(queue)
+        return queue
+
+    def close(self):
+        for queue in self.subscribers:
+            queue.put_nowait(_DONE)
+
+
+class AsyncSingleFlight:
+    """asyncio single-flight group.
+
+    The call runs as its own task, so one waiter being cancelled (e.g. a
+    client disconnecting) does not cancel it for the others; it is only
+    cancelled once every waiter has gone.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _AsyncFlight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def _run(self, key: Hashable, flight: _AsyncFlight, fn: Callable[[Emit], Awaitable[Any]]) -> Any:
+        try:
+            return await fn(flight.emit)
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.close()
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[Emit], Awaitable[Any]],
+        callback: Optional[ChunkCallback] = None,
+    ) -> Tuple[Any, bool]:
+        """Run or join the call for `key`; `callback` may be sync or async.
+
+        Returns:
+            (result, shared) - shared is True when another caller started fn
+        """
+        self.calls += 1
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            flight = self._flights[key] = _AsyncFlight()
+            flight.task = asyncio.ensure_future(self._run(key, flight, fn))
+
+        queue = flight.subscribe()
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is _DONE:
+                    break
+                if callback:
+                    result = callback(chunk)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            flight.subscribers.remove(queue)
+            if not flight.subscribers and not flight.task.done():
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+        return flight.task.result(), shared
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
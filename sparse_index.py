@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Sparse Index Module
+- BM25 inverted index kept alongside the Chroma collection
+- Korean-aware tokenization (Hangul character bigrams + whole words)
+- Postings persisted in SQLite, served from memory
+"""
+
+import os
+import re
+import math
+import heapq
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# Hangul runs, and latin/digit identifiers (snake_case, dotted.names, C++ etc.)
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9][a-z0-9_.+#-]*[a-z0-9+#]|[a-z0-9]")
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenize mixed Korean/English text for BM25.
+
+    Korean has no whitespace-delimited morphemes (particles attach to
+    nouns), so Hangul runs are indexed as character bigrams, which match
+    "검색은"/"검색을"/"검색" alike. Whole runs are kept too, so exact
+    terms rank higher. Identifiers are kept whole and also split on
+    "_" / "." so `get_context` matches both itself and "context".
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        if "가" <= token[0] <= "힣":
+            # Lone syllables are almost always detached particles ("는", "와")
+            if len(token) > 1:
+                tokens.append(token)
+            if len(token) > 2:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token)
+            parts = [p for p in re.split(r"[_.]", token) if p]
+            if len(parts) > 1:
+                tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """Persistent BM25 index over chunk IDs.
+
+    The full postings table lives in memory (term -> {chunk_id: tf}) so a
+    query only touches the postings of its own terms; SQLite is just the
+    durable copy, updated incrementally.
+
+    Every write also bumps a generation counter in the same SQLite file.
+    Several processes can share one index: before a search, a generation
+    that differs from the one loaded here (another process wrote) triggers
+    a reload of the postings.
+    """
+
+    def __init__(self, path: str, k1: float = BM25_K1, b: float = BM25_B):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self._generation = 0  # generation the in-memory postings reflect
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (doc_id, term))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+        self._conn.commit()
+        with self._lock:
+            self._load_locked()
+
+    def _read_generation(self) -> int:
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    def _load_locked(self):
+        postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        doc_terms: Dict[str, Dict[str, int]] = {}
+        # Read the generation and the postings in one snapshot
+        with self._conn:
+            self._conn.execute("BEGIN")
+            generation = self._read_generation()
+            for term, doc_id, tf in self._conn.execute("SELECT term, doc_id, tf FROM postings"):
+                postings[term][doc_id] = tf
+                doc_terms.setdefault(doc_id, {})[term] = tf
+        self._postings = postings
+        self._doc_terms = doc_terms
+        self._doc_len = {doc_id: sum(terms.values()) for doc_id, terms in doc_terms.items()}
+        self._total_len = sum(self._doc_len.values())
+        self._generation = generation
+
+    def _commit_locked(self):
+        """Bump the shared generation and commit the pending writes with it."""
+        self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        generation = self._read_generation()
+        self._conn.commit()
+        if generation == self._generation + 1:
+            self._generation = generation
+        else:
+            # Another process wrote between our last sync and this write
+            self._load_locked()
+
+    def _sync_locked(self):
+        if self._read_generation() != self._generation:
+            self._load_locked()
+
+    def sync(self) -> int:
+        """Reload the postings if another process changed the index; returns the generation."""
+        with self._lock:
+            self._sync_locked()
+            return self._generation
+
+    @property
+    def generation(self) -> int:
+        """Shared write counter, as stored in SQLite (changes on every write by any process)."""
+        with self._lock:
+            return self._read_generation()
+
+    def _remove_locked(self, doc_ids: Iterable[str]) -> List[str]:
+        removed = []
+        for doc_id in doc_ids:
+            terms = self._doc_terms.pop(doc_id, None)
+            if terms is None:
+                continue
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_len -= self._doc_len.pop(doc_id, 0)
+            removed.append(doc_id)
+        return removed
+
+    def add(self, doc_ids: List[str], texts: List[str]):
+        """Index (or re-index) chunks."""
+        rows: List[Tuple[str, str, int]] = []
+        with self._lock:
+            self._sync_locked()
+            self._remove_locked(doc_ids)
+            for doc_id, text in zip(doc_ids, texts):
+                terms = dict(Counter(tokenize(text)))
+                self._doc_terms[doc_id] = terms
+                self._doc_len[doc_id] = sum(terms.values())
+                self._total_len += self._doc_len[doc_id]
+                for term, tf in terms.items():
+                    self._postings[term][doc_id] = tf
+                    rows.append((term, doc_id, tf))
+
+            self._conn.executemany("DELETE FROM postings WHERE doc_id = ?", [(d,) for d in doc_ids])
+            self._conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", rows)
+            self._commit_locked()
+
+    def remove(self, doc_ids: List[str]):
+        """Drop chunks from the index."""
+        with self._lock:
+            self._sync_locked()
+            removed = self._remove_locked(doc_ids)
+            if removed:
+                self._conn.executemany("DELETE FROM postings WHERE doc_id = ?", [(d,) for d in removed])
+                self._commit_locked()
+
+    def clear(self):
+        """Drop everything."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_len.clear()
+            self._total_len = 0
+            self._conn.execute("DELETE FROM postings")
+            self._commit_locked()
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        """Top-k (chunk ID, BM25 score), best first."""
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = defaultdict(float)
+        with self._lock:
+            self._sync_locked()
+            n_docs = len(self._doc_len)
+            if not n_docs:
+                return []
+            k1, doc_len = self.k1, self._doc_len
+            base = k1 * (1 - self.b)
+            per_len = k1 * self.b * n_docs / self._total_len if self._total_len else 0.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf_k = math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) * (k1 + 1)
+                for doc_id, tf in postings.items():
+                    scores[doc_id] += idf_k * tf / (tf + base + per_len * doc_len[doc_id])
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def stats(self) -> dict:
+        return {"documents": len(self._doc_len), "terms": len(self._postings), "generation": self._generation}
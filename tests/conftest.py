@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Shared test setup: the modules live flat at the repository root."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Benchmark statistics and retrieval metrics."""
+
+from benchmarks.stats import latency_stats, percentile
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 0) == 10.0
+    assert percentile(values, 50) == 25.0
+    assert percentile(values, 100) == 40.0
+    assert percentile([], 90) == 0.0
+
+
+def test_latency_stats_empty():
+    assert latency_stats([]) == {"p50": 0.0, "p90": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+
+
+def test_retrieval_metrics():
+    from benchmarks.retrieval import ndcg_at_k, recall_at_k, reciprocal_rank
+
+    ranking = [False, True, False, True]
+    assert recall_at_k(ranking, n_relevant=2, k=2) == 0.5
+    assert recall_at_k(ranking, n_relevant=2, k=4) == 1.0
+    assert reciprocal_rank(ranking) == 0.5
+    assert reciprocal_rank([False, False]) == 0.0
+    assert ndcg_at_k([True, True], n_relevant=2, k=2) == 1.0
+    assert 0.0 < ndcg_at_k(ranking, n_relevant=2, k=4) < 1.0
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""LRUCache / DiskCache / SemanticCache."""
+
+import math
+import time
+
+import pytest
+
+from cache import DiskCache, LRUCache, SemanticCache, query_terms
+
+
+def unit(*values):
+    norm = math.sqrt(sum(v * v for v in values))
+    return [v / norm for v in values]
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(maxsize=4, ttl=0.05)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        time.sleep(0.08)
+        assert cache.get("a", "gone") == "gone"
+        assert "a" not in cache
+
+    def test_clear_invalidates(self):
+        cache = LRUCache(maxsize=4)
+        cache.set("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_zero_size_stores_nothing(self):
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+        assert len(cache) == 0
+
+
+class TestDiskCache:
+    def test_round_trip_and_persistence(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        cache = DiskCache(path)
+        cache.set_many({"a": b"1", "b": b"2"})
+        cache.close()
+
+        reopened = DiskCache(path)
+        assert reopened.get_many(["a", "b", "c"]) == {"a": b"1", "b": b"2"}
+        reopened.close()
+
+    def test_lru_bound(self, tmp_path):
+        cache = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+        cache.set("a", b"1")
+        time.sleep(0.01)
+        cache.set("b", b"2")
+        time.sleep(0.01)
+        cache.get("a")  # refresh a; b is now the oldest
+        time.sleep(0.01)
+        cache.set("c", b"3")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.evictions == 1
+        cache.close()
+
+
+class TestSemanticCache:
+    def test_threshold(self):
+        cache = SemanticCache(maxsize=8, threshold=0.95)
+        cache.store("ctx", unit(1, 0), "answer")
+        assert cache.lookup("ctx", unit(1, 0.1)) == ("answer", pytest.approx(0.995, abs=1e-3))
+        assert cache.lookup("ctx", unit(1, 1)) is None
+
+    def test_context_key_isolates_entries(self):
+        cache = SemanticCache(maxsize=8, threshold=0.5)
+        cache.store(("qa", ("chunk-1",)), unit(1, 0), "answer")
+        assert cache.lookup(("qa", ("chunk-2",)), unit(1, 0)) is None
+
+    def test_lru_eviction(self):
+        cache = SemanticCache(maxsize=2, threshold=0.9)
+        cache.store("a", unit(1, 0), 1)
+        cache.store("b", unit(1, 0), 2)
+        cache.lookup("a", unit(1, 0))
+        cache.store("c", unit(1, 0), 3)
+        assert cache.lookup("b", unit(1, 0)) is None
+        assert cache.lookup("a", unit(1, 0))[0] == 1
+
+    def test_antonym_question_misses(self):
+        """Same chunks and an identical embedding must still not return the other answer."""
+        cache = SemanticCache(maxsize=8, threshold=0.95)
+        context = ("qa", ("chunk-1", "chunk-2"), "model", 0.4, 1024, "")
+        vector = unit(1, 0)  # worst case: the embeddings can't tell them apart
+        cache.store((query_terms("RAG의 장점은?"),) + context, vector, "장점: ...")
+
+        assert cache.lookup((query_terms("RAG의 단점은?"),) + context, vector) is None
+        assert cache.lookup((query_terms("rag 장점은"),) + context, vector)[0] == "장점: ..."
+
+
+def test_query_terms_normalization():
+    assert query_terms("RAG의 장점은?") == query_terms("  rag   장점은 ")
+    assert query_terms("검색 속도") == query_terms("속도 검색")
+    assert query_terms("RAG의 장점은?") != query_terms("RAG의 단점은?")
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""LLMClientRegistry async pools across event loops."""
+
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("langchain_openai")
+
+from llm_clients import LLMClientRegistry  # noqa: E402
+
+
+class _KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disconnected = threading.Event()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def finish(self):
+        super().finish()
+        type(self).disconnected.set()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    _KeepAliveHandler.disconnected.clear()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_each_loop_gets_its_own_pool(base_url):
+    registry = LLMClientRegistry()
+
+    async def pool():
+        return registry.async_http_client(base_url)
+
+    assert asyncio.run(pool()) is not asyncio.run(pool())
+    assert registry.stats()["async_http_pools"] == 1  # the first loop's pool was dropped
+
+
+def test_closed_loop_pool_sockets_are_closed(base_url):
+    registry = LLMClientRegistry()
+
+    async def request():
+        await registry.async_http_client(base_url).get(f"{base_url}/models")
+
+    asyncio.run(request())  # leaves a keep-alive connection bound to a closed loop
+    assert not _KeepAliveHandler.disconnected.is_set()
+    asyncio.run(request())  # prunes the first loop's pool
+    assert _KeepAliveHandler.disconnected.wait(2)
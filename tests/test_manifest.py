@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""chunk_id / hash_file / IngestManifest."""
+
+import io
+import json
+
+from manifest import MANIFEST_FILENAME, IngestManifest, chunk_id, hash_file
+
+
+class TestChunkId:
+    def test_deterministic(self):
+        assert chunk_id("a.pdf", "text") == chunk_id("a.pdf", "text")
+
+    def test_scoped_to_source(self):
+        assert chunk_id("a.pdf", "text") != chunk_id("b.pdf", "text")
+
+    def test_separator_is_unambiguous(self):
+        assert chunk_id("ab", "c") != chunk_id("a", "bc")
+
+
+def test_hash_file_rewinds():
+    file = io.BytesIO(b"x" * 10)
+    file.seek(5)
+    digest = hash_file(file)
+    assert file.tell() == 0
+    assert digest == hash_file(io.BytesIO(b"x" * 10))
+
+
+class TestIngestManifest:
+    def test_persists_across_instances(self, tmp_path):
+        manifest = IngestManifest(str(tmp_path))
+        manifest.update("a.pdf", "h1", ["c1", "c2"])
+        reloaded = IngestManifest(str(tmp_path))
+        assert reloaded.get("a.pdf") == {"file_hash": "h1", "chunk_ids": ["c1", "c2"]}
+        assert len(reloaded) == 1
+
+    def test_same_name_replaces_entry(self, tmp_path):
+        manifest = IngestManifest(str(tmp_path))
+        manifest.update("a.pdf", "h1", ["c1"])
+        manifest.update("a.pdf", "h2", ["c2"])
+        assert manifest.get("a.pdf")["file_hash"] == "h2"
+        assert len(manifest) == 1
+
+    def test_get_returns_copy(self, tmp_path):
+        manifest = IngestManifest(str(tmp_path))
+        manifest.update("a.pdf", "h1", ["c1"])
+        manifest.get("a.pdf")["file_hash"] = "tampered"
+        assert manifest.get("a.pdf")["file_hash"] == "h1"
+
+    def test_clear(self, tmp_path):
+        manifest = IngestManifest(str(tmp_path))
+        manifest.update("a.pdf", "h1", ["c1"])
+        manifest.clear()
+        assert manifest.get("a.pdf") is None
+        assert len(IngestManifest(str(tmp_path))) == 0
+
+    def test_corrupt_file_starts_fresh(self, tmp_path):
+        (tmp_path / MANIFEST_FILENAME).write_text("{not json", encoding="utf-8")
+        assert len(IngestManifest(str(tmp_path))) == 0
+
+    def test_file_layout(self, tmp_path):
+        IngestManifest(str(tmp_path)).update("a.pdf", "h1", ["c1"])
+        data = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        assert data == {"files": {"a.pdf": {"file_hash": "h1", "chunk_ids": ["c1"]}}}
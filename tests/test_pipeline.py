@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""IntegratedPipeline helpers that don't need a model or an LLM server."""
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+pytest.importorskip("langchain_chroma")
+
+from langchain_core.documents import Document  # noqa: E402
+
+from pipeline import IntegratedPipeline, PipelineInput, TaskType  # noqa: E402
+from tokens import TokenCounter  # noqa: E402
+
+
+class _ConstantEmbeddings:
+    """Every query embeds to the same vector (worst case for the semantic cache)."""
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+
+class _FakeRAG:
+    embeddings = _ConstantEmbeddings()
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = IntegratedPipeline(rag_system=_FakeRAG(), coalesce=False, overlap_warmup=False)
+    # Deterministic estimate-based counts (no tokenizer)
+    pipeline.token_counter = TokenCounter("missing/tokenizer", local_files_only=True)
+    return pipeline
+
+
+SOURCES = [{"id": "chunk-1"}, {"id": "chunk-2"}]
+
+
+def test_antonym_question_misses_response_cache(pipeline):
+    first = PipelineInput(query="RAG의 장점은?")
+    key, vector, cached = pipeline._lookup_response(first, TaskType.QA, SOURCES)
+    assert cached is None
+    pipeline.response_cache.store(key, vector, "장점: ...")
+
+    opposite = PipelineInput(query="RAG의 단점은?")
+    assert pipeline._lookup_response(opposite, TaskType.QA, SOURCES)[2] is None
+
+    same = PipelineInput(query="rag 장점은")
+    assert pipeline._lookup_response(same, TaskType.QA, SOURCES)[2][0] == "장점: ..."
+
+
+def test_high_temperature_is_not_cached(pipeline):
+    assert pipeline._response_cache_key(PipelineInput(query="q", temperature=0.9), TaskType.QA, SOURCES) is None
+
+
+def _doc(text, source="notes.txt"):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def _distinct_chunks(n, words=60):
+    return [_doc(" ".join(f"topic{i}word{j}" for j in range(words))) for i in range(n)]
+
+
+def test_pack_context_stays_within_budget(pipeline):
+    pipeline.context_window = 1024
+    input_data = PipelineInput(query="질문", max_tokens=256, context_k=10)
+    packed = pipeline._pack_context(input_data, TaskType.QA, _distinct_chunks(10))
+
+    stats = packed.stats
+    assert stats["context_tokens"] + stats["history_tokens"] <= stats["token_budget"]
+    assert packed.prompt_tokens + input_data.max_tokens <= pipeline.context_window
+    assert stats["over_budget_chunks_dropped"] > 0
+    assert len(packed.sources) + stats["over_budget_chunks_dropped"] == 10
+
+
+def test_pack_context_keeps_rank_order_and_context_k(pipeline):
+    docs = _distinct_chunks(5, words=5)
+    packed = pipeline._pack_context(PipelineInput(query="q", context_k=3), TaskType.QA, docs)
+    assert [s["preview"] for s in packed.sources] == [d.page_content for d in docs[:3]]
+
+
+def test_pack_context_drops_near_duplicates(pipeline):
+    text = "검색 증강 생성은 외부 문서를 찾아 답변에 활용한다"
+    packed = pipeline._pack_context(
+        PipelineInput(query="q"), TaskType.QA, [_doc(text), _doc(text + "."), _doc("전혀 다른 내용의 조각")]
+    )
+    assert packed.stats["duplicate_chunks_dropped"] == 1
+    assert len(packed.sources) == 2
+
+
+def test_pack_context_history_keeps_most_recent(pipeline):
+    pipeline.context_window = 2000
+    history = [{"role": "user", "content": f"message {i} " + "x" * 400} for i in range(10)]
+    packed = pipeline._pack_context(PipelineInput(query="q", max_tokens=100, chat_history=history), TaskType.QA, [])
+
+    assert 0 < len(packed.history) < len(history)
+    assert packed.history == history[-len(packed.history):]
+    assert packed.stats["history_messages_dropped"] == 10 - len(packed.history)
+    assert packed.stats["history_tokens"] <= packed.stats["token_budget"] * 0.3
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""RRF fusion and the RAGSystem retrieval cache, without a model or a Chroma collection."""
+
+import pytest
+
+pytest.importorskip("langchain_chroma")
+pytest.importorskip("fitz")
+
+from cache import LRUCache  # noqa: E402
+from rag import RAGSystem, reciprocal_rank_fusion  # noqa: E402
+from sparse_index import BM25Index  # noqa: E402
+from tracing import get_tracer  # noqa: E402
+
+
+class TestReciprocalRankFusion:
+    def test_agreement_beats_single_top_rank(self):
+        # "b" is second in both rankings, "a" and "c" top only one each
+        assert reciprocal_rank_fusion([["a", "b"], ["c", "b"]], k=3)[0] == "b"
+
+    def test_ties_keep_first_seen_order(self):
+        assert reciprocal_rank_fusion([["a"], ["c"]], k=2) == ["a", "c"]
+
+    def test_top_k_only(self):
+        assert reciprocal_rank_fusion([["a", "b", "c"], []], k=2) == ["a", "b"]
+
+    def test_rank_not_score_decides(self):
+        ranking = [str(i) for i in range(100)]
+        fused = reciprocal_rank_fusion([ranking, list(reversed(ranking))], k=100, rrf_k=60)
+        # Symmetric rankings: the ends tie and beat the middle
+        assert {fused[0], fused[1]} == {"0", "99"}
+
+
+def _bare_rag(index_path):
+    """A RAGSystem with only the parts _cached_search touches."""
+    rag = RAGSystem.__new__(RAGSystem)
+    rag.tracer = get_tracer()
+    rag.sparse_index = BM25Index(index_path)
+    rag.retrieval_cache = LRUCache(maxsize=16)
+    return rag
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "bm25.sqlite")
+
+
+def _search(rag, results):
+    calls = []
+
+    def search_fn():
+        calls.append(1)
+        return list(results)
+
+    return rag._cached_search("dense", " RAG  Query ", 3, search_fn), calls
+
+
+def test_repeated_query_hits_cache(index_path):
+    rag = _bare_rag(index_path)
+    _, first = _search(rag, ["a"])
+    _, second = _search(rag, ["a"])
+    assert len(first) == 1 and second == []
+
+
+def test_local_write_invalidates(index_path):
+    rag = _bare_rag(index_path)
+    _search(rag, ["a"])
+    rag.sparse_index.add(["doc"], ["text"])
+    rag.clear_search_cache()
+    results, calls = _search(rag, ["b"])
+    assert calls and results == ["b"]
+
+
+def test_write_by_another_process_invalidates(index_path):
+    rag = _bare_rag(index_path)
+    other = _bare_rag(index_path)
+    _search(rag, ["a"])
+    other.sparse_index.add(["doc"], ["text"])  # rag's own cache is never cleared
+    results, calls = _search(rag, ["b"])
+    assert calls and results == ["b"]
+
+
+def test_cached_results_are_copies(index_path):
+    rag = _bare_rag(index_path)
+    results, _ = _search(rag, ["a"])
+    results.append("mutated")
+    again, calls = _search(rag, ["a"])
+    assert calls == [] and again == ["a"]
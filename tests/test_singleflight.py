@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""SingleFlight / AsyncSingleFlight."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class TestSingleFlight:
+    def _run_coalesced(self, group, fn, followers=2):
+        """Leader blocks in fn until every follower has joined."""
+        release = threading.Event()
+        received = [[] for _ in range(followers + 1)]
+
+        def leader_fn(emit):
+            emit("a")
+            release.wait(2)
+            emit("b")
+            return fn()
+
+        def call(i):
+            return group.do("key", leader_fn, callback=received[i].append)
+
+        with ThreadPoolExecutor(max_workers=followers + 1) as pool:
+            futures = [pool.submit(call, 0)]
+            _wait_until(lambda: group.stats()["in_flight"] == 1)
+            futures += [pool.submit(call, i) for i in range(1, followers + 1)]
+            _wait_until(lambda: group.coalesced == followers)
+            release.set()
+        return futures, received
+
+    def test_concurrent_calls_run_once(self):
+        group = SingleFlight()
+        runs = []
+        futures, received = self._run_coalesced(group, lambda: runs.append(1) or "result")
+        results = [f.result() for f in futures]
+        assert runs == [1]
+        assert results[0] == ("result", False)
+        assert results[1:] == [("result", True)] * 2
+        # Late joiners get the chunks emitted before they arrived
+        assert all(chunks == ["a", "b"] for chunks in received)
+
+    def test_error_reaches_every_caller(self):
+        group = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        futures, _ = self._run_coalesced(group, fail)
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+        assert group.stats()["in_flight"] == 0
+
+    def test_key_forgotten_after_call(self):
+        group = SingleFlight()
+        assert group.do("key", lambda emit: 1) == (1, False)
+        assert group.do("key", lambda emit: 2) == (2, False)
+
+
+class TestAsyncSingleFlight:
+    def test_concurrent_calls_run_once(self):
+        async def scenario():
+            group = AsyncSingleFlight()
+            runs = []
+            received = [[], []]
+
+            async def fn(emit):
+                runs.append(1)
+                emit("a")
+                await asyncio.sleep(0.01)
+                emit("b")
+                return "result"
+
+            results = await asyncio.gather(
+                group.do("key", fn, callback=received[0].append),
+                group.do("key", fn, callback=received[1].append),
+            )
+            return runs, results, received, group.stats()
+
+        runs, results, received, stats = asyncio.run(scenario())
+        assert runs == [1]
+        assert results == [("result", False), ("result", True)]
+        assert received == [["a", "b"], ["a", "b"]]
+        assert stats["in_flight"] == 0
+
+    def test_error_reaches_every_waiter(self):
+        async def scenario():
+            group = AsyncSingleFlight()
+
+            async def fn(emit):
+                await asyncio.sleep(0.01)
+                raise ValueError("boom")
+
+            return await asyncio.gather(
+                group.do("key", fn), group.do("key", fn), return_exceptions=True
+            ), group.stats()
+
+        results, stats = asyncio.run(scenario())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert stats["in_flight"] == 0
+
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        async def scenario():
+            group = AsyncSingleFlight()
+            started = asyncio.Event()
+
+            async def fn(emit):
+                started.set()
+                await asyncio.sleep(0.05)
+                return "result"
+
+            first = asyncio.ensure_future(group.do("key", fn))
+            second = asyncio.ensure_future(group.do("key", fn))
+            await started.wait()
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(scenario()) == ("result", True)
+
+    def test_last_waiter_cancelled_cancels_call(self):
+        async def scenario():
+            group = AsyncSingleFlight()
+            started = asyncio.Event()
+            cancelled = asyncio.Event()
+
+            async def fn(emit):
+                started.set()
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            waiter = asyncio.ensure_future(group.do("key", fn))
+            await started.wait()
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            await asyncio.wait_for(cancelled.wait(), 1)
+            return group.stats()
+
+        assert asyncio.run(scenario())["in_flight"] == 0
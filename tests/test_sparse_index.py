@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""tokenize / BM25Index."""
+
+import pytest
+
+from sparse_index import BM25Index, tokenize
+
+
+class TestTokenize:
+    def test_hangul_bigrams_and_whole_run(self):
+        tokens = tokenize("검색엔진")
+        assert "검색엔진" in tokens
+        assert {"검색", "색엔", "엔진"} <= set(tokens)
+
+    def test_particles_share_bigrams(self):
+        assert "검색" in tokenize("검색은") and "검색" in tokenize("검색을")
+
+    def test_lone_syllables_dropped(self):
+        assert tokenize("나 는") == []
+
+    def test_identifiers_kept_whole_and_split(self):
+        tokens = tokenize("call get_context()")
+        assert "get_context" in tokens
+        assert {"get", "context"} <= set(tokens)
+
+    def test_lowercases(self):
+        assert tokenize("FastAPI") == ["fastapi"]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "bm25.sqlite")
+
+
+class TestBM25Index:
+    def test_ranks_matching_document_first(self, index_path):
+        index = BM25Index(index_path)
+        index.add(["a", "b"], ["파이썬 웹 프레임워크 fastapi", "러스트 소유권과 빌림"])
+        assert [doc_id for doc_id, _ in index.search("fastapi 프레임워크")] == ["a"]
+
+    def test_rare_term_outweighs_common_term(self, index_path):
+        index = BM25Index(index_path)
+        index.add(["a", "b", "c"], ["python chroma", "python", "python"])
+        hits = index.search("python chroma", k=3)
+        assert hits[0][0] == "a"
+        assert hits[0][1] > hits[1][1]
+
+    def test_reindex_replaces_postings(self, index_path):
+        index = BM25Index(index_path)
+        index.add(["a"], ["alpha"])
+        index.add(["a"], ["beta"])
+        assert index.search("alpha") == []
+        assert index.search("beta")[0][0] == "a"
+        assert len(index) == 1
+
+    def test_remove_and_clear(self, index_path):
+        index = BM25Index(index_path)
+        index.add(["a", "b"], ["alpha", "beta"])
+        index.remove(["a"])
+        assert index.search("alpha") == []
+        index.clear()
+        assert len(index) == 0 and index.search("beta") == []
+
+    def test_persists(self, index_path):
+        BM25Index(index_path).add(["a"], ["alpha"])
+        assert BM25Index(index_path).search("alpha")[0][0] == "a"
+
+    def test_sees_writes_from_another_instance(self, index_path):
+        reader = BM25Index(index_path)
+        writer = BM25Index(index_path)
+        writer.add(["a"], ["alpha"])
+        assert reader.search("alpha")[0][0] == "a"
+        writer.remove(["a"])
+        assert reader.search("alpha") == []
+
+    def test_generation_changes_on_every_write(self, index_path):
+        index = BM25Index(index_path)
+        other = BM25Index(index_path)
+        start = index.generation
+        other.add(["a"], ["alpha"])
+        assert index.generation == start + 1
+        assert index.sync() == start + 1
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""TokenCounter fallback and memoization."""
+
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from tokens import TokenCounter, estimate_tokens, MESSAGE_OVERHEAD_TOKENS  # noqa: E402
+
+
+class _FakeAutoTokenizer:
+    calls = []
+
+    @classmethod
+    def from_pretrained(cls, name, **kwargs):
+        cls.calls.append((name, kwargs))
+        if kwargs.get("local_files_only"):
+            raise OSError("not in the local cache")
+        return types.SimpleNamespace(encode=lambda text, add_special_tokens=False: text.split())
+
+
+@pytest.fixture
+def fake_transformers(monkeypatch):
+    _FakeAutoTokenizer.calls = []
+    monkeypatch.setitem(sys.modules, "transformers", types.SimpleNamespace(AutoTokenizer=_FakeAutoTokenizer))
+    return _FakeAutoTokenizer
+
+
+def test_estimate_counts_hangul_syllables():
+    assert estimate_tokens("검색") == 2
+    assert estimate_tokens("abcdefgh") == 2
+
+
+def test_local_only_falls_back_to_estimate(fake_transformers):
+    counter = TokenCounter("some/model", local_files_only=True)
+    assert counter.load() is False
+    assert counter.count("검색 속도") == estimate_tokens("검색 속도")
+    assert fake_transformers.calls == [("some/model", {"local_files_only": True})]
+
+
+def test_load_is_attempted_once(fake_transformers):
+    counter = TokenCounter("some/model", local_files_only=True)
+    counter.load()
+    counter.count("a")
+    assert counter.exact is False
+    assert len(fake_transformers.calls) == 1
+
+
+def test_tokenizer_counts_and_message_overhead(fake_transformers):
+    counter = TokenCounter("some/model", local_files_only=False)
+    assert counter.exact is True
+    assert counter.count("one two three") == 3
+    assert counter.count_message("one two") == 2 + MESSAGE_OVERHEAD_TOKENS
+    assert counter.count("") == 0
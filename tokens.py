@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Token Counting Module
+- TokenCounter: token counts from the served model's Hugging Face tokenizer
+- Falls back to a Hangul-aware estimate when the tokenizer can't be loaded
+"""
+
+import os
+import math
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+
+from cache import LRUCache
+
+# Load environment variables
+load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
+
+# Hugging Face tokenizer matching MODEL (the served model's own name is often a local alias)
+TOKENIZER_NAME = os.getenv("TOKENIZER_NAME", "Qwen/Qwen3-4B-Instruct-2507")
+# Only use a tokenizer already in the local HF cache; never download on a request path
+TOKENIZER_LOCAL_ONLY = os.getenv("TOKENIZER_LOCAL_ONLY", "true").lower() in ("1", "true", "yes")
+TOKEN_COUNT_CACHE_SIZE = 8192
+TOKEN_COUNT_CACHE_MAX_CHARS = 4000  # memoize chunk-sized texts only, not whole responses
+# Chat-template tokens added around each message (<|im_start|>role\n ... <|im_end|>\n)
+MESSAGE_OVERHEAD_TOKENS = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~1 token per Hangul syllable, ~4 chars per token otherwise."""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+
+class TokenCounter:
+    """Counts tokens with the model's tokenizer, loaded lazily.
+
+    `exact` tells whether counts come from the real tokenizer or from
+    estimate_tokens(). Counts of short texts are memoized, since the
+    same chunks are counted on every request that retrieves them.
+
+    With `local_files_only` (the default) the tokenizer is read from the
+    local Hugging Face cache only, so a missing tokenizer falls back to
+    the estimate at once instead of blocking a request on a download.
+    Servers call load() at startup so the first request doesn't pay for
+    reading it either.
+    """
+
+    def __init__(self, tokenizer_name: str = TOKENIZER_NAME, local_files_only: bool = TOKENIZER_LOCAL_ONLY):
+        self.tokenizer_name = tokenizer_name
+        self.local_files_only = local_files_only
+        self._tokenizer = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._counts = LRUCache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+
+    def load(self) -> bool:
+        """Load the tokenizer now (no-op once tried); True if counts are exact."""
+        with self._lock:
+            if not self._loaded:
+                try:
+                    from transformers import AutoTokenizer
+                    self._tokenizer = AutoTokenizer.from_pretrained(
+                        self.tokenizer_name, local_files_only=self.local_files_only
+                    )
+                except Exception:
+                    self._tokenizer = None
+                self._loaded = True
+        return self._tokenizer is not None
+
+    @property
+    def exact(self) -> bool:
+        if not self._loaded:
+            self.load()
+        return self._tokenizer is not None
+
+    def count(self, text: Optional[str]) -> int:
+        if not text:
+            return 0
+        memoize = len(text) <= TOKEN_COUNT_CACHE_MAX_CHARS
+        if memoize:
+            cached = self._counts.get(text)
+            if cached is not None:
+                return cached
+        if not self._loaded:
+            self.load()
+        if self._tokenizer is not None:
+            n = len(self._tokenizer.encode(text, add_special_tokens=False))
+        else:
+            n = estimate_tokens(text)
+        if memoize:
+            self._counts.set(text, n)
+        return n
+
+    def count_message(self, content: str) -> int:
+        """Tokens of one chat message, template overhead included."""
+        return self.count(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def count_messages(self, contents: Iterable[str]) -> int:
+        return sum(self.count_message(content) for content in contents)
+
+
+# Singleton instance
+_counter_instance: Optional[TokenCounter] = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Get or create the token counter singleton."""
+    global _counter_instance
+    with _counter_lock:
+        if _counter_instance is None:
+            _counter_instance = TokenCounter()
+    return _counter_instance
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Tracing Module
+- Lightweight spans (name, parent, start, duration, attributes) per request stage
+- Parent/child links follow contextvars across async tasks; use
+  propagate() when handing work to another thread
+- Exporters: in-memory ring buffer (queryable) and JSON lines file
+- Disabled by default; a disabled tracer hands out one shared no-op span
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import contextvars
+from collections import deque, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv(dotenv_path=Path(__file__).resolve().parent / ".env")
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_EXPORTERS = os.getenv("TRACE_EXPORTERS", "memory")  # comma-separated: memory, jsonl
+TRACE_FILE = os.getenv("TRACE_FILE", "./traces.jsonl")
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "10000"))  # spans kept in memory
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def _new_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+@dataclass
+class Span:
+    """One timed stage. `start` is wall-clock (epoch seconds)."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start: float = 0.0
+    duration_ms: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    thread: str = ""
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+            "thread": self.thread,
+        }
+
+
+class _NoopSpan:
+    """Returned by a disabled tracer; every operation does nothing."""
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _ActiveSpan:
+    """Context manager that times a span and makes it the current parent."""
+
+    __slots__ = ("tracer", "span", "_token", "_started")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else _new_id(),
+            span_id=_new_id(),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+
+    def __enter__(self) -> Span:
+        self.span.start = time.time()
+        self.span.thread = threading.current_thread().name
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.span.duration_ms = (time.perf_counter() - self._started) * 1000
+        if exc_type is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.tracer.export(self.span)
+        return False
+
+
+class RingBufferExporter:
+    """Keeps the most recent spans in memory for querying."""
+
+    def __init__(self, maxsize: int = TRACE_BUFFER_SIZE):
+        self._spans: Deque[Span] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id is not None:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        return sorted(spans, key=lambda span: span.start)
+
+    def trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """All spans of one trace plus total time per stage name."""
+        spans = self.spans(trace_id)
+        if not spans:
+            return None
+        stages: Dict[str, float] = defaultdict(float)
+        for span in spans:
+            stages[span.name] += span.duration_ms
+        root = next((span for span in spans if span.parent_id is None), spans[0])
+        return {
+            "trace_id": trace_id,
+            "name": root.name,
+            "start": root.start,
+            "duration_ms": round(root.duration_ms, 3),
+            "stages_ms": {name: round(ms, 3) for name, ms in stages.items()},
+            "spans": [span.to_dict() for span in spans],
+        }
+
+    def traces(self, limit: int = 20, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Summaries of the most recent finished traces (root span ended), newest first."""
+        with self._lock:
+            roots = [span for span in self._spans if span.parent_id is None]
+        if name is not None:
+            roots = [span for span in roots if span.name == name]
+        return [
+            {
+                "trace_id": span.trace_id,
+                "name": span.name,
+                "start": span.start,
+                "duration_ms": round(span.duration_ms, 3),
+                "error": span.error,
+            }
+            for span in reversed(roots[-limit:])
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonlExporter:
+    """Appends each finished span as one JSON line."""
+
+    def __init__(self, path: str = TRACE_FILE):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporters.
+
+    Usage:
+        with tracer.span("rag.search", k=3) as span:
+            ...
+            span.set(results=len(docs))
+
+    While disabled, span() returns a shared no-op object, so instrumented
+    code costs one attribute check per stage.
+    """
+
+    def __init__(self, enabled: bool = False, exporters: Optional[List[Any]] = None):
+        self.enabled = enabled
+        self.exporters: List[Any] = exporters or []
+
+    @property
+    def buffer(self) -> Optional[RingBufferExporter]:
+        """The in-memory exporter, if one is configured."""
+        return next((e for e in self.exporters if isinstance(e, RingBufferExporter)), None)
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _ActiveSpan(self, name, attributes)
+
+    def export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                pass  # tracing must never break the traced code
+
+    def configure(self, enabled: bool, exporters: Optional[List[Any]] = None):
+        """Switch tracing on/off at runtime (exporters replaced when given)."""
+        if exporters is not None:
+            self.exporters = exporters
+        elif enabled and not self.exporters:
+            self.exporters = [RingBufferExporter()]
+        self.enabled = enabled
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def propagate(fn: F) -> F:
+    """Bind `fn` to the caller's trace context, for running on another thread.
+
+    Spans opened inside `fn` become children of the caller's current span.
+    Each call runs in its own copy of the context, so the wrapper may be
+    invoked from several threads at once.
+    """
+    if _current_span.get() is None:
+        return fn
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run  # type: ignore[return-value]
+
+
+def _exporters_from_env() -> List[Any]:
+    exporters: List[Any] = []
+    for name in (n.strip().lower() for n in TRACE_EXPORTERS.split(",")):
+        if name == "memory":
+            exporters.append(RingBufferExporter())
+        elif name == "jsonl":
+            exporters.append(JsonlExporter())
+    return exporters
+
+
+# Singleton instance
+_tracer_instance: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get or create the process-wide tracer (configured from the environment)."""
+    global _tracer_instance
+    with _tracer_lock:
+        if _tracer_instance is None:
+            _tracer_instance = Tracer(enabled=TRACING_ENABLED, exporters=_exporters_from_env())
+    return _tracer_instance
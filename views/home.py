@@ -4,17 +4,19 @@
 """
 
 import streamlit as st
+import time
 from datetime import datetime
-from rag import get_rag_system
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from components.common import render_ingest_jobs, watch_job
+from warmup import get_warmup, is_ready
 import os
 from dotenv import load_dotenv
 from pathlib import Path
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
 
+# rag / jobs / llm_clients / langchain 은 함수 안에서 import
+# (첫 화면이 torch, fitz 로딩을 기다리지 않도록 - warmup.py 참고)
+
 MODEL = os.getenv("MODEL", "qwen3-4b-2507")
 BASE_URL = os.getenv("BASE_URL", "http://127.0.0.1:1234/v1")
 API_KEY = os.getenv("API_KEY", "not-needed")
@@ -75,23 +77,11 @@ def _render_sidebar():
         if uploaded:
             if st.button("추가", type="primary", use_container_width=True):
                 _add_file(uploaded)
+        render_ingest_jobs()
 
-        # 저장된 자료
-        try:
-            rag = get_rag_system()
-            sources = rag.get_sources()
-            if sources:
-                st.markdown("**저장된 자료**")
-                for s in sources[:5]:
-                    st.caption(f"• {s}")
-                if len(sources) > 5:
-                    st.caption(f"외 {len(sources) - 5}개")
-
-                if st.button("자료 관리", use_container_width=True):
-                    st.session_state.current_page = "study"
-                    st.rerun()
-        except:
-            pass
+        # 저장된 자료 (모델 준비 전에는 건너뜀 - 첫 화면이 로딩을 기다리지 않도록)
+        if is_ready():
+            _render_sources()
 
         st.divider()
 
@@ -117,6 +107,27 @@ def _render_sidebar():
             st.metric("정답률", f"{stats['accuracy']}%")
 
 
+def _render_sources():
+    """저장된 자료 목록"""
+    from rag import get_rag_system
+
+    try:
+        rag = get_rag_system()
+        sources = rag.get_sources()
+        if sources:
+            st.markdown("**저장된 자료**")
+            for s in sources[:5]:
+                st.caption(f"• {s}")
+            if len(sources) > 5:
+                st.caption(f"외 {len(sources) - 5}개")
+
+            if st.button("자료 관리", use_container_width=True):
+                st.session_state.current_page = "study"
+                st.rerun()
+    except:
+        pass
+
+
 def _render_greeting():
     """튜터 인사 화면"""
 
@@ -176,6 +187,17 @@ def _render_chat():
 
 def _generate_response(prompt: str) -> str:
     """LLM 응답 생성"""
+    warmup = get_warmup()
+    if not warmup.state.ready:
+        with st.spinner("모델 준비 중..."):
+            warmup.wait()
+
+    from rag import get_rag_system
+    from llm_clients import get_llm_registry
+    from langchain_core.messages import HumanMessage, AIMessage
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+    start = time.perf_counter()
     context = ""
     try:
         rag = get_rag_system()
@@ -186,6 +208,7 @@ def _generate_response(prompt: str) -> str:
                 source = doc.metadata.get("source", "unknown")
                 context_parts.append(f"[{i}] ({source})\n{doc.page_content}")
             context = "\n\n".join(context_parts)
+        warmup.observe_query((time.perf_counter() - start) * 1000)
     except:
         pass
 
@@ -201,11 +224,12 @@ def _generate_response(prompt: str) -> str:
             chat_history.append(AIMessage(content=msg["content"]))
     chat_history = chat_history[-10:]
 
-    llm = ChatOpenAI(
+    llm = get_llm_registry().get(
         model=MODEL,
         base_url=BASE_URL,
         api_key=API_KEY,
         temperature=0.4,
+        max_tokens=None,
         streaming=True
     )
 
@@ -239,24 +263,14 @@ def _generate_response(prompt: str) -> str:
 
 
 def _add_file(uploaded):
-    """사이드바에서 파일 추가"""
+    """사이드바에서 파일 추가 (백그라운드 작업으로 등록)"""
+    from jobs import get_job_queue
+
     try:
-        rag = get_rag_system()
         name = uploaded.name
-        ext = name.lower().split(".")[-1]
-
-        with st.spinner("처리 중..."):
-            if ext == "txt":
-                content = uploaded.read().decode("utf-8")
-                rag.add_document(content, metadata={"source": name, "type": "txt"})
-            elif ext == "pdf":
-                rag.add_pdf(uploaded, name, use_ocr=True)
-            elif ext in ["png", "jpg", "jpeg"]:
-                rag.add_image(uploaded, name)
-
-        st.success(f"'{name}' 추가됨")
+        job_id = get_job_queue().submit(uploaded, name, use_ocr=True)
+        watch_job(job_id)
         add_study_history(f"자료: {name}")
-        st.rerun()
 
     except Exception as e:
         st.error(f"오류: {e}")
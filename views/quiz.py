@@ -6,8 +6,8 @@
 import streamlit as st
 import json
 from components.common import render_back_button
-from rag import get_rag_system
-from pipeline import get_pipeline, PipelineInput, TaskType
+
+# pipeline 은 함수 안에서 import (views/home.py 참고)
 
 
 def render():
@@ -63,34 +63,18 @@ def _render_start():
 
 def _generate_quiz(num: int, diff: str):
     """퀴즈 생성"""
+    from pipeline import get_pipeline, build_quiz_input, parse_quiz_response
+
     try:
         pipeline = get_pipeline()
 
-        prompt = f"""학습 자료 기반 {diff} 난이도 4지선다 퀴즈 {num}개를 JSON으로 만들어줘.
-
-형식:
-[{{"question": "질문", "options": ["A", "B", "C", "D"], "answer": 0, "explanation": "설명"}}]
-
-answer는 정답 인덱스(0-3). JSON만 출력해."""
-
-        input_data = PipelineInput(
-            query=prompt,
-            task_type=TaskType.QA,
-            context_k=5,
-            temperature=0.7
-        )
+        input_data = build_quiz_input(num, diff)
 
         with st.spinner("퀴즈 생성 중..."):
             result = pipeline.process(input_data)
 
         # JSON 파싱
-        response = result.response.strip()
-        if "```json" in response:
-            response = response.split("```json")[1].split("```")[0]
-        elif "```" in response:
-            response = response.split("```")[1].split("```")[0]
-
-        questions = json.loads(response)
+        questions = parse_quiz_response(result.response)
 
         st.session_state.quiz_state = {
             "questions": questions,
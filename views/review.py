@@ -5,8 +5,8 @@
 
 import streamlit as st
 from components.common import render_back_button
-from rag import get_rag_system
-from pipeline import get_pipeline, PipelineInput, TaskType
+
+# rag / pipeline 은 함수 안에서 import (views/home.py 참고)
 
 
 def render():
@@ -59,6 +59,8 @@ def _render_wrong():
 
 def _render_summary():
     """학습 요약"""
+    from rag import get_rag_system
+    from pipeline import get_pipeline, PipelineInput, TaskType
 
     try:
         rag = get_rag_system()
@@ -4,10 +4,11 @@
 """
 
 import streamlit as st
-from components.common import render_back_button
-from rag import get_rag_system
+from components.common import render_back_button, render_ingest_jobs, watch_job
 from views.home import add_study_history
 
+# rag / jobs / pipeline 은 함수 안에서 import (views/home.py 참고)
+
 
 def render():
     """자료 관리 화면"""
@@ -45,9 +46,14 @@ def render():
 
     st.markdown("<br>", unsafe_allow_html=True)
 
+    # 처리 중인 자료
+    render_ingest_jobs()
+
     # 저장된 자료
     st.markdown("**저장된 자료**")
 
+    from rag import get_rag_system
+
     try:
         rag = get_rag_system()
         sources = rag.get_sources()
@@ -79,24 +85,15 @@ def render():
 
 
 def _upload_file(file, use_ocr: bool):
-    """파일 업로드 처리"""
+    """파일 업로드 처리 (백그라운드 작업으로 등록)"""
+    from jobs import get_job_queue
+
     try:
-        rag = get_rag_system()
         name = file.name
-        ext = name.lower().split(".")[-1]
-
-        with st.spinner("처리 중..."):
-            if ext == "txt":
-                content = file.read().decode("utf-8")
-                rag.add_document(content, metadata={"source": name, "type": "txt"})
-            elif ext == "pdf":
-                rag.add_pdf(file, name, use_ocr=use_ocr)
-            elif ext in ["png", "jpg", "jpeg"]:
-                rag.add_image(file, name)
-
-        st.success(f"'{name}' 추가됨")
+        job_id = get_job_queue().submit(file, name, use_ocr=use_ocr)
+        watch_job(job_id)
+        st.success(f"'{name}' 처리를 시작했어요")
         add_study_history(f"자료: {name}")
-        st.rerun()
 
     except Exception as e:
         st.error(f"오류: {e}")
@@ -104,6 +101,8 @@ def _upload_file(file, use_ocr: bool):
 
 def _add_text(text: str, title: str):
     """텍스트 추가"""
+    from rag import get_rag_system
+
     try:
         rag = get_rag_system()
         source = title.strip() if title.strip() else "직접입력"
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Startup Warm-up Module
+- Loads the heavy stack (langchain, torch, Chroma, embedding model) on a
+  background thread so the UI can render before it is ready
+- Dummy encode so the model's first-call cost is paid before the first query
+- Readiness state with per-stage cold-start timings and cold vs warm latencies
+"""
+
+import time
+import threading
+import importlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional
+
+from metrics import get_metrics_registry
+
+WARMUP_QUERY = "query: warm-up"
+
+_metrics = get_metrics_registry()
+_stage_seconds = _metrics.gauge("app_warmup_stage_seconds", "Cold-start time per warm-up stage", ["stage"])
+_ready = _metrics.gauge("app_ready", "1 once the warm-up has finished")
+
+
+class WarmupStatus(Enum):
+    COLD = "cold"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class WarmupState:
+    """Readiness snapshot."""
+    status: WarmupStatus = WarmupStatus.COLD
+    stage: str = ""                  # stage in progress
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    stages_ms: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    first_query_ms: Optional[float] = None   # retrieval time of the first user query
+    warm_query_ms: Optional[float] = None    # mean of the queries after it
+    warm_queries: int = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.status == WarmupStatus.READY
+
+    @property
+    def elapsed_ms(self) -> float:
+        if not self.started_at:
+            return 0.0
+        return ((self.finished_at or time.time()) - self.started_at) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status.value,
+            "stage": self.stage,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "stages_ms": dict(self.stages_ms),
+            "error": self.error,
+            "first_query_ms": self.first_query_ms,
+            "warm_query_ms": self.warm_query_ms,
+            "warm_queries": self.warm_queries,
+        }
+
+
+class Warmup:
+    """Runs the warm-up once per process on a daemon thread.
+
+    Stages (each timed):
+        imports      import rag / pipeline / jobs (langchain, torch, fitz, ...)
+        model_load   get_rag_system(): embedding model + Chroma + BM25 index
+        encode_cold  first encode through the raw model
+        encode_warm  same encode again (steady-state latency)
+        index_load   first Chroma query (loads the HNSW index into memory)
+        pipeline     get_pipeline(), tokenizer, ingestion job queue
+
+    Callers that need the stack before it is ready can wait(); the
+    singletons are lock-protected, so nothing is loaded twice.
+    """
+
+    def __init__(self):
+        self.state = WarmupState()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> WarmupState:
+        with self._lock:
+            if self._thread is None:
+                self.state.status = WarmupStatus.WARMING
+                self.state.started_at = time.time()
+                self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+                self._thread.start()
+        return self.state
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the warm-up finished (or failed); False on timeout."""
+        self.start()
+        return self._done.wait(timeout)
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        self.state.stage = name
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        self.state.stages_ms[name] = round(elapsed * 1000, 1)
+        _stage_seconds.set(elapsed, stage=name)
+
+    def _run(self):
+        try:
+            with self._stage("imports"):
+                rag_module = importlib.import_module("rag")
+                pipeline_module = importlib.import_module("pipeline")
+                jobs_module = importlib.import_module("jobs")
+
+            with self._stage("model_load"):
+                rag = rag_module.get_rag_system()
+
+            model = rag.embeddings.embeddings  # bypass the embedding cache
+            with self._stage("encode_cold"):
+                vector = model.embed_query(WARMUP_QUERY)
+            with self._stage("encode_warm"):
+                model.embed_query(WARMUP_QUERY)
+
+            with self._stage("index_load"):
+                collection = rag.vectorstore._collection
+                if collection.count():
+                    collection.query(query_embeddings=[vector], n_results=1, include=[])
+
+            with self._stage("pipeline"):
+                pipeline = pipeline_module.get_pipeline()
+                pipeline.token_counter.load()  # local HF cache only
+                jobs_module.get_job_queue()
+
+            self.state.status = WarmupStatus.READY
+            _ready.set(1)
+        except Exception as e:
+            self.state.error = f"{type(e).__name__}: {e}"
+            self.state.status = WarmupStatus.FAILED
+        finally:
+            self.state.stage = ""
+            self.state.finished_at = time.time()
+            self._done.set()
+
+    def observe_query(self, elapsed_ms: float):
+        """Record a user query's retrieval latency (first one vs the warm ones after it)."""
+        with self._lock:
+            state = self.state
+            if state.first_query_ms is None:
+                state.first_query_ms = round(elapsed_ms, 1)
+                return
+            total = (state.warm_query_ms or 0.0) * state.warm_queries + elapsed_ms
+            state.warm_queries += 1
+            state.warm_query_ms = round(total / state.warm_queries, 1)
+
+
+# Singleton instance
+_warmup_instance: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    """Get or create the warm-up singleton."""
+    global _warmup_instance
+    with _warmup_lock:
+        if _warmup_instance is None:
+            _warmup_instance = Warmup()
+    return _warmup_instance
+
+
+def start_warmup() -> WarmupState:
+    """Start the background warm-up (no-op after the first call)."""
+    return get_warmup().start()
+
+
+def is_ready() -> bool:
+    return get_warmup().state.ready